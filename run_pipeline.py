@@ -16,29 +16,39 @@ Dependencies:
 
 import os
 import sys
+import argparse
 import pandas as pd
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from scripts.url_extractor import get_videos
-from scripts.podcast_processor import convert_video_to_audio
-from scripts.url_matcher import match_podcast_urls
+from scripts.artifact_cache import DEFAULT_CACHE_DIR, ArtifactCache
+from scripts.audio_mastering import DEFAULT_PROFILE, PROFILES
+from scripts.pipeline_stages import Stage, run_stages
+from scripts.podcast_processor import download_audio, encode_audio
+from scripts.url_matcher import iter_podcast_urls
 
 
-def ensure_metadata(metadata_path: str = 'output/video_metadata.csv') -> Optional[pd.DataFrame]:
+def ensure_metadata(metadata_path: str = 'output/video_metadata.csv', sync: bool = False) -> Optional[pd.DataFrame]:
     """
     Ensure YouTube video metadata exists, extract if needed.
 
     Args:
         metadata_path (str): Path to metadata CSV file
+        sync (bool): Incrementally fetch videos newer than the existing file
 
     Returns:
         Optional[pd.DataFrame]: DataFrame containing video metadata or None if extraction fails
     """
+    output_dir = os.path.dirname(metadata_path) or '.'
     try:
         # Extract metadata if file doesn't exist or is empty
         if not os.path.exists(metadata_path) or os.path.getsize(metadata_path) == 0:
             print("Extracting YouTube metadata...")
-            return get_videos()
+            return get_videos(output_dir=output_dir)
+
+        if sync:
+            print("Syncing new YouTube metadata...")
+            return get_videos(output_dir=output_dir, incremental=True)
         
         print("Loading existing metadata...")
         return pd.read_csv(metadata_path)
@@ -47,22 +57,131 @@ def ensure_metadata(metadata_path: str = 'output/video_metadata.csv') -> Optiona
         return None
 
 
-def process_video(video_url: str, date: str) -> bool:
+def process_videos(
+    matches: Iterable[Dict[str, Any]],
+    workers: int = 1,
+    download_workers: Optional[int] = None,
+    encode_workers: Optional[int] = None,
+    profile: str = DEFAULT_PROFILE,
+    stream: bool = False,
+    cache: Optional[ArtifactCache] = None
+) -> List[Dict[str, Any]]:
     """
-    Process a single video: download and convert to audio.
+    Download and convert matched videos as streaming pipeline stages.
+
+    Matches are consumed as they are produced; downloads and encodes run
+    as separate stages connected by bounded queues, so network-bound
+    downloads and CPU-bound encodes overlap and have separate limits.
 
     Args:
-        video_url (str): YouTube video URL
-        date (str): Date for filename
+        matches (Iterable[Dict[str, Any]]): Matches, e.g. from iter_podcast_urls
+        workers (int): Default worker count for both stages
+        download_workers (int, optional): Concurrent downloads. Defaults to workers.
+        encode_workers (int, optional): Concurrent encodes. Defaults to workers.
+        profile (str): Mastering profile applied by the encode stage
+        stream (bool): Pipe each download straight into its encoder instead
+            of downloading the source first. The download then runs inside
+            the encode stage: download_workers no longer limits it,
+            downloads do not overlap other encodes, and loudness
+            normalization is single-pass. Defaults to False.
+        cache (ArtifactCache, optional): Cache for sources and encodes
 
     Returns:
-        bool: True if processing successful, False otherwise
+        List[Dict[str, Any]]: One result per match with a URL, in input order,
+            with 'youtube_title', 'youtube_url' and 'success'
     """
-    try:
-        return convert_video_to_audio(video_url, date)
-    except Exception as e:
-        print(f"Error processing video {video_url}: {str(e)}")
-        return False
+    def download(match: Dict[str, Any]) -> Dict[str, Any]:
+        # Title and ID come from the metadata, so no extraction is needed
+        return download_audio(
+            match['youtube_url'],
+            match['upload_date'],
+            stream=stream,
+            profile=profile,
+            cache=cache,
+            title=match['youtube_title'],
+            video_id=match.get('video_id')
+        )
+
+    def report(result: Dict[str, Any]) -> None:
+        match = result['item']
+        if result['error'] is not None:
+            print(f"\n✗ Failed ({result['stage']}): {match['youtube_title']} - {result['error']}")
+        else:
+            print(f"\n✓ Success: {match['youtube_title']}")
+
+    results = run_stages(
+        (match for match in matches if match['youtube_url']),
+        [
+            Stage('download', download, max(1, download_workers or workers)),
+            Stage('encode', encode_audio, max(1, encode_workers or workers))
+        ],
+        on_complete=report
+    )
+
+    return [
+        {
+            'youtube_title': result['item']['youtube_title'],
+            'youtube_url': result['item']['youtube_url'],
+            'success': result['error'] is None
+        }
+        for result in results
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command-line options for the pipeline.
+
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Beloved podcast processing pipeline")
+    parser.add_argument(
+        '--sync-metadata',
+        action='store_true',
+        help="fetch only videos newer than output/video_metadata.csv before matching"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help="default worker count for the download and encode stages (default: 1)"
+    )
+    parser.add_argument(
+        '--download-workers',
+        type=int,
+        help="concurrent downloads (default: --workers)"
+    )
+    parser.add_argument(
+        '--encode-workers',
+        type=int,
+        help="concurrent encodes (default: --workers)"
+    )
+    parser.add_argument(
+        '--profile',
+        choices=sorted(PROFILES),
+        default=DEFAULT_PROFILE,
+        help=f"audio mastering profile (default: {DEFAULT_PROFILE})"
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help="pipe each download straight into ffmpeg instead of downloading it first; "
+             "downloads then run in the encode stage (--download-workers has no effect) "
+             "and loudness normalization is single-pass"
+    )
+    parser.add_argument(
+        '--cache-size-gb',
+        type=float,
+        default=20.0,
+        help=f"size cap of the source/encode cache in {DEFAULT_CACHE_DIR} (default: 20)"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help="do not cache sources and encodes; skip only episodes whose MP3 exists"
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
@@ -71,15 +190,18 @@ def main() -> None:
 
     Workflow:
     1. Extract/load metadata
-    2. Match URLs
-    3. Process videos
+    2. Load Spotify titles
+    3. Match URLs and process videos as streaming stages
+       (match -> download -> encode)
     4. Generate report
     """
+    args = parse_args()
+
     # Create output directories if they don't exist
     os.makedirs('output/podcasts', exist_ok=True)
 
     print("1. Getting YouTube metadata...")
-    metadata_df = ensure_metadata()
+    metadata_df = ensure_metadata(sync=args.sync_metadata)
     if metadata_df is None:
         sys.exit(1)
 
@@ -94,8 +216,38 @@ def main() -> None:
         print(f"Error loading Spotify titles: {str(e)}")
         sys.exit(1)
 
-    print("\n3. Matching titles...")
-    matched_urls = match_podcast_urls(spotify_titles, metadata_df)
+    print("\n3. Matching titles and processing videos...")
+    matched_urls = []
+
+    def stream_matches():
+        for match in iter_podcast_urls(
+            spotify_titles,
+            metadata_df,
+            cache_path='output/match_cache.sqlite'
+        ):
+            matched_urls.append(match)
+            print(f"Matched: {match['spotify_title']} -> {match['youtube_title']} "
+                  f"({match['confidence']:.1f}%)")
+            yield match
+
+    cache = None
+    if not args.no_cache:
+        cache = ArtifactCache(DEFAULT_CACHE_DIR, max_bytes=int(args.cache_size_gb * 1024 ** 3))
+
+    # Matching feeds downloads, which feed encodes, as each item is ready
+    try:
+        results = process_videos(
+            stream_matches(),
+            workers=args.workers,
+            download_workers=args.download_workers,
+            encode_workers=args.encode_workers,
+            profile=args.profile,
+            stream=args.stream,
+            cache=cache
+        )
+    finally:
+        if cache is not None:
+            cache.close()
     
     if not matched_urls:
         print("No matches found!")
@@ -108,20 +260,13 @@ def main() -> None:
     matched_df.to_csv('output/matched_urls.csv', index=False)
     print(f"Saved {len(matched_urls)} matches to output/matched_urls.csv")
 
-    print("\n4. Processing videos...")
-    success_count = 0
-    total_videos = len(matched_urls)
-    
-    for i, match in enumerate(matched_urls, 1):
-        if match['youtube_url']:
-            print(f"\nProcessing video {i}/{total_videos}")
-            print(f"Title: {match['youtube_title']}")
-            print(f"URL: {match['youtube_url']}")
-            if process_video(match['youtube_url'], match['upload_date']):
-                success_count += 1
-                print("✓ Success")
-            else:
-                print("✗ Failed")
+    success_count = sum(result['success'] for result in results)
+
+    failures = [result for result in results if not result['success']]
+    if failures:
+        print("\nFailed videos:")
+        for result in failures:
+            print(f"✗ {result['youtube_title']} ({result['youtube_url']})")
 
     print(f"\nProcessing complete! Successfully processed {success_count}/{len(matched_urls)} videos")
 
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Artifact Cache Module
+
+Stores downloaded source audio and encoded MP3s under keys derived from
+the YouTube video ID (and, for encodes, a hash of the encode settings)
+instead of the episode title. A renamed title or changed date reuses the
+existing artifacts; a new mastering profile reuses the downloaded source.
+
+Layout (default output/cache):
+- sources/<video_id>.source: Source audio, any container (probed by ffmpeg)
+- encoded/<video_id>-<settings hash>.mp3: Encoded episodes
+- artifacts.sqlite: Size and last use of every artifact
+
+Key Features:
+- Atomic commits: artifacts are written to <path>.part and renamed into
+  place only when complete, so a half-written file is never reused
+- LRU size cap: least recently used artifacts are evicted once the cache
+  grows past max_bytes
+- Per-key locks, so concurrent workers never produce the same artifact twice
+- Pins for artifacts handed to a later pipeline stage; locked and pinned
+  artifacts are never evicted
+- Episode files in output/podcasts are hard links to (or copies of) the
+  cached encodes
+
+Dependencies:
+- sqlite3: Standard library persistence
+"""
+
+import os
+import time
+import shutil
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Default cache location and size cap
+DEFAULT_CACHE_DIR = os.path.join('output', 'cache')
+DEFAULT_MAX_BYTES = 20 * 1024 ** 3
+
+SOURCE_SUFFIX = '.source'
+ENCODED_SUFFIX = '.mp3'
+
+# Bump when the encoder changes in a way that alters its output
+ENCODER_VERSION = 1
+
+
+def video_id_from_url(video_url: str) -> Optional[str]:
+    """
+    Extract the video ID from a YouTube watch or short URL.
+
+    Args:
+        video_url (str): YouTube video URL
+
+    Returns:
+        Optional[str]: Video ID, or None if the URL has none
+    """
+    parsed = urlparse(video_url)
+    if parsed.hostname and parsed.hostname.endswith('youtu.be'):
+        return parsed.path.strip('/') or None
+    return parse_qs(parsed.query).get('v', [None])[0]
+
+
+def encode_settings_hash(**settings) -> str:
+    """
+    Hash everything that determines an encode's output.
+
+    Args:
+        **settings: Encode settings, e.g. profile, sample rate, bitrate
+
+    Returns:
+        str: Short hex digest
+    """
+    settings['encoder_version'] = ENCODER_VERSION
+    text = repr(sorted(settings.items()))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def source_key(video_id: str) -> str:
+    """Cache key of a video's downloaded source audio."""
+    return f'sources/{video_id}{SOURCE_SUFFIX}'
+
+
+def encoded_key(video_id: str, settings_hash: str) -> str:
+    """Cache key of a video encoded with the given settings."""
+    return f'encoded/{video_id}-{settings_hash}{ENCODED_SUFFIX}'
+
+
+def materialize(artifact_path: str, output_path: str) -> None:
+    """
+    Place a cached artifact at output_path, atomically.
+
+    A hard link is used when possible, so the episode costs no extra disk
+    space and survives eviction of the cache entry; otherwise the file is
+    copied.
+
+    Args:
+        artifact_path (str): Cached artifact
+        output_path (str): Destination file
+    """
+    if os.path.exists(output_path) and os.path.samefile(artifact_path, output_path):
+        return
+
+    part_path = output_path + '.part'
+    if os.path.exists(part_path):
+        os.remove(part_path)
+    try:
+        os.link(artifact_path, part_path)
+    except OSError:
+        shutil.copy2(artifact_path, part_path)
+    os.replace(part_path, output_path)
+
+
+class ArtifactCache:
+    """
+    Directory of artifacts with an SQLite index and an LRU size cap.
+
+    Keys are paths relative to the cache root (see source_key and
+    encoded_key). All methods are thread-safe.
+
+    Args:
+        root (str, optional): Cache directory. Defaults to DEFAULT_CACHE_DIR.
+        max_bytes (int, optional): Size cap. Defaults to DEFAULT_MAX_BYTES.
+    """
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._pins: Dict[str, int] = {}
+        self.connection = sqlite3.connect(os.path.join(root, 'artifacts.sqlite'), check_same_thread=False)
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    key TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+
+    def __enter__(self) -> 'ArtifactCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self.connection.close()
+
+    def path(self, key: str) -> str:
+        """
+        Return the file location of a key (whether or not it is cached).
+
+        Args:
+            key (str): Artifact key
+
+        Returns:
+            str: Path under the cache root, with its directory created
+        """
+        path = os.path.join(self.root, *key.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """
+        Hold the lock for one key while checking for and producing it.
+
+        Args:
+            key (str): Artifact key
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            yield
+
+    def pin(self, key: str) -> None:
+        """
+        Protect an artifact from eviction until unpin is called.
+
+        Use this for artifacts handed to a later stage (e.g. a source
+        waiting for its encode). Pins are counted, so every pin needs
+        exactly one unpin.
+
+        Args:
+            key (str): Artifact key
+        """
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key: str) -> None:
+        """
+        Release one pin taken with pin.
+
+        Args:
+            key (str): Artifact key
+        """
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+            else:
+                self._pins.pop(key, None)
+
+    def _in_use(self, key: str) -> bool:
+        """Whether a key is pinned or its lock is held (lock held)."""
+        key_lock = self._key_locks.get(key)
+        return key in self._pins or (key_lock is not None and key_lock.locked())
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Return a cached artifact and mark it as recently used.
+
+        Entries whose file is missing or has the wrong size are dropped.
+
+        Args:
+            key (str): Artifact key
+
+        Returns:
+            Optional[str]: Artifact path, or None on a miss
+        """
+        path = self.path(key)
+        with self._lock:
+            row = self.connection.execute("SELECT size FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            with self.connection:
+                if not os.path.exists(path) or os.path.getsize(path) != row[0]:
+                    self.connection.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                    return None
+                self.connection.execute(
+                    "UPDATE artifacts SET last_used = ? WHERE key = ?", (time.time(), key)
+                )
+            return path
+
+    def commit(self, key: str, part_path: Optional[str] = None) -> str:
+        """
+        Record a completed artifact, moving it into place first if needed.
+
+        Writers either produce path(key) atomically themselves (ffmpeg via
+        audio_engine, yt-dlp) or pass the completed temporary file.
+
+        Args:
+            key (str): Artifact key
+            part_path (str, optional): Completed temporary file to move to path(key)
+
+        Returns:
+            str: Artifact path
+        """
+        path = self.path(key)
+        if part_path is not None:
+            os.replace(part_path, path)
+
+        with self._lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO artifacts (key, size, last_used) VALUES (?, ?, ?)",
+                    (key, os.path.getsize(path), time.time())
+                )
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: str) -> None:
+        """
+        Remove least recently used artifacts until the cache fits (lock held).
+
+        Artifacts that are pinned or whose key lock is held are skipped, so
+        a file another worker is using is never removed under it.
+        """
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self.connection.execute(
+            "SELECT key, size FROM artifacts WHERE key != ? ORDER BY last_used", (keep,)
+        ).fetchall()
+        with self.connection:
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if self._in_use(key):
+                    continue
+                path = self.path(key)
+                if os.path.exists(path):
+                    os.remove(path)
+                self.connection.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                total -= size
+                print(f"Evicted cached {key} ({size / 1024 ** 2:.1f} MB)")
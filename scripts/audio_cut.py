@@ -1,64 +1,465 @@
+#!/usr/bin/env python3
+"""
+Audio Intro Cutting Script
+
+Removes the first seconds (default 4) of every audio file in a directory
+and writes MP3s, one ffmpeg process per file on a worker pool (see
+batch_transcode).
+
+MP3 sources are trimmed by stream copy at a frame boundary, so nothing is
+decoded or re-encoded and there is no generation loss; --mode accurate
+re-encodes only the first frames for a sample-accurate, gapless cut.
+
+With --auto the cut points come from silence_detection: leading and
+trailing silence (and, with --jingle, the station jingle) are detected per
+file instead of assuming a fixed intro length.
+
+Usage:
+    python -m scripts.audio_cut <source_dir> [--dest-dir DIR] [--workers N]
+        [--seconds 4 | --auto [--jingle FILE]] [--mode copy|accurate|reencode]
+"""
+
 import os
+import re
+import argparse
+import subprocess
+import tempfile
 from pathlib import Path
-from moviepy.editor import AudioFileClip
-from concurrent.futures import ThreadPoolExecutor
-import multiprocessing
-
-# Source and destination directories
-source_dir = Path(r"C:\Users\paule\OneDrive\Desktop\mp3")
-dest_dir = source_dir.parent / "cut_mp3"
-
-# Create the destination directory if it doesn't exist
-dest_dir.mkdir(exist_ok=True)
-
-# Determine the number of workers based on CPU count
-max_workers = max(1, multiprocessing.cpu_count() - 1)  # Leave one core free for system tasks
-
-def cut_audio(input_file, output_file):
-    try:
-        audio = AudioFileClip(str(input_file))
-        # Cut the first 4 seconds
-        cut_audio = audio.subclip(4)
-        
-        # Ensure output file has .mp3 extension
-        output_path = str(output_file).rsplit('.', 1)[0] + '.mp3'
-        
-        cut_audio.write_audiofile(
-            output_path,
-            bitrate="196k",
-            nbytes=2,
-            codec='libmp3lame',
-            verbose=False,
-            logger=None
-        )
-        
-        audio.close()
-        cut_audio.close()
-        print(f"Successfully cut: {input_file.name}")
-    except Exception as e:
-        print(f"Error cutting {input_file.name}: {str(e)}")
-
-def main():
-    print(f"Source directory: {source_dir}")
-    print(f"Destination directory: {dest_dir}")
-    print(f"Using {max_workers} worker(s) for cutting")
-    
-    if not source_dir.exists():
-        print(f"Error: The source directory does not exist.")
+
+from typing import List, Optional, Tuple
+
+from scripts.audio_engine import FFMPEG_BINARY, run_ffmpeg
+from scripts.batch_transcode import parse_batch_args, run_cli
+from scripts.mp3_frames import (
+    DECODER_DELAY, ENCODER_DELAY, LAME_TAG_MAX, gapless_info, parse_header, self_contained_frame, set_gapless_info
+)
+from scripts.silence_detection import detect_trim_points
+
+# Source formats cut by this script
+SOURCE_EXTENSIONS = ('.wav', '.m4a', '.aac', '.wma', '.ogg', '.flac', '.mp3')
+
+# Length of the intro removed from each file
+CUT_SECONDS = 4.0
+
+# Bitrate for re-encoded audio (whole files, or the head in accurate mode)
+BITRATE = '196k'
+
+# copy: stream copy from the first MP3 frame after the cut (no re-encode)
+# accurate: re-encode HEAD_SECONDS from the exact cut, stream copy the rest
+# reencode: decode and re-encode the whole file
+TRIM_MODES = ('copy', 'accurate', 'reencode')
+
+# Minimum audio re-encoded in accurate mode before the stream-copied
+# remainder (the head ends at the next frame boundary after it)
+HEAD_SECONDS = 0.25
+
+# Samples encoded past the end of the head and then dropped, so the
+# encoder sees the audio that follows the join (its last frames would
+# not blend into the copied ones otherwise)
+HEAD_LOOKAHEAD_SAMPLES = 4608
+
+# Frames after the first copied one tried as the start of the copied
+# remainder in accurate mode (see mp3_frames.self_contained_frame)
+JOIN_SEARCH_FRAMES = 40
+
+# Audio decoded (and discarded) before the head: an MP3 decoder starting
+# at an arbitrary frame lacks the earlier frames' data for a few frames
+DECODE_PREROLL = 0.2
+
+FFMPEG_BASE = [FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-y', '-nostdin']
+
+# framecrc prints the time base once and then one line per packet
+TIME_BASE_PATTERN = re.compile(r'^#tb 0: (\d+)/(\d+)$', re.MULTILINE)
+SAMPLE_RATE_PATTERN = re.compile(r'^#sample_rate 0: (\d+)$', re.MULTILINE)
+
+
+def _end_option(end: Optional[float]) -> List[str]:
+    """Input option stopping at an absolute source position, if given."""
+    return ['-to', f'{end:.3f}'] if end is not None else []
+
+
+def first_packet_time(input_file: Path, seconds: float) -> float:
+    """
+    Find where a stream copy seeking to `seconds` actually starts.
+
+    Reads a single packet, so this is instant regardless of file length.
+
+    Args:
+        input_file (Path): MP3 file
+        seconds (float): Seek position
+
+    Returns:
+        float: Timestamp of the first copied frame in seconds
+
+    Raises:
+        RuntimeError: If ffmpeg fails or the seek is past the end
+    """
+    process = subprocess.run(
+        FFMPEG_BASE + [
+            '-ss', str(seconds),
+            '-i', str(input_file),
+            '-map', '0:a:0',
+            '-c', 'copy',
+            '-copyts',
+            '-frames:a', '1',
+            '-f', 'framecrc', '-'
+        ],
+        capture_output=True,
+        text=True
+    )
+    time_base = TIME_BASE_PATTERN.search(process.stdout)
+    packets = [line for line in process.stdout.splitlines() if line and not line.startswith('#')]
+    if process.returncode != 0 or not time_base or not packets:
+        raise RuntimeError(f"Could not locate a frame at {seconds}s: {process.stderr.strip()}")
+
+    numerator, denominator = map(int, time_base.groups())
+    return int(packets[0].split(',')[1]) * numerator / denominator
+
+
+def decoder_start(input_file: Path) -> Tuple[int, int]:
+    """
+    Find the sample rate and the samples a decoder skips at the start.
+
+    Decoded timestamps (with -copyts) count those skipped samples, so
+    source position t seconds is decoded sample t * rate + skip.
+
+    Args:
+        input_file (Path): MP3 file
+
+    Returns:
+        Tuple[int, int]: Sample rate and skipped samples
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    process = subprocess.run(
+        FFMPEG_BASE + [
+            '-copyts',
+            '-i', str(input_file),
+            '-map', '0:a:0',
+            '-c:a', 'pcm_s16le',
+            '-frames:a', '1',
+            '-f', 'framecrc', '-'
+        ],
+        capture_output=True,
+        text=True
+    )
+    sample_rate = SAMPLE_RATE_PATTERN.search(process.stdout)
+    frames = [line for line in process.stdout.splitlines() if line and not line.startswith('#')]
+    if process.returncode != 0 or not sample_rate or not frames:
+        raise RuntimeError(f"Could not decode {input_file}: {process.stderr.strip()}")
+    return int(sample_rate.group(1)), int(frames[0].split(',')[1])
+
+
+def copy_trim(input_file: Path, output_file: Path, seconds: float = CUT_SECONDS,
+              end: Optional[float] = None) -> None:
+    """
+    Remove the intro by stream copy, cutting at an MP3 frame boundary.
+
+    No audio is decoded or re-encoded, so the cost is a file copy. The
+    output starts at the first frame after the cut (within a few frames,
+    well under 0.1 s).
+
+    Args:
+        input_file (Path): MP3 source
+        output_file (Path): MP3 to write
+        seconds (float, optional): Intro length to remove. Defaults to CUT_SECONDS.
+        end (float, optional): Source position to stop at. Defaults to the end.
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    part_path = str(output_file) + '.part'
+    run_ffmpeg(
+        FFMPEG_BASE + [
+            '-ss', str(seconds),
+            *_end_option(end),
+            '-i', str(input_file),
+            '-map', '0:a:0',
+            '-c', 'copy',
+            '-f', 'mp3',
+            part_path
+        ],
+        part_path,
+        str(output_file)
+    )
+
+
+def _self_contained_tail(input_file: Path, tail_path: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Make a stream-copied tail start with a frame that decodes on its own.
+
+    The first of the first JOIN_SEARCH_FRAMES frames that can be rebuilt
+    with its bit reservoir (see mp3_frames.self_contained_frame) replaces
+    the frames before it.
+
+    Args:
+        input_file (Path): MP3 source the tail was copied from
+        tail_path (str): Tail file without Xing or ID3 headers, rewritten
+
+    Returns:
+        Optional[Tuple[int, int, int]]: Frames dropped, samples per frame and
+            frames left, or None if none of the frames can be rebuilt
+    """
+    with open(tail_path, 'rb') as f:
+        tail = f.read()
+    frames = []
+    frame = parse_header(tail, 0)
+    while frame is not None:
+        frames.append(frame)
+        frame = parse_header(tail, frame.offset + frame.size)
+
+    for dropped, frame in enumerate(frames[:JOIN_SEARCH_FRAMES]):
+        end = frame.offset + frame.size
+        try:
+            rebuilt = self_contained_frame(str(input_file), tail[frame.offset:end])
+        except ValueError:
+            continue
+        with open(tail_path, 'wb') as f:
+            f.write(rebuilt + tail[end:])
+        return dropped, frame.samples, len(frames) - dropped
+    return None
+
+
+def accurate_trim(input_file: Path, output_file: Path, seconds: float = CUT_SECONDS,
+                  end: Optional[float] = None) -> None:
+    """
+    Remove the intro with a sample-accurate cut, re-encoding only the head.
+
+    The audio from the cut to a frame boundary after HEAD_SECONDS is
+    re-encoded; everything after it is stream copied, and the two are
+    joined without decoding. The join is gapless:
+
+    - The head encode ends exactly where the first copied frame's audio
+      starts. Audio from before the cut pads it to whole frames and is
+      skipped at playback, like LAME's encoder delay, via the LAME tag.
+    - The first copied frame is rebuilt to carry its bit reservoir (see
+      mp3_frames.self_contained_frame), so it does not read the head's
+      bytes. Sources where no nearby frame fits (320 kbit/s at full
+      reservoir use) are re-encoded entirely instead.
+
+    Args:
+        input_file (Path): MP3 source
+        output_file (Path): MP3 to write
+        seconds (float, optional): Intro length to remove. Defaults to CUT_SECONDS.
+        end (float, optional): Source position to stop at. Defaults to the end.
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    copy_start = first_packet_time(input_file, seconds + HEAD_SECONDS)
+    if end is not None and end <= copy_start:
+        reencode_trim(input_file, output_file, seconds, end)
         return
+    sample_rate, source_skip = decoder_start(input_file)
+
+    with tempfile.TemporaryDirectory(dir=output_file.parent) as work_dir:
+        head_path = os.path.join(work_dir, 'head.mp3')
+        tail_path = os.path.join(work_dir, 'tail.mp3')
+        joined_path = os.path.join(work_dir, 'joined.mp3')
+        list_path = os.path.join(work_dir, 'parts.txt')
+
+        run_ffmpeg(
+            FFMPEG_BASE + [
+                '-ss', str(seconds + HEAD_SECONDS),
+                *_end_option(end),
+                '-i', str(input_file),
+                '-map', '0:a:0',
+                '-c', 'copy',
+                '-write_xing', '0',
+                '-id3v2_version', '0',
+                '-f', 'mp3',
+                tail_path + '.part'
+            ],
+            tail_path + '.part',
+            tail_path
+        )
+        tail_join = _self_contained_tail(input_file, tail_path)
+        if tail_join is None:
+            print(f"{input_file.name}: no frame after {copy_start:.2f}s can start a gapless join, "
+                  f"re-encoding the whole file")
+            reencode_trim(input_file, output_file, seconds, end)
+            return
+        dropped, frame_samples, tail_frames = tail_join
+
+        # Decoded sample positions (with -copyts): the cut, and the start
+        # of the first copied frame's audio
+        cut = round(seconds * sample_rate) + source_skip
+        join = round(copy_start * sample_rate) + dropped * frame_samples
+        # Lead-in from before the cut that makes the head whole frames
+        lead = -(ENCODER_DELAY + DECODER_DELAY + join - cut) % frame_samples
+        head_frames = (ENCODER_DELAY + DECODER_DELAY + lead + join - cut) // frame_samples
+        head_start = cut - lead
+        silence = max(0, source_skip - head_start)  # Lead-in before the first sample
+        decode_from = max(0.0, (head_start - source_skip) / sample_rate - DECODE_PREROLL)
+
+        filters = [
+            f'atrim=start_pts={head_start + silence}:end_pts={join + HEAD_LOOKAHEAD_SAMPLES}',
+            'asetpts=N/SR/TB'
+        ]
+        if silence:
+            filters.append(f'adelay=delays={silence}S:all=1')
+        run_ffmpeg(
+            FFMPEG_BASE + [
+                '-copyts',
+                '-ss', f'{decode_from:.6f}',
+                '-i', str(input_file),
+                '-map', '0:a:0',
+                '-af', ','.join(filters),
+                '-c:a', 'libmp3lame',
+                '-b:a', BITRATE,
+                '-write_xing', '0',
+                '-id3v2_version', '0',
+                '-f', 'mp3',
+                head_path + '.part'
+            ],
+            head_path + '.part',
+            head_path
+        )
+        # Drop the lookahead frames
+        with open(head_path, 'r+b') as f:
+            head = f.read()
+            position = 0
+            for _ in range(head_frames):
+                frame = parse_header(head, position)
+                if frame is None:
+                    raise RuntimeError(f"Head encode of {input_file} is too short")
+                position += frame.size
+            f.truncate(position)
+
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write("file 'head.mp3'\nfile 'tail.mp3'\n")
+
+        run_ffmpeg(
+            FFMPEG_BASE + [
+                '-f', 'concat',
+                '-safe', '0',
+                '-i', list_path,
+                '-c', 'copy',
+                '-f', 'mp3',
+                joined_path + '.part'
+            ],
+            joined_path + '.part',
+            joined_path
+        )
+
+        # The source's end padding applies unchanged unless the copy was cut short
+        if end is None:
+            padding = (gapless_info(str(input_file)) or (0, 0))[1]
+        else:
+            length = ENCODER_DELAY + DECODER_DELAY + lead + round(end * sample_rate) + source_skip - cut
+            padding = (head_frames + tail_frames) * frame_samples - length + DECODER_DELAY
+        set_gapless_info(joined_path, ENCODER_DELAY + lead, min(max(padding, 0), LAME_TAG_MAX))
+        os.replace(joined_path, str(output_file))
+
+
+def reencode_trim(input_file: Path, output_file: Path, seconds: float = CUT_SECONDS,
+                  end: Optional[float] = None) -> None:
+    """
+    Remove the intro by decoding and re-encoding the whole file to MP3.
+
+    Args:
+        input_file (Path): Source audio file (any format)
+        output_file (Path): MP3 to write
+        seconds (float, optional): Intro length to remove. Defaults to CUT_SECONDS.
+        end (float, optional): Source position to stop at. Defaults to the end.
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    # Seek before the cut and drop the pre-roll after decoding it
+    preroll = min(seconds, DECODE_PREROLL)
+    part_path = str(output_file) + '.part'
+    run_ffmpeg(
+        FFMPEG_BASE + [
+            '-ss', str(seconds - preroll),
+            *_end_option(end),
+            '-i', str(input_file),
+            '-ss', f'{preroll:.6f}',
+            '-vn',
+            '-c:a', 'libmp3lame',
+            '-b:a', BITRATE,
+            '-f', 'mp3',
+            part_path
+        ],
+        part_path,
+        str(output_file)
+    )
+
+
+def cut_audio(input_file: Path, output_file: Path, seconds: float = CUT_SECONDS, mode: str = 'copy',
+              end: Optional[float] = None) -> None:
+    """
+    Remove the first seconds (and optionally everything after end) of an
+    audio file and write an MP3.
+
+    Only MP3 sources can be stream copied; other formats are always
+    re-encoded.
+
+    Args:
+        input_file (Path): Source audio file
+        output_file (Path): MP3 to write
+        seconds (float, optional): Intro length to remove. Defaults to CUT_SECONDS.
+        mode (str, optional): One of TRIM_MODES. Defaults to 'copy'.
+        end (float, optional): Source position to stop at. Defaults to the end.
+
+    Raises:
+        ValueError: If the mode is unknown
+        RuntimeError: If ffmpeg fails
+    """
+    if mode not in TRIM_MODES:
+        raise ValueError(f"Unknown trim mode '{mode}' (available: {', '.join(TRIM_MODES)})")
+
+    if mode == 'reencode' or input_file.suffix.lower() != '.mp3':
+        reencode_trim(input_file, output_file, seconds, end)
+    elif mode == 'accurate':
+        accurate_trim(input_file, output_file, seconds, end)
+    else:
+        copy_trim(input_file, output_file, seconds, end)
+
+
+def auto_cut_audio(input_file: Path, output_file: Path, mode: str = 'copy',
+                   jingle: Optional[Path] = None) -> None:
+    """
+    Detect where the program audio starts and ends, then cut to it.
+
+    Args:
+        input_file (Path): Source audio file
+        output_file (Path): MP3 to write
+        mode (str, optional): One of TRIM_MODES. Defaults to 'copy'.
+        jingle (Path, optional): Station jingle to cut after, if found
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    points = detect_trim_points(str(input_file), str(jingle) if jingle else None)
+    end = f"{points.end:.2f}s" if points.end is not None else "end"
+    print(f"{input_file.name}: keeping {points.start:.2f}s - {end}")
+    cut_audio(input_file, output_file, points.start, mode, points.end)
+
+
+def main() -> int:
+    def configure(parser: argparse.ArgumentParser) -> None:
+        parser.add_argument('--seconds', type=float, default=CUT_SECONDS,
+                            help=f"intro length to remove (default: {CUT_SECONDS:g})")
+        parser.add_argument('--mode', choices=TRIM_MODES, default='copy',
+                            help="copy: frame-boundary stream copy; accurate: re-encode only the "
+                                 "first frames; reencode: re-encode everything (default: copy)")
+        parser.add_argument('--auto', action='store_true',
+                            help="detect leading/trailing silence per file instead of --seconds")
+        parser.add_argument('--jingle', type=Path,
+                            help="station jingle to cut after (implies --auto)")
+
+    args = parse_batch_args("Cut the intro from audio files", 'cut_mp3', configure=configure)
+
+    def task(source: Path, output: Path) -> None:
+        if args.auto or args.jingle:
+            auto_cut_audio(source, output, args.mode, args.jingle)
+        else:
+            cut_audio(source, output, args.seconds, args.mode)
 
-    # Look for common audio formats
-    audio_extensions = ('*.wav', '*.m4a', '*.aac', '*.wma', '*.ogg', '*.flac', '*.mp3')
-    files = []
-    for ext in audio_extensions:
-        files.extend(source_dir.glob(ext))
-    
-    print(f"Found {len(files)} audio files in the directory.")
+    return run_cli(args, task, SOURCE_EXTENSIONS, action='cutting')
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for file in files:
-            output_file = dest_dir / (file.stem + '.mp3')
-            executor.submit(cut_audio, file, output_file)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+FFmpeg Audio Conversion Engine
+
+Runs every audio conversion in the pipeline through a single ffmpeg
+process instead of moviepy's frame iterator.
+
+Key Features:
+- Streaming transcode: yt-dlp's audio stream is piped straight into
+  ffmpeg (stdin -> stdout -> final MP3), with no intermediate WebM file
+- File transcode for sources that are already on disk
+- Atomic output: ffmpeg writes <output>.part, renamed only on success
+- Mastering applied in the same pass as the encode (see audio_mastering)
+- Two-pass loudness normalization for files on disk, with the measurement
+  pass cached per source (see loudness_analysis); streams use single-pass
+
+Dependencies:
+- FFmpeg (with libmp3lame) on PATH, or FFMPEG_BINARY
+- yt-dlp (run as a subprocess with the current interpreter)
+
+Output Specifications:
+- Format: MP3 (libmp3lame)
+- Sample Rate: 44.1 kHz
+- Bitrate: 128 kbps
+- Channels and processing: set by the mastering profile
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+from typing import Any, Dict, List, Optional, Sequence
+
+from scripts.audio_mastering import build_filter_graph, get_profile
+from scripts.loudness_analysis import LoudnessIndex, analyze_loudness
+
+# FFmpeg executable (override with FFMPEG_BINARY)
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+
+# Podcast output settings
+SAMPLE_RATE = 44100
+BITRATE = '128k'
+
+# yt-dlp format used when streaming (audio-only, never muxed video)
+STREAM_FORMAT = 'bestaudio'
+
+
+def build_encode_command(
+    input_spec: str,
+    output_path: str,
+    profile=None,
+    measurement: Optional[Dict[str, str]] = None,
+    sample_rate: int = SAMPLE_RATE,
+    bitrate: str = BITRATE
+) -> List[str]:
+    """
+    Build the ffmpeg command mastering and encoding one input to a podcast MP3.
+
+    Args:
+        input_spec (str): Input file, or 'pipe:0' for stdin
+        output_path (str): File to write (always muxed as MP3)
+        profile (str or MasteringProfile, optional): Mastering profile.
+            Defaults to audio_mastering.DEFAULT_PROFILE.
+        measurement (Dict[str, str], optional): Loudness measurement for
+            linear (second-pass) normalization
+        sample_rate (int, optional): Output sample rate. Defaults to SAMPLE_RATE.
+        bitrate (str, optional): MP3 bitrate. Defaults to BITRATE.
+
+    Returns:
+        List[str]: ffmpeg argument list
+    """
+    profile = get_profile(profile)
+    command = [FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-y']
+    if input_spec != 'pipe:0':
+        command.append('-nostdin')
+
+    command += ['-i', input_spec, '-vn']
+
+    filter_graph = build_filter_graph(profile, measurement)
+    if filter_graph:
+        command += ['-af', filter_graph]
+    if profile.channels:
+        command += ['-ac', str(profile.channels)]
+
+    return command + [
+        '-ar', str(sample_rate),
+        '-c:a', 'libmp3lame',
+        '-b:a', bitrate,
+        '-f', 'mp3',
+        output_path
+    ]
+
+
+def _finish_output(part_path: str, output_path: str, returncode: int, error: str) -> None:
+    """Rename a completed .part file into place, or discard it on failure."""
+    if returncode != 0 or not os.path.exists(part_path):
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise RuntimeError(f"ffmpeg failed ({returncode}): {error.strip()}")
+    os.replace(part_path, output_path)
+
+
+def run_ffmpeg(command: List[str], part_path: str, output_path: str) -> None:
+    """
+    Run an ffmpeg command writing part_path, then move the result into place.
+
+    Args:
+        command (List[str]): Full ffmpeg argument list writing part_path
+        part_path (str): Temporary output written by the command
+        output_path (str): Final path
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    process = subprocess.run(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    _finish_output(part_path, output_path, process.returncode, process.stderr)
+
+
+def transcode_file(
+    source_path: str,
+    output_path: str,
+    profile=None,
+    loudness_index: Optional[LoudnessIndex] = None,
+    sample_rate: int = SAMPLE_RATE,
+    bitrate: str = BITRATE
+) -> None:
+    """
+    Master and encode a local audio/video file to a podcast MP3.
+
+    With a loudness index, loudness is normalized in two passes: the
+    measurement is looked up by the source's content hash (or measured
+    and stored once), then the encode applies linear loudnorm.
+
+    Args:
+        source_path (str): Input media file
+        output_path (str): Final MP3 path
+        profile (str or MasteringProfile, optional): Mastering profile
+        loudness_index (LoudnessIndex, optional): Measurement cache enabling
+            two-pass normalization. Defaults to single-pass.
+        sample_rate (int, optional): Output sample rate. Defaults to SAMPLE_RATE.
+        bitrate (str, optional): MP3 bitrate. Defaults to BITRATE.
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    profile = get_profile(profile)
+    measurement = None
+    if loudness_index is not None and profile.loudness_lufs is not None:
+        measurement = analyze_loudness(source_path, profile, loudness_index, FFMPEG_BINARY)
+
+    part_path = output_path + '.part'
+    run_ffmpeg(
+        build_encode_command(source_path, part_path, profile, measurement, sample_rate, bitrate),
+        part_path,
+        output_path
+    )
+
+
+def stream_transcode(video_url: str, output_path: str, format_selector: Optional[str] = None,
+                     profile=None, source_path: Optional[str] = None,
+                     info: Optional[Dict[str, Any]] = None,
+                     format_sort: Optional[Sequence[str]] = None) -> None:
+    """
+    Pipe a video's audio stream from yt-dlp straight into ffmpeg.
+
+    Download and encode run concurrently in two processes connected by a
+    pipe, so nothing but the final MP3 (and optionally a copy of the
+    source) touches the disk. Loudness is normalized single-pass, since
+    the stream cannot be measured first.
+
+    Args:
+        video_url (str): YouTube video URL
+        output_path (str): Final MP3 path
+        format_selector (str, optional): yt-dlp format. Defaults to STREAM_FORMAT.
+        profile (str or MasteringProfile, optional): Mastering profile
+        source_path (str, optional): Also keep the untouched source audio
+            here (Matroska, stream copied by the same ffmpeg process)
+        info (Dict[str, Any], optional): JSON-serializable yt-dlp info dict
+            already extracted for this video; yt-dlp loads it instead of
+            extracting the page again
+        format_sort (Sequence[str], optional): yt-dlp format sort fields,
+            e.g. ('+abr',) to make format_selector prefer small streams
+
+    Raises:
+        RuntimeError: If yt-dlp or ffmpeg fails
+    """
+    info_path = None
+    if info is not None:
+        with tempfile.NamedTemporaryFile('w', suffix='.info.json', delete=False, encoding='utf-8') as f:
+            json.dump(info, f)
+            info_path = f.name
+
+    try:
+        _stream_transcode(video_url, output_path, format_selector, profile, source_path, info_path, format_sort)
+    finally:
+        if info_path:
+            os.remove(info_path)
+
+
+def _stream_transcode(video_url: str, output_path: str, format_selector: Optional[str], profile,
+                      source_path: Optional[str], info_path: Optional[str],
+                      format_sort: Optional[Sequence[str]] = None) -> None:
+    """Run the yt-dlp | ffmpeg pipe for stream_transcode."""
+    part_path = output_path + '.part'
+    command = build_encode_command('pipe:0', part_path, profile)
+    if source_path:
+        command += ['-map', '0:a:0', '-c', 'copy', '-f', 'matroska', source_path + '.part']
+    # yt-dlp's stderr goes straight to the terminal so errors stay visible
+    downloader = subprocess.Popen(
+        [
+            sys.executable, '-m', 'yt_dlp',
+            '--format', format_selector or STREAM_FORMAT,
+            *(['--format-sort', ','.join(format_sort)] if format_sort else []),
+            '--output', '-',
+            '--quiet',
+            '--no-warnings',
+            '--no-playlist',
+            '--retries', '10',
+            *(['--load-info-json', info_path] if info_path else [video_url])
+        ],
+        stdout=subprocess.PIPE
+    )
+    try:
+        encoder = subprocess.Popen(
+            command,
+            stdin=downloader.stdout,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+    except OSError:
+        downloader.kill()
+        downloader.wait()
+        raise
+
+    # Only ffmpeg reads the pipe now, so yt-dlp sees SIGPIPE if ffmpeg exits
+    downloader.stdout.close()
+    _, encode_error = encoder.communicate()
+    try:
+        # yt-dlp exits on its own at EOF, or on a broken pipe if ffmpeg failed
+        downloader.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        downloader.kill()
+        downloader.wait()
+
+    if downloader.returncode != 0:
+        for path in (part_path, source_path and source_path + '.part'):
+            if path and os.path.exists(path):
+                os.remove(path)
+        detail = f"; ffmpeg: {encode_error.strip()}" if encoder.returncode != 0 else ''
+        raise RuntimeError(f"yt-dlp failed ({downloader.returncode}){detail}")
+
+    # The episode first, so an encoder error is reported and both parts removed
+    try:
+        _finish_output(part_path, output_path, encoder.returncode, encode_error)
+    except RuntimeError:
+        if source_path and os.path.exists(source_path + '.part'):
+            os.remove(source_path + '.part')
+        raise
+    if source_path:
+        _finish_output(source_path + '.part', source_path, encoder.returncode, encode_error)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Audio Mastering Profiles Module
+
+Describes the podcast mastering chain as named profiles and renders a
+profile into a single ffmpeg filter graph, so a mastered episode costs one
+decode and one encode instead of a separate tool run per processing step.
+
+Key Features:
+- Band-pass (high-pass + low-pass), FFT noise reduction, compression,
+  dynamic normalization, mono downmix and EBU R128 loudness normalization
+- Named profiles (PROFILES), each step optional
+- Filters rendered in a fixed order; the downmix runs first so every
+  later filter processes one channel instead of two
+- Single-pass (dynamic) loudnorm, or linear loudnorm from a measurement
+  pass (see loudness_analysis)
+
+Dependencies:
+- FFmpeg filters: aformat, highpass, lowpass, afftdn, acompressor,
+  dynaudnorm, loudnorm
+
+Profiles:
+- podcast: 50 Hz - 15 kHz, noise reduction, compression, dynamic
+  normalization, mono, -16 LUFS (default)
+- passthrough: Plain re-encode, no processing
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+
+class MasteringProfile(NamedTuple):
+    """
+    A mastering chain. Steps set to None are skipped.
+
+    Attributes:
+        name: Profile name
+        channels: Output channel count (1 = mono downmix)
+        highpass_hz: High-pass cutoff frequency
+        lowpass_hz: Low-pass cutoff frequency
+        noise_reduction_db: afftdn noise reduction amount in dB
+        compressor: acompressor options, e.g. 'threshold=-21dB:ratio=3'
+        dynamic_normalization: dynaudnorm options ('' for defaults)
+        loudness_lufs: Integrated loudness target for loudnorm
+        true_peak_db: Maximum true peak for loudnorm
+        loudness_range: Loudness range target for loudnorm
+    """
+    name: str
+    channels: Optional[int] = None
+    highpass_hz: Optional[int] = None
+    lowpass_hz: Optional[int] = None
+    noise_reduction_db: Optional[float] = None
+    compressor: Optional[str] = None
+    dynamic_normalization: Optional[str] = None
+    loudness_lufs: Optional[float] = None
+    true_peak_db: float = -1.5
+    loudness_range: float = 11.0
+
+
+# Available mastering profiles by name
+PROFILES = {
+    'podcast': MasteringProfile(
+        name='podcast',
+        channels=1,
+        highpass_hz=50,
+        lowpass_hz=15000,
+        noise_reduction_db=12,
+        compressor='threshold=-21dB:ratio=3:attack=20:release=250:makeup=2',
+        dynamic_normalization='f=250:g=15:p=0.9',
+        loudness_lufs=-16.0
+    ),
+    'passthrough': MasteringProfile(name='passthrough'),
+}
+
+DEFAULT_PROFILE = 'podcast'
+
+
+def get_profile(profile: Optional[object] = None) -> MasteringProfile:
+    """
+    Resolve a profile name (or profile) to a MasteringProfile.
+
+    Args:
+        profile (str or MasteringProfile, optional): Profile name or
+            profile. Defaults to DEFAULT_PROFILE.
+
+    Returns:
+        MasteringProfile: Resolved profile
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    if isinstance(profile, MasteringProfile):
+        return profile
+
+    name = profile or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown mastering profile '{name}' (available: {', '.join(sorted(PROFILES))})")
+    return PROFILES[name]
+
+
+def pre_loudness_filters(profile: MasteringProfile) -> List[str]:
+    """
+    Render every step before loudness normalization.
+
+    Args:
+        profile (MasteringProfile): Mastering profile
+
+    Returns:
+        List[str]: ffmpeg filters in processing order
+    """
+    filters = []
+    if profile.channels == 1:
+        filters.append('aformat=channel_layouts=mono')
+    if profile.highpass_hz:
+        filters.append(f'highpass=f={profile.highpass_hz}')
+    if profile.lowpass_hz:
+        filters.append(f'lowpass=f={profile.lowpass_hz}')
+    if profile.noise_reduction_db:
+        filters.append(f'afftdn=nr={profile.noise_reduction_db}')
+    if profile.compressor is not None:
+        filters.append(f'acompressor={profile.compressor}' if profile.compressor else 'acompressor')
+    if profile.dynamic_normalization is not None:
+        filters.append(
+            f'dynaudnorm={profile.dynamic_normalization}' if profile.dynamic_normalization else 'dynaudnorm'
+        )
+    return filters
+
+
+def loudness_filter(profile: MasteringProfile, measurement: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    Render the loudness normalization step.
+
+    Without a measurement loudnorm runs single-pass (dynamic). With the
+    statistics of a measurement pass it applies linear normalization.
+
+    Args:
+        profile (MasteringProfile): Mastering profile
+        measurement (Dict[str, str], optional): loudnorm statistics
+            (input_i, input_tp, input_lra, input_thresh, target_offset)
+
+    Returns:
+        Optional[str]: loudnorm filter, or None if the profile has no loudness target
+    """
+    if profile.loudness_lufs is None:
+        return None
+
+    loudnorm = f'loudnorm=I={profile.loudness_lufs}:TP={profile.true_peak_db}:LRA={profile.loudness_range}'
+    if measurement:
+        loudnorm += (
+            f":measured_I={measurement['input_i']}"
+            f":measured_TP={measurement['input_tp']}"
+            f":measured_LRA={measurement['input_lra']}"
+            f":measured_thresh={measurement['input_thresh']}"
+            f":offset={measurement['target_offset']}"
+            ':linear=true'
+        )
+    return loudnorm
+
+
+def build_filter_graph(
+    profile: Optional[object] = None,
+    measurement: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """
+    Render a profile as one ffmpeg audio filter graph (-af).
+
+    Args:
+        profile (str or MasteringProfile, optional): Profile name or
+            profile. Defaults to DEFAULT_PROFILE.
+        measurement (Dict[str, str], optional): Loudness measurement for
+            linear (second-pass) normalization
+
+    Returns:
+        Optional[str]: Comma-separated filter graph, or None if the
+            profile applies no processing
+    """
+    profile = get_profile(profile)
+    filters = pre_loudness_filters(profile)
+
+    loudnorm = loudness_filter(profile, measurement)
+    if loudnorm:
+        filters.append(loudnorm)
+
+    return ','.join(filters) or None
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Batch Audio Transcoding Module
+
+Runs a per-file audio task (transcode, cut, ...) over every matching file
+in a source directory and reports per-file timing. Shared by
+manual_convert and audio_cut; also usable directly as a CLI.
+
+Each task runs its own ffmpeg process, so the worker threads only wait on
+subprocesses and never contend for the GIL: throughput scales with cores
+up to the worker count.
+
+Key Features:
+- Source and destination directories from the command line
+- Worker pool sized to the machine (cores - 1 by default)
+- Per-file timing and an aggregate speedup summary
+- Failures reported per file without stopping the batch
+
+Dependencies:
+- FFmpeg (see audio_engine)
+- concurrent.futures: Worker pool
+
+Usage:
+    python -m scripts.batch_transcode <source_dir> [--dest-dir DIR] [--workers N]
+        [--profile NAME] [--bitrate 256k] [--sample-rate 48000]
+"""
+
+import os
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from scripts.audio_engine import transcode_file
+from scripts.audio_mastering import PROFILES
+from scripts.loudness_analysis import shared_index
+
+# Leave one core free for system tasks
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
+# Source formats picked up by default
+AUDIO_EXTENSIONS = ('.wav', '.m4a', '.aac', '.wma', '.ogg', '.flac', '.webm', '.mp3')
+
+# A task processes one source file into one output file
+Task = Callable[[Path, Path], Any]
+
+
+def find_sources(source_dir: Path, extensions: Iterable[str] = AUDIO_EXTENSIONS) -> List[Path]:
+    """
+    List the files in a directory with one of the given extensions.
+
+    Args:
+        source_dir (Path): Directory to scan (not recursive)
+        extensions (Iterable[str], optional): Extensions including the dot,
+            case-insensitive. Defaults to AUDIO_EXTENSIONS.
+
+    Returns:
+        List[Path]: Matching files sorted by name
+    """
+    extensions = {extension.lower() for extension in extensions}
+    return sorted(
+        path for path in source_dir.iterdir()
+        if path.is_file() and path.suffix.lower() in extensions
+    )
+
+
+def run_batch(
+    files: Sequence[Path],
+    dest_dir: Path,
+    task: Task,
+    workers: int = DEFAULT_WORKERS,
+    suffix: str = '.mp3'
+) -> List[Dict[str, Any]]:
+    """
+    Run a task for every file on a worker pool, timing each file.
+
+    Args:
+        files (Sequence[Path]): Source files
+        dest_dir (Path): Output directory, created if missing
+        task (Task): Called as task(source, output) in a worker thread
+        workers (int, optional): Concurrent tasks. Defaults to DEFAULT_WORKERS.
+        suffix (str, optional): Output file extension. Defaults to '.mp3'.
+
+    Returns:
+        List[Dict[str, Any]]: In input order, dicts with 'source', 'output',
+            'seconds' and 'error' (exception or None)
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    def process(source: Path) -> Dict[str, Any]:
+        output = dest_dir / (source.stem + suffix)
+        start = time.perf_counter()
+        try:
+            task(source, output)
+            error = None
+        except Exception as e:
+            error = e
+        seconds = time.perf_counter() - start
+
+        if error is None:
+            print(f"✓ {source.name} ({seconds:.1f}s)")
+        else:
+            print(f"✗ {source.name} ({seconds:.1f}s): {str(error)}")
+        return {'source': source, 'output': output, 'seconds': seconds, 'error': error}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(process, files))
+    elapsed = time.perf_counter() - start
+
+    succeeded = sum(result['error'] is None for result in results)
+    busy = sum(result['seconds'] for result in results)
+    print(f"\n{succeeded}/{len(results)} files done in {elapsed:.1f}s "
+          f"({busy:.1f}s of work, {busy / elapsed if elapsed else 0:.1f}x parallel speedup)")
+    return results
+
+
+def parse_batch_args(
+    description: str,
+    dest_name: str,
+    argv: Optional[Sequence[str]] = None,
+    configure: Optional[Callable[[argparse.ArgumentParser], None]] = None
+) -> argparse.Namespace:
+    """
+    Parse the command-line options shared by the batch scripts.
+
+    Args:
+        description (str): Script description for --help
+        dest_name (str): Default output folder name, created next to the
+            source directory
+        argv (Sequence[str], optional): Arguments. Defaults to sys.argv.
+        configure (Callable, optional): Adds script-specific options
+
+    Returns:
+        argparse.Namespace: Options with source_dir and dest_dir as Paths
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('source_dir', type=Path, help="directory with the source audio files")
+    parser.add_argument(
+        '--dest-dir',
+        type=Path,
+        help=f"output directory (default: <source_dir>/../{dest_name})"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"concurrent ffmpeg processes (default: {DEFAULT_WORKERS})"
+    )
+    if configure:
+        configure(parser)
+
+    args = parser.parse_args(argv)
+    if args.dest_dir is None:
+        args.dest_dir = args.source_dir.parent / dest_name
+    return args
+
+
+def run_cli(
+    args: argparse.Namespace,
+    task: Task,
+    extensions: Iterable[str] = AUDIO_EXTENSIONS,
+    action: str = 'conversion'
+) -> int:
+    """
+    Run a batch from parsed options, printing the same header for every script.
+
+    Args:
+        args (argparse.Namespace): Options from parse_batch_args
+        task (Task): Per-file task
+        extensions (Iterable[str], optional): Source extensions.
+            Defaults to AUDIO_EXTENSIONS.
+        action (str, optional): Word used in the worker count line
+
+    Returns:
+        int: Process exit code (0 if every file succeeded)
+    """
+    print(f"Source directory: {args.source_dir}")
+    print(f"Destination directory: {args.dest_dir}")
+    print(f"Using {args.workers} worker(s) for {action}")
+
+    if not args.source_dir.is_dir():
+        print("Error: The source directory does not exist.")
+        return 1
+
+    files = find_sources(args.source_dir, extensions)
+    print(f"Found {len(files)} audio files in the directory.")
+
+    results = run_batch(files, args.dest_dir, task, args.workers)
+    return 0 if all(result['error'] is None for result in results) else 1
+
+
+def make_transcode_task(profile: str = 'passthrough', bitrate: str = '128k', sample_rate: int = 44100) -> Task:
+    """
+    Build a task transcoding one file with audio_engine.transcode_file.
+
+    Profiles with a loudness target use two-pass normalization with the
+    shared loudness index.
+
+    Args:
+        profile (str, optional): Mastering profile name. Defaults to 'passthrough'.
+        bitrate (str, optional): MP3 bitrate. Defaults to '128k'.
+        sample_rate (int, optional): Output sample rate. Defaults to 44100.
+
+    Returns:
+        Task: task(source, output)
+    """
+    def task(source: Path, output: Path) -> None:
+        transcode_file(
+            str(source),
+            str(output),
+            profile=profile,
+            loudness_index=shared_index(),
+            sample_rate=sample_rate,
+            bitrate=bitrate
+        )
+
+    return task
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command-line interface: transcode a directory to MP3.
+
+    Args:
+        argv (Sequence[str], optional): Arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Process exit code
+    """
+    def configure(parser: argparse.ArgumentParser) -> None:
+        parser.add_argument('--profile', choices=sorted(PROFILES), default='passthrough',
+                            help="mastering profile (default: passthrough)")
+        parser.add_argument('--bitrate', default='128k', help="MP3 bitrate (default: 128k)")
+        parser.add_argument('--sample-rate', type=int, default=44100,
+                            help="output sample rate (default: 44100)")
+
+    args = parse_batch_args("Batch transcode audio files to MP3", 'converted_mp3', argv, configure)
+    return run_cli(args, make_transcode_task(args.profile, args.bitrate, args.sample_rate))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Chunked Upload Module
+
+Streams a file to a presigned upload URL in fixed-size chunks with
+progress reporting, measured throughput and retries.
+
+If a transfer fails, the file is sent again from the start. Only for
+endpoints known to support resumable upload sessions (resumable=True) is
+the endpoint first asked how much it has received (PUT with
+"Content-Range: bytes */<size>"); it answers 308 and a Range header, and
+the upload continues from there with a Content-Range PUT. The query is
+never sent to other endpoints: to a plain presigned PUT URL (S3, for
+example) it is an ordinary upload that would replace the object with an
+empty one.
+
+Key Features:
+- Streaming from disk in UPLOAD_CHUNK_SIZE reads (constant memory)
+- Progress callbacks with bytes sent, total and throughput
+- Retries with exponential backoff for network errors, timeouts and 5xx responses
+- Resume from the last byte received on resumable-session endpoints
+
+Dependencies:
+- requests: HTTP client (pass a pooled requests.Session)
+"""
+
+import os
+import time
+from typing import BinaryIO, Callable, Dict, NamedTuple, Optional, Tuple
+
+import requests
+
+# Bytes read from disk and reported per progress callback
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Retries after a failed transfer, and the first backoff delay (doubled each retry)
+UPLOAD_RETRIES = 3
+RETRY_DELAY = 2.0
+
+# (connect, read) timeout in seconds for each upload PUT; a stalled
+# transfer then fails and is retried instead of blocking the worker
+UPLOAD_TIMEOUT = (10, 60)
+
+# Status of a resumable-upload status query for an incomplete upload
+RESUME_INCOMPLETE = 308
+
+# Called as progress(bytes_received, total_bytes, bytes_per_second)
+ProgressCallback = Callable[[int, int, float], None]
+
+
+class UploadResult(NamedTuple):
+    """Outcome of upload_file."""
+    size: int
+    bytes_sent: int
+    seconds: float
+    attempts: int
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second sent over the whole upload, retries included."""
+        return self.bytes_sent / self.seconds if self.seconds else 0.0
+
+
+class _ChunkReader:
+    """File-like body sending [offset, size) of a file in chunks."""
+
+    def __init__(self, file: BinaryIO, offset: int, size: int, chunk_size: int,
+                 on_chunk: Callable[[int], None]):
+        file.seek(offset)
+        self.file = file
+        self.remaining = size - offset
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self.sent = 0
+
+    def __len__(self) -> int:
+        # requests sends this as Content-Length instead of chunked encoding
+        return self.remaining
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.file.read(min(self.chunk_size, self.remaining))
+        self.remaining -= len(data)
+        self.sent += len(data)
+        if data:
+            self.on_chunk(len(data))
+        return data
+
+
+def progress_printer(label: str, step: int = 10) -> ProgressCallback:
+    """
+    Build a progress callback that prints every step percent.
+
+    Args:
+        label (str): Name printed with each line, e.g. the file name
+        step (int, optional): Percent between lines. Defaults to 10.
+
+    Returns:
+        ProgressCallback: Callback for upload_file
+    """
+    next_percent = [step]
+
+    def report(received: int, total: int, rate: float) -> None:
+        percent = 100 * received // total if total else 100
+        if percent >= next_percent[0]:
+            next_percent[0] = (percent // step + 1) * step
+            print(f"Upload {label}: {percent}% ({rate / 1024 ** 2:.1f} MB/s)")
+
+    return report
+
+
+def query_offset(session: requests.Session, url: str, size: int, timeout: float = 30) -> Optional[int]:
+    """
+    Ask a resumable-upload endpoint how many bytes it has received.
+
+    Only for resumable upload sessions: a plain presigned PUT URL treats
+    the query as an upload of an empty object.
+
+    Args:
+        session (requests.Session): HTTP session
+        url (str): Upload URL
+        size (int): Total file size
+        timeout (float, optional): Request timeout in seconds. Defaults to 30.
+
+    Returns:
+        Optional[int]: Offset to resume from, or None if the endpoint
+            does not support resuming
+    """
+    try:
+        response = session.put(url, data=b'', headers={'Content-Range': f'bytes */{size}'}, timeout=timeout)
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code != RESUME_INCOMPLETE:
+        return None
+
+    # "Range: bytes=0-N" lists what was stored; no header means nothing was
+    received = response.headers.get('Range')
+    if not received:
+        return 0
+    return int(received.rsplit('-', 1)[1]) + 1
+
+
+def upload_file(
+    session: requests.Session,
+    url: str,
+    file_path: str,
+    progress: Optional[ProgressCallback] = None,
+    headers: Optional[Dict[str, str]] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    max_retries: int = UPLOAD_RETRIES,
+    retry_delay: float = RETRY_DELAY,
+    resumable: bool = False,
+    timeout: Tuple[float, float] = UPLOAD_TIMEOUT
+) -> UploadResult:
+    """
+    PUT a file to an upload URL, retrying (and resuming if possible) on failure.
+
+    Args:
+        session (requests.Session): HTTP session
+        url (str): Presigned upload URL
+        file_path (str): File to send
+        progress (ProgressCallback, optional): Called after every chunk
+        headers (Dict[str, str], optional): Extra request headers
+        chunk_size (int, optional): Bytes per read. Defaults to UPLOAD_CHUNK_SIZE.
+        max_retries (int, optional): Retries after a failed transfer.
+            Defaults to UPLOAD_RETRIES.
+        retry_delay (float, optional): First backoff delay in seconds,
+            doubled on every retry. Defaults to RETRY_DELAY.
+        resumable (bool, optional): The URL is a resumable upload session,
+            so a retry asks it where to resume (see query_offset). Defaults
+            to False: every retry sends the whole file again.
+        timeout (Tuple[float, float], optional): (connect, read) timeout in
+            seconds for each PUT; a stalled transfer counts as a failed
+            attempt. Defaults to UPLOAD_TIMEOUT.
+
+    Returns:
+        UploadResult: Size, bytes actually sent, duration and attempts
+
+    Raises:
+        RuntimeError: On a client error (4xx) or once retries run out
+    """
+    size = os.path.getsize(file_path)
+    offset = 0
+    bytes_sent = 0
+    start = time.perf_counter()
+
+    with open(file_path, 'rb') as file:
+        for attempt in range(max_retries + 1):
+            def on_chunk(length: int) -> None:
+                if progress:
+                    elapsed = time.perf_counter() - start
+                    done = bytes_sent + reader.sent
+                    progress(offset + reader.sent, size, done / elapsed if elapsed else 0.0)
+
+            reader = _ChunkReader(file, offset, size, chunk_size, on_chunk)
+            request_headers = dict(headers or {})
+            if offset:
+                request_headers['Content-Range'] = f'bytes {offset}-{size - 1}/{size}'
+
+            try:
+                response = session.put(url, data=reader, headers=request_headers, timeout=timeout)
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code in (200, 201):
+                    bytes_sent += reader.sent
+                    return UploadResult(size, bytes_sent, time.perf_counter() - start, attempt + 1)
+                if response.status_code < 500 and response.status_code != RESUME_INCOMPLETE:
+                    raise RuntimeError(f"Upload rejected ({error})")
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+            bytes_sent += reader.sent
+
+            if attempt == max_retries:
+                break
+            resume_at = query_offset(session, url, size) if resumable else None
+            offset = resume_at if resume_at is not None else 0
+            delay = retry_delay * 2 ** attempt
+            action = f"resuming at {offset / 1024 ** 2:.1f} MB" if resume_at is not None else "restarting"
+            print(f"Upload interrupted ({error}), {action} in {delay:.0f}s...")
+            time.sleep(delay)
+
+    raise RuntimeError(f"Upload failed after {max_retries + 1} attempts: {error}")
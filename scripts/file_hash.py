@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+File Hashing Module
+
+Content hashes of media files, shared by the modules that key stored
+results by file content (loudness measurements, the upload ledger).
+
+Dependencies:
+- hashlib: Standard library hashing
+"""
+
+import hashlib
+
+# Bytes read per chunk while hashing a file
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """
+    Hash a file's content.
+
+    Args:
+        path (str): File to hash
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Loudness Analysis Module
+
+Measurement pass for two-pass EBU R128 loudness normalization. A source is
+measured once through the pre-loudness part of a mastering chain; the
+result is stored in a JSON index keyed by the source's content hash, so
+later encodes (or re-masters with another loudness target) only run the
+final linear-normalization pass.
+
+Key Features:
+- Measures integrated loudness, true peak, loudness range and threshold
+  with ffmpeg's loudnorm filter
+- Index keyed by SHA-256 of the source file and the pre-loudness filter
+  chain the measurement was taken after
+- Atomic, thread-safe index writes (shared by concurrent encode workers)
+
+Dependencies:
+- FFmpeg (loudnorm filter)
+- json: Standard library storage
+
+Storage (JSON, default output/loudness_index.json):
+    {"<sha256>": {"<pre-loudness filter chain>": {"input_i": "-23.10", ...}}}
+"""
+
+import os
+import re
+import json
+import subprocess
+import threading
+from functools import lru_cache
+from typing import Dict, Optional
+
+from scripts.audio_mastering import MasteringProfile, pre_loudness_filters
+from scripts.file_hash import file_sha256
+
+# Default location of the loudness index
+LOUDNESS_INDEX_FILE = os.path.join('output', 'loudness_index.json')
+
+# loudnorm statistics kept from a measurement pass
+MEASUREMENT_KEYS = ('input_i', 'input_tp', 'input_lra', 'input_thresh', 'target_offset')
+
+# loudnorm prints its statistics as the last JSON object on stderr
+LOUDNORM_JSON_PATTERN = re.compile(r'\{[^{}]*"input_i"[^{}]*\}')
+
+Measurement = Dict[str, str]
+
+
+class LoudnessIndex:
+    """
+    JSON index of loudness measurements by source hash and filter chain.
+
+    Args:
+        path (str, optional): Index file, created on first write.
+            Defaults to LOUDNESS_INDEX_FILE.
+    """
+
+    def __init__(self, path: str = LOUDNESS_INDEX_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Measurement]] = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable loudness index {path}: {str(e)}")
+
+    def get(self, source_hash: str, chain: str) -> Optional[Measurement]:
+        """
+        Look up a stored measurement.
+
+        Args:
+            source_hash (str): SHA-256 of the source file
+            chain (str): Pre-loudness filter chain
+
+        Returns:
+            Optional[Measurement]: Stored loudnorm statistics, or None
+        """
+        with self._lock:
+            return self._entries.get(source_hash, {}).get(chain)
+
+    def put(self, source_hash: str, chain: str, measurement: Measurement) -> None:
+        """
+        Store a measurement and write the index to disk.
+
+        Args:
+            source_hash (str): SHA-256 of the source file
+            chain (str): Pre-loudness filter chain
+            measurement (Measurement): loudnorm statistics
+        """
+        with self._lock:
+            self._entries.setdefault(source_hash, {})[chain] = measurement
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+
+
+@lru_cache(maxsize=None)
+def shared_index(path: str = LOUDNESS_INDEX_FILE) -> LoudnessIndex:
+    """
+    Return the process-wide LoudnessIndex for a path.
+
+    Concurrent encode workers must share one instance so that their
+    writes do not overwrite each other.
+
+    Args:
+        path (str, optional): Index file. Defaults to LOUDNESS_INDEX_FILE.
+
+    Returns:
+        LoudnessIndex: Shared index
+    """
+    return LoudnessIndex(path)
+
+
+def measure_loudness(source_path: str, profile: MasteringProfile, ffmpeg_binary: str = 'ffmpeg') -> Measurement:
+    """
+    Run the loudnorm measurement pass over a source.
+
+    The source is decoded through the profile's pre-loudness filters, so
+    the statistics describe exactly what the final loudnorm will see.
+
+    Args:
+        source_path (str): Input media file
+        profile (MasteringProfile): Mastering profile with a loudness target
+        ffmpeg_binary (str, optional): ffmpeg executable. Defaults to 'ffmpeg'.
+
+    Returns:
+        Measurement: loudnorm statistics (MEASUREMENT_KEYS)
+
+    Raises:
+        RuntimeError: If ffmpeg fails or prints no statistics
+    """
+    filters = pre_loudness_filters(profile) + [
+        f'loudnorm=I={profile.loudness_lufs}:TP={profile.true_peak_db}'
+        f':LRA={profile.loudness_range}:print_format=json'
+    ]
+    process = subprocess.run(
+        [
+            ffmpeg_binary, '-hide_banner', '-nostats', '-nostdin',
+            '-i', source_path,
+            '-vn',
+            '-af', ','.join(filters),
+            '-f', 'null', '-'
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+
+    stats = LOUDNORM_JSON_PATTERN.findall(process.stderr)
+    if process.returncode != 0 or not stats:
+        raise RuntimeError(f"Loudness analysis failed ({process.returncode}): {process.stderr.strip()[-500:]}")
+
+    values = json.loads(stats[-1])
+    return {key: values[key] for key in MEASUREMENT_KEYS}
+
+
+def analyze_loudness(
+    source_path: str,
+    profile: MasteringProfile,
+    index: LoudnessIndex,
+    ffmpeg_binary: str = 'ffmpeg'
+) -> Measurement:
+    """
+    Return a source's loudness measurement, measuring only on a cache miss.
+
+    Args:
+        source_path (str): Input media file
+        profile (MasteringProfile): Mastering profile with a loudness target
+        index (LoudnessIndex): Measurement index to read and update
+        ffmpeg_binary (str, optional): ffmpeg executable. Defaults to 'ffmpeg'.
+
+    Returns:
+        Measurement: loudnorm statistics
+    """
+    source_hash = file_sha256(source_path)
+    chain = ','.join(pre_loudness_filters(profile))
+
+    measurement = index.get(source_hash, chain)
+    if measurement is not None:
+        print(f"Reusing loudness analysis for {os.path.basename(source_path)}")
+        return measurement
+
+    print(f"Analyzing loudness: {os.path.basename(source_path)}")
+    measurement = measure_loudness(source_path, profile, ffmpeg_binary)
+    index.put(source_hash, chain, measurement)
+    return measurement
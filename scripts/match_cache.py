@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Persistent Match Cache Module
+
+Stores the best YouTube match for each Spotify title between pipeline runs
+so that url_matcher.match_podcast_urls only scores pairs that are new or
+changed since the previous run.
+
+Storage (SQLite, default output/match_cache.sqlite):
+- matches: (normalized Spotify title, matcher version) -> best video_id and score
+- videos: metadata snapshot (video_id -> normalized title) per matcher version
+
+Invalidation:
+- A cached best match is reused as long as its video is unchanged in the
+  current metadata snapshot; only new or retitled videos are scored
+  against it.
+- If the matched video was removed or retitled, the title is re-scored.
+- When the snapshot changes, matches for titles that were not part of the
+  run are dropped, since they were never compared against the new videos.
+- Bumping url_matcher.MATCHER_VERSION (or changing the matching mode)
+  starts a fresh cache namespace.
+
+Dependencies:
+- sqlite3: Standard library persistence
+"""
+
+import os
+import sqlite3
+from typing import Dict, Optional, Tuple
+
+# Best match per title: (video_id or None when nothing was scored, confidence)
+CachedMatch = Tuple[Optional[str], float]
+
+
+class MatchCache:
+    """
+    SQLite-backed store of best matches and the metadata snapshot they
+    were computed against.
+
+    Args:
+        path (str): SQLite database file, created if missing
+        matcher_version (str): Version tag of the matching algorithm
+    """
+
+    def __init__(self, path: str, matcher_version: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.matcher_version = matcher_version
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS matches (
+                spotify_key TEXT NOT NULL,
+                matcher_version TEXT NOT NULL,
+                video_id TEXT,
+                confidence REAL NOT NULL,
+                PRIMARY KEY (spotify_key, matcher_version)
+            );
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT NOT NULL,
+                matcher_version TEXT NOT NULL,
+                title_key TEXT NOT NULL,
+                PRIMARY KEY (video_id, matcher_version)
+            );
+        """)
+
+    def __enter__(self) -> 'MatchCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.connection.close()
+
+    def load_snapshot(self) -> Dict[str, str]:
+        """
+        Load the metadata snapshot stored by the previous run.
+
+        Returns:
+            Dict[str, str]: video_id to normalized title
+        """
+        rows = self.connection.execute(
+            "SELECT video_id, title_key FROM videos WHERE matcher_version = ?",
+            (self.matcher_version,)
+        )
+        return dict(rows)
+
+    def load_matches(self) -> Dict[str, CachedMatch]:
+        """
+        Load every cached best match.
+
+        Returns:
+            Dict[str, CachedMatch]: Normalized Spotify title to (video_id, confidence)
+        """
+        rows = self.connection.execute(
+            "SELECT spotify_key, video_id, confidence FROM matches WHERE matcher_version = ?",
+            (self.matcher_version,)
+        )
+        return {spotify_key: (video_id, confidence) for spotify_key, video_id, confidence in rows}
+
+    def save(self, snapshot: Dict[str, str], matches: Dict[str, CachedMatch]) -> None:
+        """
+        Store the current snapshot and the best matches computed against it.
+
+        If the snapshot differs from the stored one, cached matches for
+        titles not included in ``matches`` are discarded.
+
+        Args:
+            snapshot (Dict[str, str]): video_id to normalized title
+            matches (Dict[str, CachedMatch]): Normalized Spotify title to
+                (video_id, confidence)
+        """
+        version = self.matcher_version
+        with self.connection:
+            if snapshot != self.load_snapshot():
+                self.connection.execute("DELETE FROM matches WHERE matcher_version = ?", (version,))
+                self.connection.execute("DELETE FROM videos WHERE matcher_version = ?", (version,))
+                self.connection.executemany(
+                    "INSERT INTO videos (video_id, matcher_version, title_key) VALUES (?, ?, ?)",
+                    ((video_id, version, title_key) for video_id, title_key in snapshot.items())
+                )
+
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO matches (spotify_key, matcher_version, video_id, confidence) "
+                "VALUES (?, ?, ?, ?)",
+                ((spotify_key, version, video_id, confidence)
+                 for spotify_key, (video_id, confidence) in matches.items())
+            )
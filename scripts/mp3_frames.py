@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+MP3 Frame Module
+
+Frame-level helpers for joining MPEG audio layer III streams without
+decoding them, used by audio_cut's accurate mode.
+
+An MP3 frame's audio data may start in earlier frames (the bit
+reservoir: main_data_begin bytes back), so a stream copy starting at an
+arbitrary frame cannot decode that frame. self_contained_frame rebuilds
+such a frame with its reservoir bytes included. The encoder delay in the
+LAME tag tells decoders how many samples to skip at the start of a file,
+and the padding how many at the end; set_gapless_info rewrites them.
+
+Key Features:
+- Layer III header and side information parsing (MPEG-1, 2 and 2.5)
+- Self-contained frame rebuild: the frame is re-sent at a bitrate large
+  enough to hold its reservoir bytes, so the following frames still find
+  theirs
+- LAME tag delay and padding update, with the tag CRC recomputed
+
+Dependencies:
+- mmap: Random access to large source files
+"""
+
+import mmap
+from typing import List, NamedTuple, Optional, Tuple
+
+# Layer III bitrates in kbit/s by header bitrate index, MPEG-1 and MPEG-2/2.5
+BITRATES_MPEG1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+BITRATES_MPEG2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# Sample rates by header version bits (3: MPEG-1, 2: MPEG-2, 0: MPEG-2.5)
+SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+# Samples LAME adds in front of the audio, and a decoder on top of that
+# (528 + 1, per the LAME tag spec)
+ENCODER_DELAY = 576
+DECODER_DELAY = 529
+
+# Bytes searched before a frame for the frames holding its reservoir
+RESERVOIR_WINDOW = 16 * 1441
+
+# Offsets in the Xing/Info frame: LAME tag after the Xing header fields,
+# delay/padding and tag CRC within the LAME tag
+LAME_TAG_OFFSET = 120
+LAME_DELAY_OFFSET = 21
+LAME_CRC_OFFSET = 34
+
+# Largest delay or padding the LAME tag can hold (12 bits each)
+LAME_TAG_MAX = (1 << 12) - 1
+
+# Bytes read to find the LAME tag (ID3v2 tag and the first frame)
+TAG_READ_SIZE = 64 * 1024
+
+
+class FrameHeader(NamedTuple):
+    """Parsed layer III frame header."""
+    offset: int
+    size: int
+    bitrate_index: int
+    mpeg1: bool
+    protected: bool
+    channels: int
+    sample_rate: int
+
+    @property
+    def side_info_start(self) -> int:
+        """Offset of the side information (after the header and CRC)."""
+        return self.offset + 4 + (2 if self.protected else 0)
+
+    @property
+    def side_info_size(self) -> int:
+        """Bytes of side information."""
+        if self.mpeg1:
+            return 17 if self.channels == 1 else 32
+        return 9 if self.channels == 1 else 17
+
+    @property
+    def payload_start(self) -> int:
+        """Offset of the main data area (after the side information)."""
+        return self.side_info_start + self.side_info_size
+
+    @property
+    def samples(self) -> int:
+        """Samples per channel decoded from one frame."""
+        return 1152 if self.mpeg1 else 576
+
+
+def frame_size(mpeg1: bool, bitrate_index: int, sample_rate: int, padding: int = 0) -> int:
+    """Bytes in a layer III frame with the given header fields."""
+    bitrates = BITRATES_MPEG1 if mpeg1 else BITRATES_MPEG2
+    return (144000 if mpeg1 else 72000) * bitrates[bitrate_index] // sample_rate + padding
+
+
+def parse_header(data, offset: int) -> Optional[FrameHeader]:
+    """
+    Parse the layer III frame header at offset.
+
+    Args:
+        data (bytes or mmap): MP3 data
+        offset (int): Position of the header
+
+    Returns:
+        Optional[FrameHeader]: Header, or None if there is no valid one
+    """
+    if offset + 4 > len(data):
+        return None
+    header = int.from_bytes(data[offset:offset + 4], 'big')
+    version = (header >> 19) & 3
+    bitrate_index = (header >> 12) & 15
+    rate_index = (header >> 10) & 3
+    if (header >> 21) != 0x7ff or version == 1 or (header >> 17) & 3 != 1 \
+            or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    return FrameHeader(
+        offset=offset,
+        size=frame_size(mpeg1, bitrate_index, sample_rate, (header >> 9) & 1),
+        bitrate_index=bitrate_index,
+        mpeg1=mpeg1,
+        protected=not (header >> 16) & 1,
+        channels=1 if (header >> 6) & 3 == 3 else 2,
+        sample_rate=sample_rate
+    )
+
+
+def audio_start(data) -> int:
+    """Offset of the first byte after a leading ID3v2 tag."""
+    if data[:3] != b'ID3' or len(data) < 10:
+        return 0
+    size = (data[6] & 0x7f) << 21 | (data[7] & 0x7f) << 14 | (data[8] & 0x7f) << 7 | (data[9] & 0x7f)
+    return 10 + size + (10 if data[5] & 0x10 else 0)
+
+
+def main_data_begin(data, frame: FrameHeader) -> int:
+    """Bytes of this frame's audio data stored in earlier frames."""
+    side = frame.side_info_start
+    if frame.mpeg1:
+        return data[side] << 1 | data[side + 1] >> 7
+    return data[side]
+
+
+def main_data_length(data, frame: FrameHeader) -> int:
+    """Bytes of audio data (part2_3_length of every granule) in this frame."""
+    side = int.from_bytes(data[frame.side_info_start:frame.payload_start], 'big')
+    bits = frame.side_info_size * 8
+    if frame.mpeg1:
+        position = 9 + (5 if frame.channels == 1 else 3) + 4 * frame.channels
+        granules, granule_bits = 2 * frame.channels, 59
+    else:
+        position = 8 + (1 if frame.channels == 1 else 2)
+        granules, granule_bits = frame.channels, 63
+
+    total = 0
+    for granule in range(granules):
+        start = position + granule * granule_bits
+        total += (side >> (bits - start - 12)) & 0xfff
+    return (total + 7) // 8
+
+
+def _crc16(data: bytes, crc: int = 0xffff) -> int:
+    """MPEG audio frame CRC (polynomial 0x8005)."""
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x8005 if crc & 0x8000 else crc << 1) & 0xffff
+    return crc
+
+
+def _crc16_lame(data: bytes) -> int:
+    """LAME tag CRC (CRC-16/ARC)."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xa001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _preceding_frames(data, offset: int) -> List[FrameHeader]:
+    """The frames directly before the frame at offset, oldest first."""
+    for start in range(max(audio_start(data), offset - RESERVOIR_WINDOW), offset):
+        frames = []
+        position = start
+        while position < offset:
+            frame = parse_header(data, position)
+            if frame is None:
+                break
+            frames.append(frame)
+            position += frame.size
+        if position == offset and frames:
+            return frames
+    return []
+
+
+def self_contained_frame(source_path: str, frame_bytes: bytes) -> bytes:
+    """
+    Rebuild a frame of source_path so that it decodes without earlier frames.
+
+    The frame's reservoir bytes are moved into the frame itself
+    (main_data_begin becomes 0), at a bitrate large enough to hold them.
+    Its trailing bytes are kept last, so the frames following it in the
+    source still find their own reservoir bytes.
+
+    Args:
+        source_path (str): MP3 file the frame was copied from
+        frame_bytes (bytes): The frame, as stream copied
+
+    Returns:
+        bytes: Replacement frame (frame_bytes itself if it needs no reservoir)
+
+    Raises:
+        ValueError: If the frame is not in the source, or no bitrate can
+            hold it with its reservoir
+    """
+    frame = parse_header(frame_bytes, 0)
+    if frame is None:
+        raise ValueError("Not an MPEG audio layer III frame")
+    backstep = main_data_begin(frame_bytes, frame)
+    if backstep == 0:
+        return frame_bytes
+
+    with open(source_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = data.find(frame_bytes, audio_start(data))
+        if offset < 0:
+            raise ValueError("Frame not found in the source")
+        # Shorter than backstep only for frames pointing before the start
+        # of the file, which the source cannot decode either
+        reservoir = b''.join(
+            data[previous.payload_start:previous.offset + previous.size]
+            for previous in _preceding_frames(data, offset)
+        )[-backstep:]
+
+    payload = frame_bytes[frame.payload_start:frame.size]
+    main_length = main_data_length(frame_bytes, frame)
+    stream = reservoir + payload
+    overhead = frame.payload_start - frame.offset
+    for bitrate_index in range(frame.bitrate_index, 15):
+        capacity = frame_size(frame.mpeg1, bitrate_index, frame.sample_rate) - overhead
+        if capacity >= len(stream):
+            break
+    else:
+        raise ValueError(f"Frame with {len(stream)} bytes of audio data exceeds the largest frame")
+
+    header = bytearray(frame_bytes[:4])
+    header[2] = (header[2] & 0x0d) | bitrate_index << 4  # New bitrate, no padding slot
+    side_info = bytearray(frame_bytes[frame.side_info_start:frame.payload_start])
+    side_info[0] = 0
+    if frame.mpeg1:
+        side_info[1] &= 0x7f
+    crc = _crc16(bytes(header[2:4]) + side_info).to_bytes(2, 'big') if frame.protected else b''
+
+    # Audio data first, then filler, then the bytes later frames reach back to
+    filler = bytes(capacity - len(stream))
+    return bytes(header) + crc + bytes(side_info) + stream[:main_length] + filler + stream[main_length:]
+
+
+def _lame_tag(data, path: str) -> int:
+    """Offset of the LAME tag in the first frame of data (read from path)."""
+    frame = parse_header(data, audio_start(data))
+    if frame is None:
+        raise ValueError(f"No MP3 frame at the start of {path}")
+    xing = frame.payload_start
+    if data[xing:xing + 4] not in (b'Xing', b'Info'):
+        raise ValueError(f"No Xing/Info frame in {path}")
+    tag = xing + LAME_TAG_OFFSET
+    if tag + LAME_CRC_OFFSET + 2 > frame.offset + frame.size or not any(data[tag:tag + 4]):
+        raise ValueError(f"No LAME tag in {path}")
+    return tag
+
+
+def gapless_info(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Read the encoder delay and padding recorded in a file's LAME tag.
+
+    Args:
+        path (str): MP3 file
+
+    Returns:
+        Optional[Tuple[int, int]]: Delay and padding in samples, or None
+            if the file has no LAME tag
+    """
+    with open(path, 'rb') as f:
+        data = f.read(TAG_READ_SIZE)
+    try:
+        tag = _lame_tag(data, path)
+    except ValueError:
+        return None
+    field = int.from_bytes(data[tag + LAME_DELAY_OFFSET:tag + LAME_DELAY_OFFSET + 3], 'big')
+    return field >> 12, field & 0xfff
+
+
+def set_gapless_info(path: str, delay: int, padding: int) -> None:
+    """
+    Set the encoder delay and padding recorded in a file's LAME tag.
+
+    Decoders skip delay + DECODER_DELAY samples at the start of the file
+    and padding - DECODER_DELAY at the end.
+
+    Args:
+        path (str): MP3 file with a Xing/Info frame and LAME tag (as
+            written by ffmpeg's mp3 muxer)
+        delay (int): Encoder delay in samples (0-4095)
+        padding (int): Padding in samples (0-4095)
+
+    Raises:
+        ValueError: If the file has no LAME tag or a value is out of range
+    """
+    if not (0 <= delay <= LAME_TAG_MAX and 0 <= padding <= LAME_TAG_MAX):
+        raise ValueError(f"Delay {delay} or padding {padding} does not fit the LAME tag")
+
+    with open(path, 'r+b') as f:
+        data = bytearray(f.read(TAG_READ_SIZE))
+        tag = _lame_tag(data, path)
+        data[tag + LAME_DELAY_OFFSET:tag + LAME_DELAY_OFFSET + 3] = (delay << 12 | padding).to_bytes(3, 'big')
+        crc = _crc16_lame(bytes(data[audio_start(data):tag + LAME_CRC_OFFSET]))
+        data[tag + LAME_CRC_OFFSET:tag + LAME_CRC_OFFSET + 2] = crc.to_bytes(2, 'big')
+
+        f.seek(tag + LAME_DELAY_OFFSET)
+        f.write(data[tag + LAME_DELAY_OFFSET:tag + LAME_CRC_OFFSET + 2])
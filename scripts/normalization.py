@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Title Normalization Module
+
+Single home for every title normalizer used by the pipeline. Patterns,
+stop words and character tables are built once at import time, and each
+normalizer is memoized with a bounded LRU cache keyed on the raw title, so
+a title seen before costs a dict lookup instead of another regex pass.
+
+Normalizers:
+- clean_title: Display title and safe filename (url_extractor, podcast_processor)
+- preprocess_title: Fuzzy matching key (url_matcher)
+- normalize_text: Loose matching key for filenames (schedule_podbean)
+- extract_part_number: Series part number (schedule_podbean)
+
+Dependencies:
+- html: HTML entity decoding
+- re: Regular expression operations
+- functools: LRU caching
+"""
+
+import html
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Maximum number of distinct titles memoized per normalizer
+TITLE_CACHE_SIZE = 4096
+
+# Multi-character replacements for clean_title, applied in order
+# before the single-character translation table
+MULTI_CHAR_REPLACEMENTS = (
+    ('&amp;', '&'),      # Normalize ampersand
+    ('&quot;', ''),      # Remove quotation entities
+    (' - Part', ' Part'),  # Standardize part notation
+    (' V/S ', ' vs '),   # Normalize versus notation
+    (' V/s ', ' vs '),
+    (' v/s ', ' vs '),
+    ("''", ''),          # Remove double quotes
+    ('...', ''),         # Remove ellipses
+)
+
+# Single-character replacements for clean_title, applied in one pass
+CHAR_TABLE = str.maketrans({
+    '–': '-',            # Normalize dashes
+    **{char: None for char in (
+        '|',             # Pipe characters
+        '🩸', '❤', '️',  # Blood drop and heart emoji
+        '"', '“', '”',   # Various quote types
+        '?', '`', '!',
+        ':', ';', ',',
+        '#', '@', '$', '%', '^', '*', '+', '=',
+        '{', '}', '[', ']', '<', '>',
+        '/', '\\',
+    )}
+})
+
+# Common stop words and noise dropped from matching keys
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at',
+    'to', 'for', 'of', 'with', 'by', 'from', 'up', 'about',
+    'into', 'over', 'after', 'podcast', 'show', 'episode'
+})
+
+QA_NUMBERED_PATTERN = re.compile(r'Q\s*&\s*A\s*[-–—_]?\s*(\d+)', re.IGNORECASE)
+QA_PATTERN = re.compile(r'Q\s*&\s*A', re.IGNORECASE)
+TITLE_SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s\&-]')
+PARENTHETICAL_PATTERN = re.compile(r'\([^)]*\)')
+NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# Covers "part 1", "part-1", "part_1", "part1" and "-part-1"
+PART_NUMBER_PATTERN = re.compile(r'part\s*[-_]?\s*(\d+)')
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def _clean_display_title(title: str) -> str:
+    """Clean a raw title for display; memoized core of clean_title."""
+    # Decode HTML entities first
+    title = html.unescape(title)
+
+    # Remove extra spaces and unwanted characters
+    title = ' '.join(title.split())
+
+    # Remove date patterns
+    if '(' in title and ')' in title:
+        title = title[:title.rfind('(')].strip()
+
+    # Apply replacements
+    for old, new in MULTI_CHAR_REPLACEMENTS:
+        title = title.replace(old, new)
+    title = title.translate(CHAR_TABLE)
+
+    # Standardize Q&A format with optional spaces and &
+    title = QA_NUMBERED_PATTERN.sub(r'Q&A \1', title)
+    title = QA_PATTERN.sub('Q&A', title)
+
+    # Remove any remaining special characters EXCEPT & and -
+    title = TITLE_SPECIAL_CHARS_PATTERN.sub('', title)
+
+    # Remove multiple spaces
+    return WHITESPACE_PATTERN.sub(' ', title).strip()
+
+
+def clean_title(title: str, date: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Clean and standardize a title for display and filename purposes.
+
+    Comprehensive title cleaning process:
+    - Decode HTML entities
+    - Remove extra spaces
+    - Remove parenthetical content
+    - Normalize special characters
+    - Standardize Q&A formatting
+    - Generate safe filename
+
+    Args:
+        title (str): Original title to clean
+        date (str, optional): Date in MM-DD-YY format to append to filename
+
+    Returns:
+        tuple:
+            - Cleaned display title (with spaces)
+            - Cleaned filename title (with underscores)
+    """
+    title = _clean_display_title(title)
+
+    # Create filename version (replace spaces with underscores)
+    filename = title.replace(' ', '_')
+
+    # Add date if provided
+    if date:
+        filename = f"{filename}_{date}"
+
+    return title, filename
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def preprocess_title(title: str) -> str:
+    """
+    Comprehensive title preprocessing for matching.
+
+    Cleaning steps:
+    - Convert to lowercase
+    - Remove special characters
+    - Remove common stop words
+    - Normalize whitespace
+    - Remove parenthetical content
+    - Handle common abbreviations
+
+    Args:
+        title (str): Raw title to preprocess
+
+    Returns:
+        str: Cleaned and normalized title
+    """
+    title = PARENTHETICAL_PATTERN.sub('', title.lower())
+    title = NON_WORD_PATTERN.sub('', title)
+
+    # Split on whitespace and drop stop words
+    return ' '.join(word for word in title.split() if word not in STOP_WORDS)
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def normalize_text(text: str) -> str:
+    """
+    Normalize text or a filename stem for loose matching.
+
+    Lowercases, treats underscores and hyphens as spaces and keeps only
+    ASCII letters, digits and single spaces.
+
+    Args:
+        text (str): Raw title or filename stem
+
+    Returns:
+        str: Normalized text
+    """
+    text = text.lower().replace('_', ' ').replace('-', ' ')
+    return ' '.join(NON_ALNUM_PATTERN.sub('', text).split())
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def extract_part_number(text: str) -> Optional[int]:
+    """
+    Extract the part number from a title.
+
+    Args:
+        text (str): Raw title or filename stem
+
+    Returns:
+        Optional[int]: Part number, or None if no part number is found
+    """
+    match = PART_NUMBER_PATTERN.search(text.lower())
+    return int(match.group(1)) if match else None
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Streaming Pipeline Stages Module
+
+Connects pipeline stages (match -> download -> encode) with bounded
+queues so that work overlaps: the first match starts downloading while
+matching continues, and item N is encoded while item N+1 downloads.
+
+Key Features:
+- Any number of stages, each with its own worker count
+- Bounded queues between stages (backpressure instead of unbounded buffering)
+- Per-item failure isolation: a failed item skips the remaining stages
+- Results collected in input order, with an optional completion callback
+
+Dependencies:
+- threading, queue: Standard library concurrency
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+# Items buffered between two stages, per downstream worker
+DEFAULT_QUEUE_SIZE = 2
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class Stage(NamedTuple):
+    """A pipeline stage: func maps an item to the next stage's item."""
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+def run_stages(
+    items: Iterable[Any],
+    stages: List[Stage],
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    on_complete: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Stream items through the stages and collect one result per item.
+
+    Items are pulled from ``items`` on a feeder thread, so a generator
+    (e.g. url_matcher.iter_podcast_urls) keeps producing while earlier
+    items are already in later stages.
+
+    Args:
+        items (Iterable[Any]): Input items, consumed lazily
+        stages (List[Stage]): Stages in order
+        queue_size (int, optional): Queue capacity per downstream worker.
+            Defaults to DEFAULT_QUEUE_SIZE.
+        on_complete (Callable, optional): Called with each result as soon as
+            its item leaves the pipeline (from a worker thread)
+
+    Returns:
+        List[Dict[str, Any]]: In input order, dicts with 'item' (the input),
+            'result' (last stage output), 'error' (exception or None) and
+            'stage' (name of the failed stage, or None)
+
+    Raises:
+        ValueError: If a stage has no workers
+    """
+    if any(stage.workers < 1 for stage in stages):
+        raise ValueError("Every stage needs at least one worker")
+
+    queues = [queue.Queue(maxsize=max(1, queue_size * stage.workers)) for stage in stages]
+    results: Dict[int, Dict[str, Any]] = {}
+    results_lock = threading.Lock()
+    feeder_error: List[BaseException] = []
+
+    def finish(index: int, result: Dict[str, Any]) -> None:
+        with results_lock:
+            results[index] = result
+        if on_complete:
+            on_complete(result)
+
+    def feed() -> None:
+        try:
+            for index, item in enumerate(items):
+                if stages:
+                    queues[0].put((index, item, item))
+                else:
+                    finish(index, {'item': item, 'result': item, 'error': None, 'stage': None})
+        except BaseException as e:
+            feeder_error.append(e)
+        finally:
+            if stages:
+                for _ in range(stages[0].workers):
+                    queues[0].put(_DONE)
+
+    def make_worker(position: int, remaining: List[int], lock: threading.Lock) -> Callable[[], None]:
+        stage = stages[position]
+        inbox = queues[position]
+        outbox = queues[position + 1] if position + 1 < len(stages) else None
+
+        def work() -> None:
+            while True:
+                message = inbox.get()
+                if message is _DONE:
+                    break
+
+                index, original, value = message
+                try:
+                    value = stage.func(value)
+                except Exception as e:
+                    finish(index, {'item': original, 'result': None, 'error': e, 'stage': stage.name})
+                    continue
+
+                if outbox is not None:
+                    outbox.put((index, original, value))
+                else:
+                    finish(index, {'item': original, 'result': value, 'error': None, 'stage': None})
+
+            # The last worker of a stage closes the next stage's input
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last and outbox is not None:
+                for _ in range(stages[position + 1].workers):
+                    outbox.put(_DONE)
+
+        return work
+
+    threads = [threading.Thread(target=feed, name='pipeline-feed', daemon=True)]
+    for position, stage in enumerate(stages):
+        remaining = [stage.workers]
+        lock = threading.Lock()
+        for n in range(stage.workers):
+            threads.append(threading.Thread(
+                target=make_worker(position, remaining, lock),
+                name=f'pipeline-{stage.name}-{n}',
+                daemon=True
+            ))
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if feeder_error:
+        raise feeder_error[0]
+
+    return [results[index] for index in sorted(results)]
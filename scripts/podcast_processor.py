@@ -14,9 +14,15 @@ Key Features:
 - Retry mechanism for download failures
 - Filename sanitization
 - Flexible audio quality settings
+- Optional artifact cache keyed by video ID and encode settings, so
+  title changes and new mastering profiles reuse earlier work
+- Downloads the smallest audio-only stream that meets the source quality
+  target (never a muxed video stream)
 
 Dependencies:
 - yt-dlp: YouTube video and audio downloading
+- FFmpeg: Audio encoding (see audio_engine)
+- audio_mastering: Mastering profiles rendered as one filter graph
 - Custom utils module for title cleaning
 
 Input:
@@ -34,15 +40,52 @@ Audio Processing Specifications:
 - Bitrate: 128 kbps
 - Noise Reduction: Applied
 - Loudness Normalization: Integrated Loudness -16 LUFS
+  (all of the above is the default 'podcast' mastering profile)
 """
 
 import os
 import sys
 import time
 import yt_dlp
+from typing import NamedTuple, Tuple
 
 # Custom utility imports
-from scripts.utils import clean_title
+from scripts.artifact_cache import (
+    encode_settings_hash, encoded_key, materialize, source_key, video_id_from_url
+)
+from scripts.audio_engine import BITRATE, SAMPLE_RATE, stream_transcode, transcode_file
+from scripts.audio_mastering import get_profile
+from scripts.loudness_analysis import shared_index
+from scripts.normalization import clean_title
+from scripts.resumable_download import download_resumable
+
+# Lowest source audio bitrate (kbps) downloaded for the 128k mono encode
+MIN_SOURCE_ABR = 64
+
+class FormatPolicy(NamedTuple):
+    """yt-dlp format selector and the sort order it is evaluated under."""
+    selector: str
+    sort: Tuple[str, ...]
+
+def audio_format_policy(min_abr=MIN_SOURCE_ABR):
+    """
+    Format policy selecting the smallest audio-only stream of sufficient quality.
+
+    Sorting by ascending bitrate (then size) makes 'ba' mean the smallest
+    audio-only stream, so 'ba[abr>=N]' picks the smallest one of at least
+    N kbps; the video's own audio language still ranks first. If no
+    stream reports that bitrate, the smallest audio-only stream is used.
+    Muxed video is never selected: without an audio-only stream the
+    download fails.
+
+    Args:
+        min_abr (int, optional): Minimum audio bitrate in kbps.
+            Defaults to MIN_SOURCE_ABR.
+
+    Returns:
+        FormatPolicy: Selector and sort fields for yt-dlp
+    """
+    return FormatPolicy(f'ba[abr>={min_abr}]/ba', ('lang', '+abr', '+size'))
 
 def wait_for_file_release(filepath, timeout=30, check_interval=1):
     """Wait for a file to be released by other processes."""
@@ -56,67 +99,250 @@ def wait_for_file_release(filepath, timeout=30, check_interval=1):
             time.sleep(check_interval)
     return False
 
-def convert_video_to_audio(video_url, date=None, max_retries=3, retry_delay=5):
+def remove_outputs(output_path):
+    """Remove a (possibly partial) output file and its temporary download."""
+    for path in [output_path, output_path + '.part', output_path + '.webm']:
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+            except:
+                pass
+
+def fetch_video_info(video_url):
     """
-    Download YouTube video directly as MP3 with specific audio settings:
-    - Sample rate: 44.1 kHz
-    - Channel: Mono
-    - Bitrate: 128k
-    - Audio filtering:
-        * High/low pass filters (50Hz-15000Hz)
-        * Noise reduction
-        * Dynamic range compression
-        * Dynamic normalization
-        * LUFS normalization
+    Extract a video's metadata once, for reuse by the download.
+
+    The result is not format-processed, so passing it to download_resumable
+    (or to stream_transcode) downloads without a second page/player fetch.
+
+    Args:
+        video_url (str): YouTube video URL
+
+    Returns:
+        dict: JSON-serializable yt-dlp info dict
+    """
+    with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+        info = ydl.extract_info(video_url, download=False, process=False)
+        return ydl.sanitize_info(info)
+
+def cached_encode_key(video_id, profile=None, two_pass=True):
+    """
+    Artifact cache key of a video encoded with the given settings.
+
+    Args:
+        video_id (str): YouTube video ID
+        profile (str, optional): Mastering profile name
+        two_pass (bool, optional): Whether loudness was normalized in two passes
+
+    Returns:
+        str: Key for ArtifactCache
+    """
+    settings_hash = encode_settings_hash(
+        profile=tuple(get_profile(profile)),
+        two_pass=two_pass,
+        sample_rate=SAMPLE_RATE,
+        bitrate=BITRATE
+    )
+    return encoded_key(video_id, settings_hash)
+
+def prepare_cached_job(job, video_id, stream, cache, max_retries=3, retry_delay=5):
+    """
+    Resolve a job against the artifact cache.
+
+    An episode whose MP3 already exists is skipped, as without a cache.
+    Otherwise a cached encode for these settings is reused if one exists
+    (whatever the episode's current title), or else a cached source.
+    Without either, the source is downloaded into the cache, or
+    (stream=True) left for encode_audio to keep while streaming.
+
+    A cached source handed to the encode stage stays pinned in the cache
+    (job['pinned_key']) until encode_cached releases it, so it cannot be
+    evicted in between.
+
+    Args:
+        job (dict): Job built by download_audio
+        video_id (str): YouTube video ID
+        stream (bool): Stream instead of downloading first
+        cache (ArtifactCache): Artifact cache
+        max_retries (int, optional): Download retries, each resuming the
+            partial file. Defaults to 3.
+        retry_delay (float, optional): Seconds between download attempts.
+            Defaults to 5.
+
+    Returns:
+        dict: The job, with 'source_key' and 'encoded_key' set
+    """
+    job['source_key'] = source_key(video_id)
+    job['pinned_key'] = None
+
+    # Episodes produced before the cache existed (or since evicted) are kept
+    if os.path.exists(job['output_path']) and os.path.getsize(job['output_path']) > 0:
+        print(f"File already exists: {job['output_path']}")
+        job['done'] = True
+        return job
+
+    # Prefer a two-pass encode; a streamed one is fine when streaming
+    candidates = [cached_encode_key(video_id, job['profile'], two_pass=True)]
+    if stream:
+        candidates.append(cached_encode_key(video_id, job['profile'], two_pass=False))
+    for key in candidates:
+        with cache.lock(key):
+            artifact = cache.lookup(key)
+            if artifact is not None:
+                materialize(artifact, job['output_path'])
+        if artifact is not None:
+            print(f"Reusing cached encode: {job['output_path']}")
+            job['encoded_key'] = key
+            job['done'] = True
+            return job
+
+    print(f"\nProcessing video: {job['title']}")
+    with cache.lock(job['source_key']):
+        source_path = cache.lookup(job['source_key'])
+        if source_path is None and not stream:
+            policy = audio_format_policy()
+            source_path = download_resumable(
+                job['video_url'], cache.path(job['source_key']), policy.selector,
+                info=job['info'], max_retries=max_retries, retry_delay=retry_delay,
+                format_sort=policy.sort
+            )
+            cache.commit(job['source_key'])
+        elif source_path is not None:
+            print("Using cached source audio")
+        if source_path is not None:
+            cache.pin(job['source_key'])
+            job['pinned_key'] = job['source_key']
+
+    job['source_path'] = source_path
+    job['encoded_key'] = cached_encode_key(video_id, job['profile'], two_pass=source_path is not None)
+    return job
+
+def download_audio(video_url, date=None, stream=False, profile=None, cache=None, title=None, video_id=None,
+                   max_retries=3, retry_delay=5):
+    """
+    Download stage: fetch a video's audio track to a temporary WebM file
+    (or, with a cache, into the artifact cache).
+
+    In streaming mode (stream=True) nothing is downloaded here;
+    encode_audio pipes the audio from yt-dlp straight into ffmpeg instead,
+    so the download happens in the encode stage and its worker limit, and
+    loudness normalization is single-pass.
+
+    Pass the title (and video ID) already known from video_metadata.csv to
+    skip metadata extraction entirely; otherwise the video is extracted
+    once here and the same info dict is reused for the download.
+
+    Downloads are resumable: a failed attempt keeps its .part file and
+    manifest (see resumable_download), and the retry, or the next run,
+    only fetches the missing bytes. The finished file is size-verified
+    before it is handed to encode_audio.
+
+    Args:
+        video_url (str): YouTube video URL
+        date (str, optional): Date in MM-DD-YY format for the filename
+        stream (bool, optional): Leave the download to encode_audio's
+            yt-dlp | ffmpeg pipe. Defaults to False.
+        profile (str, optional): Mastering profile name for encode_audio.
+            Defaults to audio_mastering.DEFAULT_PROFILE.
+        cache (ArtifactCache, optional): Store sources and encodes by video
+            ID instead of relying on the output file name
+        title (str, optional): Video title, e.g. from the metadata CSV
+        video_id (str, optional): Video ID. Defaults to the ID in the URL.
+        max_retries (int, optional): Download retries. Defaults to 3.
+        retry_delay (float, optional): Seconds between download attempts.
+            Defaults to 5.
+
+    Returns:
+        dict: Job for encode_audio with 'video_url', 'title', 'output_path',
+            'source_path' (None when streaming), 'profile', 'cache' and 'done'
+            (True if the MP3 already exists); cached jobs also carry
+            'source_key', 'encoded_key' and 'pinned_key'. 'info' holds the extracted info
+            dict when no title was given.
+    """
+    # Extract only if the caller does not already know the title
+    info = None
+    if title is None:
+        info = fetch_video_info(video_url)
+        title = info['title']
+        video_id = video_id or info.get('id')
+    video_id = video_id or video_id_from_url(video_url)
+
+    # Clean title and create safe filename
+    _, safe_title = clean_title(title, date)
+    output_path = os.path.join('output', 'podcasts', safe_title + '.mp3')
+    job = {
+        'video_url': video_url,
+        'title': title,
+        'output_path': output_path,
+        'source_path': None if stream else output_path + '.webm',  # Temporary WebM file
+        'profile': profile,
+        'cache': cache,
+        'info': info,
+        'done': False
+    }
+
+    if cache is not None:
+        return prepare_cached_job(job, video_id, stream, cache, max_retries, retry_delay)
+    
+    # Skip if file exists and is not empty
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        print(f"File already exists: {output_path}")
+        job['done'] = True
+        return job
+
+    print(f"\nProcessing video: {title}")
+    if stream:
+        return job
+
+    # Download audio only; a failure keeps the partial file for the next attempt
+    policy = audio_format_policy()
+    download_resumable(
+        video_url,
+        job['source_path'],
+        policy.selector,
+        info=info,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        progress_hooks=[lambda d: print(f"Download progress: {d['_percent_str']}" if '_percent_str' in d else '')],
+        format_sort=policy.sort
+    )
+    return job
+
+def encode_audio(job):
     """
+    Encode stage: master a downloaded source into the final MP3 and verify it.
+
+    Jobs without a source_path are streamed: yt-dlp's audio output is
+    piped into a single ffmpeg process that applies the job's mastering
+    profile and writes the final MP3. Downloaded sources get two-pass
+    loudness normalization, with the measurement cached by content hash
+    in output/loudness_index.json.
+
+    Args:
+        job (dict): Job returned by download_audio
+
+    Returns:
+        bool: True once the MP3 exists
+
+    Raises:
+        Exception: If conversion fails or the output is missing or too small
+    """
+    if job['done']:
+        return True
+    if job.get('cache') is not None:
+        return encode_cached(job)
+
+    output_path = job['output_path']
+    temp_file = job['source_path']
     try:
-        # Get video info first
-        with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
-            info = ydl.extract_info(video_url, download=False)
-            title = info['title']
-        
-        # Clean title and create safe filename
-        _, safe_title = clean_title(title, date)
-        output_path = os.path.join('output', 'podcasts', safe_title + '.mp3')
-        
-        # Skip if file exists and is not empty
-        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-            print(f"File already exists: {output_path}")
-            return True
-
-        print(f"\nProcessing video: {title}")
-
-        # Configure yt-dlp to download audio only
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'outtmpl': output_path + '.webm',  # Temporary WebM file
-            'keepvideo': False,
-            'noplaylist': True,
-            'no_warnings': True,
-            'retries': 10,
-            'progress_hooks': [lambda d: print(f"Download progress: {d['_percent_str']}" if '_percent_str' in d else '')]
-        }
-
-        # Download audio
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([video_url])
-
-        # Convert to MP3 using moviepy (same approach as manual_convert.py)
-        temp_file = output_path + '.webm'
-        if os.path.exists(temp_file):
+        if temp_file is None:
+            policy = audio_format_policy()
+            stream_transcode(job['video_url'], output_path, policy.selector, profile=job.get('profile'),
+                             info=job.get('info'), format_sort=policy.sort)
+        elif os.path.exists(temp_file):
             try:
-                from moviepy.editor import AudioFileClip
-                audio = AudioFileClip(temp_file)
-                audio = audio.set_fps(44100)  # Set sample rate to 44.1 kHz
-                audio.write_audiofile(
-                    output_path,
-                    bitrate="128k",
-                    nbytes=2,
-                    codec='libmp3lame',
-                    verbose=False,
-                    logger=None
-                )
-                audio.close()
+                transcode_file(temp_file, output_path, profile=job.get('profile'),
+                               loudness_index=shared_index())
                 os.remove(temp_file)  # Clean up temporary file
             except Exception as e:
                 raise Exception(f"Audio conversion failed: {str(e)}")
@@ -127,19 +353,101 @@ def convert_video_to_audio(video_url, date=None, max_retries=3, retry_delay=5):
         
         if os.path.getsize(output_path) < 1000:  # Less than 1KB
             raise Exception("Processing failed - output file too small")
+    except Exception:
+        remove_outputs(output_path)
+        raise
 
-        print("Processing complete!")
-        return True
+    print("Processing complete!")
+    return True
+
+def encode_cached(job):
+    """
+    Encode stage for cached jobs: encode into the cache, then place the
+    episode file.
+
+    Streamed jobs also keep the source in the cache, so a later encode
+    with other settings needs no download.
+
+    Args:
+        job (dict): Job returned by download_audio with a cache
+
+    Returns:
+        bool: True once the MP3 exists
+
+    Raises:
+        Exception: If conversion fails or the output is too small
+    """
+    cache = job['cache']
+    key = job['encoded_key']
+    try:
+        with cache.lock(key):
+            artifact = cache.lookup(key)
+            if artifact is None:
+                artifact = cache.path(key)
+                if job['source_path'] is None:
+                    with cache.lock(job['source_key']):
+                        source_path = cache.path(job['source_key'])
+                        policy = audio_format_policy()
+                        stream_transcode(job['video_url'], artifact, policy.selector, profile=job['profile'],
+                                         source_path=source_path, info=job['info'], format_sort=policy.sort)
+                        cache.commit(job['source_key'])
+                else:
+                    transcode_file(job['source_path'], artifact, profile=job['profile'],
+                                   loudness_index=shared_index())
+
+                if os.path.getsize(artifact) < 1000:  # Less than 1KB
+                    os.remove(artifact)
+                    raise Exception("Processing failed - output file too small")
+                cache.commit(key)
+
+            # Still under the key lock, so the encode cannot be evicted first
+            materialize(artifact, job['output_path'])
+    finally:
+        if job.get('pinned_key'):
+            cache.unpin(job['pinned_key'])
+            job['pinned_key'] = None
+
+    print("Processing complete!")
+    return True
+
+def convert_video_to_audio(video_url, date=None, max_retries=3, retry_delay=5,
+                           stream=False, profile=None, cache=None):
+    """
+    Download YouTube video directly as MP3 with specific audio settings:
+    - Sample rate: 44.1 kHz
+    - Channel: Mono
+    - Bitrate: 128k
+    - Audio filtering:
+        * High/low pass filters (50Hz-15000Hz)
+        * Noise reduction
+        * Dynamic range compression
+        * Dynamic normalization
+        * LUFS normalization
+
+    The filtering above is the default 'podcast' mastering profile; pass
+    profile to use another entry of audio_mastering.PROFILES. All steps
+    run as one ffmpeg filter graph in the encode pass.
+
+    With an ArtifactCache, sources and encodes are stored by video ID and
+    encode settings (see artifact_cache), and the episode file is linked
+    from the cache.
+
+    Runs download_audio then encode_audio. By default the source is
+    downloaded to a temporary WebM first, which allows two-pass loudness
+    normalization; failed downloads are retried up to max_retries
+    times, resuming from the partial file. stream=True instead pipes the
+    audio from yt-dlp into ffmpeg with no intermediate file (single-pass
+    normalization). Several videos are converted concurrently by
+    run_pipeline, which runs download_audio and encode_audio as separate
+    stages (see pipeline_stages.run_stages).
+    """
+    try:
+        job = download_audio(video_url, date, stream=stream, profile=profile, cache=cache,
+                             max_retries=max_retries, retry_delay=retry_delay)
+        return encode_audio(job)
 
     except Exception as e:
         print(f"Error: {str(e)}")
-        # Clean up failed output
-        for path in [output_path, output_path + '.webm']:
-            if os.path.exists(path):
-                try:
-                    os.remove(path)
-                except:
-                    pass
         return False
 
 
@@ -152,10 +460,10 @@ def main():
     - Provides exit status based on conversion success
 
     Usage:
-        python podcast_processor.py <youtube_url> <date>
+        python -m scripts.podcast_processor <youtube_url> <date>
     """
     if len(sys.argv) != 3:
-        print("Usage: python podcast_processor.py <youtube_url> <date>")
+        print("Usage: python -m scripts.podcast_processor <youtube_url> <date>")
         sys.exit(1)
     
     video_url = sys.argv[1]
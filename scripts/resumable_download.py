@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Resumable Download Module
+
+Downloads a video's source audio so that an interrupted transfer resumes
+where it stopped instead of starting over: retry cost is proportional to
+the missing bytes.
+
+Key Features:
+- Chunked HTTP range requests (yt-dlp http_chunk_size), continuing from
+  the existing <file>.part on every retry
+- Manifest (<file>.manifest.json) recording the chosen format and the
+  completed byte range, so a resumed download uses the same stream
+- Size verification against the expected length as soon as the transfer
+  finishes, before yt-dlp's fixups (which may legitimately rewrite the
+  file); a mismatched file is discarded
+- Partial files survive failures, so the next run also resumes
+
+Dependencies:
+- yt-dlp: Extraction and ranged HTTP downloads
+"""
+
+import os
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import yt_dlp
+
+# Bytes requested per HTTP range request
+CHUNK_SIZE = 10 * 1024 * 1024
+
+# Minimum seconds between manifest writes while downloading
+MANIFEST_INTERVAL = 1.0
+
+
+def manifest_path(output_path: str) -> str:
+    """Return the manifest file belonging to a download target."""
+    return output_path + '.manifest.json'
+
+
+def load_manifest(output_path: str, video_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the manifest of an interrupted download of the same video.
+
+    Args:
+        output_path (str): Download target
+        video_url (str): Video being downloaded
+
+    Returns:
+        Optional[Dict[str, Any]]: Manifest, or None if there is none for this video
+    """
+    try:
+        with open(manifest_path(output_path), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('video_url') == video_url else None
+
+
+def save_manifest(output_path: str, manifest: Dict[str, Any]) -> None:
+    """
+    Write a download manifest atomically.
+
+    Args:
+        output_path (str): Download target
+        manifest (Dict[str, Any]): Manifest to store
+    """
+    path = manifest_path(output_path)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def download_resumable(
+    video_url: str,
+    output_path: str,
+    format_selector: str,
+    info: Optional[Dict[str, Any]] = None,
+    max_retries: int = 3,
+    retry_delay: float = 5,
+    progress_hooks: Optional[List] = None,
+    format_sort: Optional[Sequence[str]] = None
+) -> str:
+    """
+    Download a video's audio to output_path, resuming partial downloads.
+
+    Args:
+        video_url (str): YouTube video URL
+        output_path (str): Final file; yt-dlp writes output_path + '.part'
+        format_selector (str): yt-dlp format for a fresh download. A resumed
+            download uses the format recorded in the manifest.
+        info (Dict[str, Any], optional): Info dict from an earlier extraction
+            (used for the first attempt only)
+        max_retries (int, optional): Retries after a failed attempt. Defaults to 3.
+        retry_delay (float, optional): Seconds between attempts. Defaults to 5.
+        progress_hooks (List, optional): Additional yt-dlp progress hooks
+        format_sort (Sequence[str], optional): yt-dlp format sort fields
+            applied to format_selector
+
+    Returns:
+        str: output_path
+
+    Raises:
+        Exception: If every attempt fails (the partial file is kept) or the
+            finished file does not have the expected size (it is removed)
+    """
+    manifest = load_manifest(output_path, video_url) or {'video_url': video_url}
+    last_saved = [0.0]
+    # None until the 'finished' progress hook has checked the transfer
+    verified: List[Any] = [None]
+
+    def record(status: Dict[str, Any]) -> None:
+        info_dict = status.get('info_dict') or {}
+        if info_dict.get('format_id'):
+            manifest['format_id'] = info_dict['format_id']
+        total = status.get('total_bytes')
+        if total:
+            manifest['total_bytes'] = total
+        manifest['completed'] = [[0, status.get('downloaded_bytes') or 0]]
+
+        if status['status'] == 'finished':
+            # Checked here because post-download fixups (e.g. FFmpegFixupM4a)
+            # may change the size of the final file
+            filename = status.get('filename') or output_path
+            actual = os.path.getsize(filename) if os.path.exists(filename) else None
+            expected = manifest.get('total_bytes')
+            verified[0] = actual is not None and (not expected or actual == expected)
+            if not verified[0]:
+                verified.append(f"got {actual} bytes, expected {expected}")
+
+        now = time.monotonic()
+        if status['status'] == 'finished' or now - last_saved[0] >= MANIFEST_INTERVAL:
+            last_saved[0] = now
+            save_manifest(output_path, manifest)
+
+    for attempt in range(max_retries + 1):
+        ydl_opts = {
+            'format': manifest.get('format_id') or format_selector,
+            'outtmpl': output_path,
+            'continuedl': True,
+            'http_chunk_size': CHUNK_SIZE,
+            'noplaylist': True,
+            'no_warnings': True,
+            'quiet': True,
+            'retries': 10,
+            'progress_hooks': [record] + list(progress_hooks or [])
+        }
+        if format_sort:
+            ydl_opts['format_sort'] = list(format_sort)
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                # Reuse an extracted info dict only while it is fresh
+                if info is not None and attempt == 0:
+                    ydl.process_ie_result(info, download=True)
+                else:
+                    ydl.download([video_url])
+            break
+        except Exception as e:
+            if 'completed' in manifest:
+                save_manifest(output_path, manifest)
+            if attempt == max_retries:
+                raise
+            done = manifest.get('completed', [[0, 0]])[-1][1]
+            total = manifest.get('total_bytes')
+            progress = f"{done / 1024 ** 2:.1f}/{total / 1024 ** 2:.1f} MB" if total else f"{done / 1024 ** 2:.1f} MB"
+            print(f"Download interrupted at {progress} ({str(e)}), resuming in {retry_delay}s...")
+            time.sleep(retry_delay)
+
+    if not os.path.exists(output_path) or verified[0] is False:
+        detail = verified[-1] if verified[0] is False else "output file missing"
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        if os.path.exists(manifest_path(output_path)):
+            os.remove(manifest_path(output_path))
+        raise Exception(f"Download verification failed: {detail}")
+
+    if os.path.exists(manifest_path(output_path)):
+        os.remove(manifest_path(output_path))
+    return output_path
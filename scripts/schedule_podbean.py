@@ -5,6 +5,16 @@ Podbean Scheduler Script
 This script takes a WhatsApp message containing podcast scheduling information
 and prepares the uploads to Podbean with proper scheduling.
 
+Episodes are uploaded and scheduled concurrently (--upload-workers, default
+UPLOAD_WORKERS) over one pooled keep-alive HTTP session. Every upload and
+scheduled episode is recorded in an upload ledger (see upload_ledger), so a
+rerun skips episodes already scheduled with the same title and time (unless
+--force is given) and reuses uploaded media keys. The access
+token is cached with its expiry (see token_cache) and shared by all workers.
+
+Usage (from the repository root):
+    python -m scripts.schedule_podbean [--upload-workers N] [--force]
+
 Example WhatsApp message format:
 The Foundation part 1 & 2 December 4th, 2024
 The Foundation part 3 & 4 December 11th, 2024
@@ -14,11 +24,23 @@ import os
 import re
 import sys
 import json
+import argparse
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from rapidfuzz import fuzz
+
+from scripts.chunked_upload import ProgressCallback, progress_printer, upload_file
+from scripts.file_hash import file_sha256
+from scripts.normalization import normalize_text, extract_part_number
+from scripts.token_cache import TOKEN_CACHE_FILE, TokenManager
+from scripts.upload_ledger import LEDGER_FILE, UploadLedger
+from scripts.url_matcher import calculate_similarity_matrix
 import pytz
 from groq import Groq
 from dotenv import load_dotenv
@@ -31,18 +53,42 @@ load_dotenv()
 PACIFIC_TZ = pytz.timezone('America/Los_Angeles')
 SCHEDULE_TIME = "00:01"  # 12:01 AM Pacific Time
 PODBEAN_API_BASE = "https://api.podbean.com/v1"
+UPLOAD_WORKERS = 4  # Episodes uploaded and scheduled concurrently
+MATCH_THRESHOLD = 90  # Minimum token set ratio for part-number and audio file matches
 
 class PodBeanAPI:
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, pool_size: int = UPLOAD_WORKERS,
+                 token_cache_path: Optional[str] = TOKEN_CACHE_FILE):
         self.client_id = client_id
         self.client_secret = client_secret
-        self.access_token = None
+        
+        # Token persisted with its expiry and refreshed once, shortly before it
+        # expires, however many workers share this client
+        self.tokens = TokenManager(self._request_token, cache_key=client_id, cache_path=token_cache_path)
+        
+        # One keep-alive session for every call; the pool holds a connection
+        # per concurrent worker, so TLS handshakes are paid once per connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(1, pool_size))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+    def __enter__(self) -> 'PodBeanAPI':
+        return self
+        
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        
+    def close(self) -> None:
+        """Close the pooled connections"""
+        self.session.close()
         
     def get_access_token(self) -> str:
-        """Get access token using client credentials grant type"""
-        if self.access_token:
-            return self.access_token
-            
+        """Get a valid access token, from the token cache when possible"""
+        return self.tokens.token()
+        
+    def _request_token(self) -> Dict[str, Any]:
+        """Request a new token using client credentials grant type"""
         auth_url = f"{PODBEAN_API_BASE}/oauth/token"
         headers = {
             "Content-Type": "application/x-www-form-urlencoded",
@@ -55,7 +101,7 @@ class PodBeanAPI:
         }
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 auth_url,
                 headers=headers,
                 data=data,
@@ -71,10 +117,10 @@ class PodBeanAPI:
                 raise Exception(f"Failed to get access token: {response.text}")
                 
             token_data = response.json()
-            print(f"Auth success - token type: {token_data.get('token_type')}")
+            print(f"Auth success - token type: {token_data.get('token_type')}, "
+                  f"expires in: {token_data.get('expires_in')}s")
             
-            self.access_token = token_data["access_token"]
-            return self.access_token
+            return token_data
             
         except requests.exceptions.RequestException as e:
             print(f"Network error during authentication: {str(e)}")
@@ -83,12 +129,34 @@ class PodBeanAPI:
             print(f"Unexpected error during authentication: {str(e)}")
             raise
         
-    def upload_audio(self, file_path: str) -> str:
-        """Upload audio file and get media key"""
+    def _authorized(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        """Send an API request with the access token, refreshing it once if it is rejected"""
+        for attempt in range(2):
+            token = self.get_access_token()
+            response = self.session.request(
+                method,
+                url,
+                headers={**(headers or {}), "Authorization": f"Bearer {token}"},
+                **kwargs
+            )
+            if response.status_code != 401 or attempt:
+                return response
+            print("Access token rejected, refreshing")
+            self.tokens.invalidate(token)
+        
+    def upload_audio(self, file_path: str, progress: Optional[ProgressCallback] = None) -> str:
+        """
+        Upload audio file and get media key
+        
+        The file is streamed to the presigned URL in chunks, with retries
+        that send it again from the start (a plain presigned PUT cannot
+        resume). progress is called
+        as progress(bytes_received, total_bytes, bytes_per_second); by
+        default progress is printed every 10%.
+        """
         # First, get upload authorization
         auth_url = f"{PODBEAN_API_BASE}/files/uploadAuthorize"
         headers = {
-            "Authorization": f"Bearer {self.get_access_token()}",
             "User-Agent": "BelovedPodcastScheduler/1.0"
         }
         
@@ -102,7 +170,7 @@ class PodBeanAPI:
             "content_type": "audio/mpeg"
         }
         
-        auth_response = requests.get(auth_url, headers=headers, params=params)
+        auth_response = self._authorized("GET", auth_url, headers=headers, params=params)
         print(f"Upload auth request URL: {auth_url}")
         print(f"Upload auth headers: {headers}")
         print(f"Upload auth params: {params}")
@@ -115,24 +183,24 @@ class PodBeanAPI:
         print(f"Upload auth success - presigned URL received")
         
         # Now upload the file using the presigned URL
-        with open(file_path, 'rb') as file:
-            upload_response = requests.put(
+        name = os.path.basename(file_path)
+        try:
+            result = upload_file(
+                self.session,
                 upload_data['presigned_url'],
-                data=file
+                file_path,
+                progress=progress or progress_printer(name)
             )
-            
-        if upload_response.status_code != 200:
-            print(f"Upload response: {upload_response.text}")
-            raise Exception(f"Failed to upload file: {upload_response.text}")
-            
+        except Exception as e:
+            raise Exception(f"Failed to upload file: {str(e)}")
+        
+        print(f"Uploaded {name}: {result.size / 1024 ** 2:.1f} MB in {result.seconds:.1f}s "
+              f"({result.throughput / 1024 ** 2:.1f} MB/s, {result.attempts} attempt(s))")
         return upload_data['file_key']
         
     def schedule_episode(self, title: str, description: str, media_key: str, schedule_time: datetime) -> Dict:
         """Schedule an episode for future publishing"""
         episode_url = f"{PODBEAN_API_BASE}/episodes"
-        headers = {
-            "Authorization": f"Bearer {self.get_access_token()}"
-        }
         data = {
             "title": title,
             "content": description,
@@ -142,7 +210,7 @@ class PodBeanAPI:
             "publish_timestamp": int(schedule_time.timestamp())
         }
         
-        response = requests.post(episode_url, headers=headers, data=data)
+        response = self._authorized("POST", episode_url, data=data)
         if response.status_code != 200:
             print(f"Schedule response: {response.text}")
             raise Exception(f"Failed to schedule episode: {response.text}")
@@ -285,74 +353,95 @@ def parse_whatsapp_message(message: str) -> List[Dict[str, Any]]:
     
     return parsed_entries
 
+class MetadataIndex:
+    """
+    Lookup index over video metadata titles.
+    
+    Rows are keyed by normalized title (exact hits) and bucketed by part
+    number (part-aware fuzzy hits), so a lookup scores only the rows that
+    share the entry's part number. It returns the same row as a scan of the
+    metadata in file order: the first row that is an exact match, or that
+    has the same part number and a token set ratio of at least MATCH_THRESHOLD.
+    """
+    
+    def __init__(self, metadata_df: pd.DataFrame):
+        self.rows = metadata_df.to_dict('records')
+        self.exact: Dict[str, int] = {}
+        self.by_part: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
+        
+        for position, row in enumerate(self.rows):
+            title = row['title']
+            if not isinstance(title, str):
+                continue
+            normalized = normalize_text(title)
+            self.exact.setdefault(normalized, position)
+            part = extract_part_number(title)
+            if part:
+                self.by_part[part].append((position, normalized))
+    
+    def lookup(self, title: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Return the matching metadata row and whether it matched exactly, or None"""
+        search_title = normalize_text(title)
+        search_part = extract_part_number(title)
+        exact = self.exact.get(search_title)
+        
+        # A part-number match only wins if it comes before the exact match
+        if search_part:
+            for position, normalized in self.by_part.get(search_part, ()):
+                if exact is not None and position >= exact:
+                    break
+                if fuzz.token_set_ratio(search_title, normalized) >= MATCH_THRESHOLD:
+                    return self.rows[position], False
+        
+        if exact is not None:
+            return self.rows[exact], True
+        return None
+
 def find_matching_files(entries: List[Dict[str, Any]], metadata_path: str, audio_dir: str) -> List[Dict[str, Any]]:
     """Match parsed entries with audio files and metadata."""
-    from fuzzywuzzy import fuzz
     matched_entries = []
     
-    # Read metadata
-    metadata_df = pd.read_csv(metadata_path)
+    # Read metadata once into a lookup index
+    metadata_index = MetadataIndex(pd.read_csv(metadata_path))
     audio_files = [f for f in os.listdir(audio_dir) if f.endswith('.mp3')]
     
-    def normalize_text(text):
-        """Normalize text for matching"""
-        text = text.lower()
-        text = text.replace('_', ' ').replace('-', ' ')
-        text = re.sub(r'[^a-z0-9\s]', '', text)
-        return ' '.join(text.split())
-    
-    def extract_part_number(text):
-        """Extract part number from text, returns None if no part number found"""
-        patterns = [
-            r'part\s*[-_]?\s*(\d+)',  # part 1, part-1, part_1
-            r'part(\d+)',             # part1
-            r'[-_]part[-_]\s*(\d+)',  # -part-1, _part_1
-        ]
-        
-        text = text.lower()
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return int(match.group(1))
-        return None
+    # Normalize every audio filename once for bulk scoring
+    audio_titles = [normalize_text(os.path.splitext(f)[0]) for f in audio_files]
+    audio_matches: Dict[str, Tuple[Optional[str], float]] = {}
+    
+    def best_audio_file(meta_title_normalized: str) -> Tuple[Optional[str], float]:
+        # Several entries can share a metadata title; score each title once
+        if meta_title_normalized not in audio_matches:
+            matching_file, highest_ratio = None, 0
+            if audio_files:
+                ratios = calculate_similarity_matrix(
+                    [meta_title_normalized],
+                    audio_titles,
+                    weights={'token_set_ratio': 1.0},
+                    processor=None
+                )[0]
+                best = int(ratios.argmax())
+                matching_file, highest_ratio = audio_files[best], ratios[best]
+            audio_matches[meta_title_normalized] = (matching_file, highest_ratio)
+        return audio_matches[meta_title_normalized]
     
     print("\nMatching files with audio and metadata...")
     for entry in entries:
         print(f"\nProcessing: {entry['title']}")
-        search_title = normalize_text(entry['title'])
-        search_part = extract_part_number(entry['title'])
         
         # First try to find exact metadata match
-        metadata_match = None
-        for _, row in metadata_df.iterrows():
-            meta_title = row['title']
-            if normalize_text(meta_title) == search_title:
-                metadata_match = row
-                print(f"Found exact metadata match: {meta_title}")
-                break
+        found = metadata_index.lookup(entry['title'])
+        if found is not None:
+            metadata_match, exact = found
+            if exact:
+                print(f"Found exact metadata match: {metadata_match['title']}")
+            else:
+                print(f"Found metadata match with part number: {metadata_match['title']}")
             
-            # Check if both have matching part numbers
-            meta_part = extract_part_number(meta_title)
-            if search_part and meta_part and search_part == meta_part:
-                if fuzz.token_set_ratio(search_title, normalize_text(meta_title)) >= 90:
-                    metadata_match = row
-                    print(f"Found metadata match with part number: {meta_title}")
-                    break
-        
-        if metadata_match is not None:
             # Now find matching audio file for this metadata
-            matching_file = None
-            highest_ratio = 0
-            meta_title_normalized = normalize_text(metadata_match['title'])
-            
-            for audio_file in audio_files:
-                audio_title = normalize_text(os.path.splitext(audio_file)[0])
-                ratio = fuzz.token_set_ratio(meta_title_normalized, audio_title)
-                if ratio > highest_ratio:
-                    highest_ratio = ratio
-                    matching_file = audio_file
+            matching_file, highest_ratio = best_audio_file(normalize_text(metadata_match['title']))
             
-            if matching_file and highest_ratio >= 90:
+            if matching_file and highest_ratio >= MATCH_THRESHOLD:
                 audio_path = os.path.join(audio_dir, matching_file)
                 entry['audio_file'] = audio_path
                 entry['podbean_title'] = metadata_match['title']  # Use exact metadata title
@@ -392,9 +481,116 @@ def prepare_podbean_schedule(entries: List[Dict[str, Any]]) -> List[Dict[str, An
     
     return scheduled_entries
 
-def schedule_to_podbean(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _publish_entry(podbean: PodBeanAPI, entry: Dict[str, Any], ledger: Optional[UploadLedger],
+                   content_hash: Optional[str], force: bool) -> Dict[str, Any]:
+    """
+    Upload and schedule one entry (see schedule_entry), raising on failure.
+    """
+    schedule_time = entry['schedule_datetime'].isoformat()
+    media_key = None
+    if ledger is not None:
+        record = ledger.get(content_hash)
+        if record is not None and record.status == 'scheduled':
+            same_episode = (record.schedule_time == schedule_time
+                            and record.title in (None, entry['podbean_title']))
+            if same_episode and not force:
+                print(f"Already scheduled: {entry['podbean_title']} (episode {record.episode_id})")
+                return {
+                    'title': entry['podbean_title'],
+                    'status': 'skipped',
+                    'podbean_id': record.episode_id,
+                    'schedule_time': record.schedule_time,
+                    'permalink_url': record.permalink_url
+                }
+            print(f"Audio was scheduled before as episode {record.episode_id} "
+                  f"({record.title or 'untitled'}, {record.schedule_time}), scheduling again")
+        media_key = ledger.media_key(content_hash)
+    
+    def upload() -> str:
+        print(f"Uploading audio file: {os.path.basename(entry['audio_file'])}")
+        key = podbean.upload_audio(entry['audio_file'])
+        if ledger is not None:
+            ledger.record_upload(content_hash, entry['audio_file'], key)
+        return key
+    
+    def schedule(key: str) -> Dict:
+        print(f"Scheduling episode: {entry['podbean_title']}")
+        return podbean.schedule_episode(
+            title=entry['podbean_title'],
+            description=entry['description'],
+            media_key=key,
+            schedule_time=entry['schedule_datetime']
+        )
+    
+    # Upload the audio file (unless an earlier run did), then schedule the episode
+    if media_key:
+        print(f"Reusing uploaded media: {os.path.basename(entry['audio_file'])}")
+        try:
+            response = schedule(media_key)
+        except Exception as e:
+            print(f"Reused media key was rejected ({str(e)}), uploading again")
+            response = schedule(upload())
+    else:
+        response = schedule(upload())
+    
+    if ledger is not None:
+        ledger.record_scheduled(content_hash, response['id'], schedule_time,
+                                response.get('permalink_url'), entry['podbean_title'])
+    
+    print(f"Successfully scheduled: {entry['podbean_title']}")
+    return {
+        'title': entry['podbean_title'],
+        'status': 'success',
+        'podbean_id': response['id'],
+        'schedule_time': schedule_time,
+        'permalink_url': response.get('permalink_url')
+    }
+
+def schedule_entry(podbean: PodBeanAPI, entry: Dict[str, Any], ledger: Optional[UploadLedger] = None,
+                   force: bool = False) -> Dict[str, Any]:
+    """
+    Upload and schedule one entry, returning its result instead of raising.
+    
+    With a ledger, an entry whose audio (by content hash) is already scheduled
+    with the same title and publish time is skipped, unless force is set;
+    otherwise it is scheduled again. A recent media key of an earlier upload
+    is reused; if scheduling with a reused key fails, the file is uploaded
+    again once. Entries with the same audio are handled one at a time, so
+    concurrent workers upload it only once.
+    """
+    print(f"\nProcessing: {entry['podbean_title']}")
+    try:
+        if ledger is None:
+            return _publish_entry(podbean, entry, None, None, force)
+        
+        content_hash = file_sha256(entry['audio_file'])
+        # Entries sharing audio take turns, so a duplicate sees the first one's result
+        with ledger.lock(content_hash):
+            try:
+                return _publish_entry(podbean, entry, ledger, content_hash, force)
+            except Exception as e:
+                # Still under the lock, so it cannot overwrite a later success
+                ledger.record_error(content_hash, entry['audio_file'], str(e))
+                raise
+    
+    except Exception as e:
+        print(f"Error scheduling {entry['podbean_title']}: {str(e)}")
+        return {
+            'title': entry['podbean_title'],
+            'status': 'error',
+            'error': str(e)
+        }
+
+def schedule_to_podbean(entries: List[Dict[str, Any]], max_workers: int = UPLOAD_WORKERS,
+                        ledger_path: Optional[str] = LEDGER_FILE, force: bool = False) -> List[Dict[str, Any]]:
     """
     Schedule entries to Podbean.
+    
+    Up to max_workers entries are uploaded and scheduled at once, so a batch
+    takes about as long as its slowest upload. Results are in input order.
+    Progress is recorded in the upload ledger at ledger_path (None disables
+    it), which makes reruns skip finished work; force schedules every entry
+    again anyway.
     """
     # Initialize Podbean client
     client_id = os.getenv('PODBEAN_CLIENT_ID')
@@ -403,49 +599,30 @@ def schedule_to_podbean(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not client_id or not client_secret:
         raise ValueError("Podbean credentials not found in .env file")
         
-    podbean = PodBeanAPI(client_id, client_secret)
-    results = []
-    
-    for entry in entries:
-        try:
-            print(f"\nProcessing: {entry['podbean_title']}")
-            
-            # 1. Upload the audio file
-            print("Uploading audio file...")
-            media_key = podbean.upload_audio(entry['audio_file'])
-            
-            # 2. Schedule the episode
-            print("Scheduling episode...")
-            response = podbean.schedule_episode(
-                title=entry['podbean_title'],
-                description=entry['description'],
-                media_key=media_key,
-                schedule_time=entry['schedule_datetime']
-            )
-            
-            print(f"Successfully scheduled: {entry['podbean_title']}")
-            results.append({
-                'title': entry['podbean_title'],
-                'status': 'success',
-                'podbean_id': response['id'],
-                'schedule_time': entry['schedule_datetime'].isoformat(),
-                'permalink_url': response.get('permalink_url')
-            })
+    max_workers = max(1, max_workers)
+    ledger = UploadLedger(ledger_path) if ledger_path else None
+    try:
+        with PodBeanAPI(client_id, client_secret, pool_size=max_workers) as podbean:
+            # Authenticate once up front instead of in every worker
+            podbean.get_access_token()
             
-        except Exception as e:
-            print(f"Error scheduling {entry['podbean_title']}: {str(e)}")
-            results.append({
-                'title': entry['podbean_title'],
-                'status': 'error',
-                'error': str(e)
-            })
-    
-    return results
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(lambda entry: schedule_entry(podbean, entry, ledger, force), entries))
+    finally:
+        if ledger is not None:
+            ledger.close()
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """
     Main execution function.
     """
+    parser = argparse.ArgumentParser(description="Schedule episodes from a WhatsApp message to Podbean")
+    parser.add_argument('--upload-workers', type=int, default=UPLOAD_WORKERS,
+                        help=f"episodes uploaded concurrently (default: {UPLOAD_WORKERS})")
+    parser.add_argument('--force', action='store_true',
+                        help="schedule every entry even if the upload ledger lists it as scheduled")
+    args = parser.parse_args(argv)
+    
     # Get the script's directory and project root
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)  # Parent directory of scripts
@@ -488,7 +665,7 @@ def main():
     scheduled_entries = prepare_podbean_schedule(matched_entries)
     
     print("\nScheduling to Podbean...")
-    schedule_to_podbean(scheduled_entries)
+    schedule_to_podbean(scheduled_entries, max_workers=args.upload_workers, force=args.force)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Silence and Intro Detection Module
+
+Finds where the program audio of an episode starts and ends, so intros are
+trimmed per file instead of by a fixed number of seconds.
+
+Decoded PCM is streamed from ffmpeg in fixed-size chunks and reduced to a
+level envelope (RMS in dBFS per short window) with vectorized NumPy, so
+the track itself is never held in memory. Only the first and last
+SCAN_SECONDS are decoded, which keeps long files fast and memory flat;
+when the closing region holds no sound (a long silent tail, or a VBR
+file without a Xing header whose estimated duration overshoots), the
+scan steps back one region at a time.
+
+Key Features:
+- Leading/trailing silence detection with a minimum sound duration, so
+  clicks and breaths do not count as program start
+- Optional station jingle detection: the jingle's level envelope is
+  located in the opening by normalized cross-correlation, and the cut
+  moves past it
+- Trim points returned in seconds for audio_cut
+
+Dependencies:
+- FFmpeg: Decoding to raw PCM
+- numpy: Vectorized envelope computation
+"""
+
+import os
+import re
+import subprocess
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from scripts.audio_engine import FFMPEG_BINARY
+
+# Analysis is done on a low-rate mono downmix; plenty for level detection
+ANALYSIS_SAMPLE_RATE = 8000
+
+# Length of one RMS window
+WINDOW_SECONDS = 0.05
+
+# PCM decoded per read
+CHUNK_SECONDS = 10
+
+# Audio decoded at each end of a track (and per step when searching back for the end)
+SCAN_SECONDS = 180.0
+
+# Windows below this level count as silence
+SILENCE_THRESHOLD_DB = -45.0
+
+# Sound must last this long to mark program start or end
+MIN_SOUND_SECONDS = 0.3
+
+# Audio kept before the first and after the last sound
+PADDING_SECONDS = 0.15
+
+# Minimum normalized correlation for a jingle match
+JINGLE_MIN_CORRELATION = 0.8
+
+DURATION_PATTERN = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+
+
+class TrimPoints(NamedTuple):
+    """Program audio bounds in seconds; end is None when not detected."""
+    start: float
+    end: Optional[float]
+
+
+def probe_duration(path: str) -> Optional[float]:
+    """
+    Read a file's duration from its container header.
+
+    Args:
+        path (str): Media file
+
+    Returns:
+        Optional[float]: Duration in seconds, or None if unknown
+    """
+    # Without an output ffmpeg exits with an error after printing the header
+    process = subprocess.run(
+        [FFMPEG_BINARY, '-hide_banner', '-nostdin', '-i', path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    match = DURATION_PATTERN.search(process.stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def iter_levels(path: str, start: float = 0.0, duration: Optional[float] = None) -> Iterator[np.ndarray]:
+    """
+    Stream a file's level envelope, one chunk of windows at a time.
+
+    Args:
+        path (str): Media file
+        start (float, optional): Position to start decoding at. Defaults to 0.
+        duration (float, optional): Seconds to decode. Defaults to the rest.
+
+    Yields:
+        np.ndarray: Window levels in dBFS (float32)
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    command = [FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-nostdin']
+    if start > 0:
+        command += ['-ss', f'{start:.3f}']
+    if duration is not None:
+        command += ['-t', f'{duration:.3f}']
+    command += [
+        '-i', path,
+        '-vn',
+        '-ac', '1',
+        '-ar', str(ANALYSIS_SAMPLE_RATE),
+        '-f', 's16le',
+        '-'
+    ]
+
+    window = int(ANALYSIS_SAMPLE_RATE * WINDOW_SECONDS)
+    chunk_bytes = window * int(CHUNK_SECONDS / WINDOW_SECONDS) * 2
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        pending = b''
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            data = pending + data
+            usable = len(data) - len(data) % (window * 2)
+            pending = data[usable:]
+            if not usable:
+                continue
+
+            samples = np.frombuffer(data[:usable], dtype='<i2').astype(np.float32).reshape(-1, window)
+            rms = np.sqrt(np.mean(np.square(samples / 32768.0), axis=1))
+            yield 20 * np.log10(np.maximum(rms, 1e-6))
+
+        error = process.stderr.read().decode(errors='replace')
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed ({process.returncode}): {error.strip()}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def read_levels(path: str, start: float = 0.0, duration: Optional[float] = None) -> np.ndarray:
+    """
+    Collect the level envelope of a (bounded) region of a file.
+
+    Args:
+        path (str): Media file
+        start (float, optional): Region start. Defaults to 0.
+        duration (float, optional): Region length. Defaults to the rest.
+
+    Returns:
+        np.ndarray: Window levels in dBFS
+    """
+    chunks = list(iter_levels(path, start, duration))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.float32)
+
+
+def _sustained_sound(levels: np.ndarray, threshold_db: float, min_sound_seconds: float) -> np.ndarray:
+    """Return the window indices that start a run of sound long enough to count."""
+    run = max(1, int(round(min_sound_seconds / WINDOW_SECONDS)))
+    if len(levels) < run:
+        return np.empty(0, dtype=np.intp)
+    loud = (levels > threshold_db).astype(np.int32)
+    return np.flatnonzero(np.convolve(loud, np.ones(run, dtype=np.int32), mode='valid') == run)
+
+
+def find_jingle_end(levels: np.ndarray, jingle_levels: np.ndarray) -> Optional[float]:
+    """
+    Locate a jingle in an envelope by normalized cross-correlation.
+
+    Args:
+        levels (np.ndarray): Envelope of the track opening
+        jingle_levels (np.ndarray): Envelope of the jingle
+
+    Returns:
+        Optional[float]: Offset in seconds where the jingle ends, or None
+            if no window correlates above JINGLE_MIN_CORRELATION
+    """
+    size = len(jingle_levels)
+    if size < 2 or len(levels) < size:
+        return None
+
+    reference = jingle_levels - jingle_levels.mean()
+    reference /= np.linalg.norm(reference) or 1.0
+
+    frames = np.lib.stride_tricks.sliding_window_view(levels, size)
+    centered = frames - frames.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=1)
+    scores = centered @ reference / np.where(norms > 0, norms, np.inf)
+
+    best = int(np.argmax(scores))
+    if scores[best] < JINGLE_MIN_CORRELATION:
+        return None
+    return float((best + size) * WINDOW_SECONDS)
+
+
+def find_last_sound(
+    path: str,
+    duration: float,
+    floor: float = 0.0,
+    threshold_db: float = SILENCE_THRESHOLD_DB,
+    min_sound_seconds: float = MIN_SOUND_SECONDS
+) -> Optional[Tuple[float, float]]:
+    """
+    Scan back from the end of a track for its last sustained sound.
+
+    Regions of SCAN_SECONDS are decoded from the end towards floor, so a
+    silent tail of any length is crossed. The container duration only
+    places the first region: a region starting past the real end decodes
+    to nothing and the scan moves back, and the end of the audio is taken
+    from what was actually decoded.
+
+    Args:
+        path (str): Media file
+        duration (float): Duration reported by the container
+        floor (float, optional): Position to stop searching at. Defaults to 0.
+        threshold_db (float, optional): Silence level. Defaults to SILENCE_THRESHOLD_DB.
+        min_sound_seconds (float, optional): Minimum sound duration.
+            Defaults to MIN_SOUND_SECONDS.
+
+    Returns:
+        Optional[Tuple[float, float]]: Where the last sound ends and where
+            the decoded audio ends, in seconds, or None if there is no
+            sustained sound after floor
+    """
+    run = max(1, int(round(min_sound_seconds / WINDOW_SECONDS)))
+    # Regions overlap by one run, so sound across a boundary is still found
+    overlap = run * WINDOW_SECONDS
+    region_start = max(floor, duration - SCAN_SECONDS)
+    region_end = None
+    audio_end = None
+
+    while True:
+        levels = read_levels(path, region_start, None if region_end is None else region_end - region_start)
+        if audio_end is None and len(levels):
+            audio_end = region_start + len(levels) * WINDOW_SECONDS
+
+        runs = _sustained_sound(levels, threshold_db, min_sound_seconds)
+        if len(runs):
+            return region_start + float(runs[-1] + run) * WINDOW_SECONDS, audio_end
+        if region_start <= floor:
+            return None
+
+        # Until some audio has been decoded, keep reading to the real end
+        region_end = region_start + overlap if audio_end is not None else None
+        region_start = max(floor, region_start - SCAN_SECONDS)
+
+
+def detect_trim_points(
+    path: str,
+    jingle_path: Optional[str] = None,
+    threshold_db: float = SILENCE_THRESHOLD_DB,
+    min_sound_seconds: float = MIN_SOUND_SECONDS,
+    padding_seconds: float = PADDING_SECONDS
+) -> TrimPoints:
+    """
+    Find where a track's program audio starts and ends.
+
+    The opening SCAN_SECONDS are analyzed for the start: the first
+    sustained sound (after the jingle, if one is given and found). The
+    end is the last sustained sound, found by find_last_sound. Both keep
+    padding_seconds of surrounding audio.
+
+    Args:
+        path (str): Media file
+        jingle_path (str, optional): Station jingle to skip past
+        threshold_db (float, optional): Silence level. Defaults to SILENCE_THRESHOLD_DB.
+        min_sound_seconds (float, optional): Minimum sound duration.
+            Defaults to MIN_SOUND_SECONDS.
+        padding_seconds (float, optional): Audio kept around the program.
+            Defaults to PADDING_SECONDS.
+
+    Returns:
+        TrimPoints: Start and end in seconds (start 0 if no sound is found,
+            end None if the duration is unknown or no sound is found
+            after the start)
+    """
+    head = read_levels(path, 0.0, SCAN_SECONDS)
+
+    offset = 0
+    if jingle_path:
+        jingle_end = find_jingle_end(head, read_levels(jingle_path))
+        if jingle_end is not None:
+            offset = int(round(jingle_end / WINDOW_SECONDS))
+
+    starts = _sustained_sound(head[offset:], threshold_db, min_sound_seconds)
+    if len(starts):
+        start = max(offset * WINDOW_SECONDS, float(offset + starts[0]) * WINDOW_SECONDS - padding_seconds)
+    else:
+        start = offset * WINDOW_SECONDS
+
+    name = os.path.basename(path)
+    duration = probe_duration(path)
+    if duration is None:
+        print(f"No end point for {name}: duration unknown, keeping the end")
+        return TrimPoints(start, None)
+
+    found = find_last_sound(path, duration, start, threshold_db, min_sound_seconds)
+    if found is None:
+        print(f"No end point for {name}: no sound after {start:.2f}s, keeping the end")
+        return TrimPoints(start, None)
+
+    last_sound, audio_end = found
+    end = min(audio_end, last_sound + padding_seconds)
+    return TrimPoints(start, end if end > start else None)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+OAuth Token Cache Module
+
+Keeps an OAuth access token in a local cache file together with its
+expiry, so that each script run does not pay an authentication round
+trip, and refreshes it shortly before it expires.
+
+Key Features:
+- Token persisted with its absolute expiry time (from expires_in)
+- Proactive refresh REFRESH_MARGIN seconds before expiry, so long
+  upload runs never send an expired token
+- One lock around check-and-refresh: concurrent workers that find the
+  token stale wait for a single refresh instead of each requesting one
+- invalidate() for tokens the server rejects; only the first of several
+  concurrent rejections of the same token triggers a refresh
+- Atomic cache writes, readable only by the current user
+
+Dependencies:
+- json: Standard library storage
+
+Storage (JSON, default output/podbean_token.json):
+    {"<cache key>": {"access_token": "...", "expires_at": 1700000000.0}}
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Default location of the token cache
+TOKEN_CACHE_FILE = os.path.join('output', 'podbean_token.json')
+
+# Refresh tokens this many seconds before they expire
+REFRESH_MARGIN = 300
+
+# Lifetime assumed when the token response has no expires_in
+DEFAULT_EXPIRES_IN = 3600
+
+
+class TokenManager:
+    """
+    Thread-safe access token cache backed by a JSON file.
+
+    Args:
+        fetch (Callable[[], Dict[str, Any]]): Requests a new token; returns
+            the token response with 'access_token' and optionally 'expires_in'
+        cache_key (str): Identifies the credentials, e.g. the client ID
+            (never the secret)
+        cache_path (str, optional): Cache file, or None to keep the token in
+            memory only. Defaults to TOKEN_CACHE_FILE.
+        refresh_margin (float, optional): Seconds before expiry at which the
+            token is refreshed. Defaults to REFRESH_MARGIN.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Dict[str, Any]],
+        cache_key: str,
+        cache_path: Optional[str] = TOKEN_CACHE_FILE,
+        refresh_margin: float = REFRESH_MARGIN
+    ):
+        self.fetch = fetch
+        self.cache_key = cache_key
+        self.cache_path = cache_path
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._token: Optional[Dict[str, Any]] = None
+
+    def _fresh(self, token: Optional[Dict[str, Any]]) -> bool:
+        """Whether a cached token is usable for at least refresh_margin seconds."""
+        return bool(token) and token['expires_at'] - self.refresh_margin > time.time()
+
+    def _read_cache(self) -> Dict[str, Any]:
+        """Load all cached tokens (empty if the file is missing or unreadable)."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable token cache {self.cache_path}: {str(e)}")
+            return {}
+
+    def _save_cache(self, entries: Dict[str, Any]) -> None:
+        """Replace the cache file with the given entries."""
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.cache_path + '.tmp'
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(temp_path, self.cache_path)
+
+    def token(self) -> str:
+        """
+        Return a valid access token, refreshing it if it is about to expire.
+
+        Returns:
+            str: Access token
+        """
+        with self._lock:
+            if self._fresh(self._token):
+                return self._token['access_token']
+
+            # Another process may have refreshed it since we last looked
+            cached = self._read_cache().get(self.cache_key)
+            if self._fresh(cached):
+                self._token = cached
+                return cached['access_token']
+
+            response = self.fetch()
+            expires_in = float(response.get('expires_in') or DEFAULT_EXPIRES_IN)
+            self._token = {
+                'access_token': response['access_token'],
+                'expires_at': time.time() + expires_in
+            }
+            if self.cache_path:
+                entries = self._read_cache()
+                entries[self.cache_key] = self._token
+                self._save_cache(entries)
+            return self._token['access_token']
+
+    def invalidate(self, access_token: str) -> None:
+        """
+        Discard a token the server rejected, so the next token() refreshes.
+
+        Only the current token is discarded: if another worker already
+        replaced it, nothing happens.
+
+        Args:
+            access_token (str): Token that was rejected
+        """
+        with self._lock:
+            if self._token and self._token['access_token'] == access_token:
+                self._token = None
+                if self.cache_path:
+                    entries = self._read_cache()
+                    if entries.pop(self.cache_key, None) is not None:
+                        self._save_cache(entries)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Podbean Upload Ledger Module
+
+Records every audio file uploaded and scheduled by schedule_podbean,
+keyed by the file's content hash, so that a rerun after a partial failure
+skips episodes that are already scheduled (with the same title and
+publish time) and reuses media keys of files that were uploaded but not
+scheduled.
+
+Storage (SQLite, default output/upload_ledger.sqlite):
+- uploads: content hash -> file path, Podbean file_key and upload time,
+  episode id, title, schedule time and permalink, status and last error
+
+Statuses:
+- uploaded: the file_key is known, scheduling has not succeeded yet
+- scheduled: the episode exists on Podbean; reruns for the same title and
+  time skip it
+- failed: the last attempt failed (a recorded file_key is still reused);
+  a failure never replaces 'scheduled', since that episode still exists
+
+Dependencies:
+- sqlite3: Standard library persistence
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional
+
+# Default location of the ledger
+LEDGER_FILE = os.path.join('output', 'upload_ledger.sqlite')
+
+# Media keys older than this are not reused; the file is uploaded again
+MEDIA_KEY_MAX_AGE = 24 * 3600
+
+
+class LedgerEntry(NamedTuple):
+    """One audio file's upload and scheduling state."""
+    content_hash: str
+    file_path: str
+    file_key: Optional[str]
+    uploaded_at: Optional[float]
+    episode_id: Optional[str]
+    schedule_time: Optional[str]
+    permalink_url: Optional[str]
+    status: str
+    error: Optional[str]
+    title: Optional[str]
+
+
+class UploadLedger:
+    """
+    SQLite-backed record of uploads and scheduled episodes.
+
+    All methods are thread-safe, so concurrent upload workers can share
+    one ledger. Workers hold lock(content_hash) from the ledger lookup
+    until the result is recorded, so two entries with the same audio
+    never both upload it.
+
+    Args:
+        path (str, optional): SQLite database file, created if missing.
+            Defaults to LEDGER_FILE.
+    """
+
+    def __init__(self, path: str = LEDGER_FILE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._hash_locks: Dict[str, threading.Lock] = {}
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS uploads (
+                    content_hash TEXT PRIMARY KEY,
+                    file_path TEXT NOT NULL,
+                    file_key TEXT,
+                    uploaded_at REAL,
+                    episode_id TEXT,
+                    schedule_time TEXT,
+                    permalink_url TEXT,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    title TEXT
+                )
+            """)
+            # Ledgers written before titles were recorded
+            columns = [row[1] for row in self.connection.execute("PRAGMA table_info(uploads)")]
+            if 'title' not in columns:
+                self.connection.execute("ALTER TABLE uploads ADD COLUMN title TEXT")
+
+    def __enter__(self) -> 'UploadLedger':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self.connection.close()
+
+    @contextmanager
+    def lock(self, content_hash: str) -> Iterator[None]:
+        """
+        Hold the lock for one audio file while checking for and uploading it.
+
+        Args:
+            content_hash (str): SHA-256 of the audio file
+        """
+        with self._lock:
+            hash_lock = self._hash_locks.setdefault(content_hash, threading.Lock())
+        with hash_lock:
+            yield
+
+    def get(self, content_hash: str) -> Optional[LedgerEntry]:
+        """
+        Look up a file's entry.
+
+        Args:
+            content_hash (str): SHA-256 of the audio file
+
+        Returns:
+            Optional[LedgerEntry]: Entry, or None if the file was never uploaded
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT content_hash, file_path, file_key, uploaded_at, episode_id, schedule_time, "
+                "permalink_url, status, error, title FROM uploads WHERE content_hash = ?",
+                (content_hash,)
+            ).fetchone()
+        return LedgerEntry(*row) if row else None
+
+    def media_key(self, content_hash: str, max_age: float = MEDIA_KEY_MAX_AGE) -> Optional[str]:
+        """
+        Return a recorded media key that is recent enough to reuse.
+
+        Args:
+            content_hash (str): SHA-256 of the audio file
+            max_age (float, optional): Maximum key age in seconds.
+                Defaults to MEDIA_KEY_MAX_AGE.
+
+        Returns:
+            Optional[str]: Podbean file_key, or None
+        """
+        entry = self.get(content_hash)
+        if entry is None or not entry.file_key or entry.uploaded_at is None:
+            return None
+        return entry.file_key if time.time() - entry.uploaded_at <= max_age else None
+
+    def record_upload(self, content_hash: str, file_path: str, file_key: str) -> None:
+        """
+        Record a completed upload.
+
+        Args:
+            content_hash (str): SHA-256 of the audio file
+            file_path (str): Uploaded file
+            file_key (str): Podbean media key
+        """
+        now = time.time()
+        with self._lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO uploads (content_hash, file_path, file_key, uploaded_at, status, updated_at) "
+                    "VALUES (?, ?, ?, ?, 'uploaded', ?) "
+                    "ON CONFLICT (content_hash) DO UPDATE SET file_path = excluded.file_path, "
+                    "file_key = excluded.file_key, uploaded_at = excluded.uploaded_at, "
+                    "status = 'uploaded', error = NULL, updated_at = excluded.updated_at",
+                    (content_hash, file_path, file_key, now, now)
+                )
+
+    def record_scheduled(self, content_hash: str, episode_id: str, schedule_time: str,
+                         permalink_url: Optional[str] = None, title: Optional[str] = None) -> None:
+        """
+        Record a scheduled episode.
+
+        Args:
+            content_hash (str): SHA-256 of the audio file (already recorded
+                by record_upload)
+            episode_id (str): Podbean episode id
+            schedule_time (str): ISO publish time
+            permalink_url (str, optional): Episode URL
+            title (str, optional): Episode title
+        """
+        with self._lock:
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE uploads SET episode_id = ?, schedule_time = ?, permalink_url = ?, title = ?, "
+                    "status = 'scheduled', error = NULL, updated_at = ? WHERE content_hash = ?",
+                    (episode_id, schedule_time, permalink_url, title, time.time(), content_hash)
+                )
+
+    def record_error(self, content_hash: str, file_path: str, error: str) -> None:
+        """
+        Record a failed attempt, keeping any media key already uploaded.
+
+        A scheduled entry keeps its status (only the error is stored): its
+        episode exists on Podbean whatever happened to a later attempt.
+
+        Args:
+            content_hash (str): SHA-256 of the audio file
+            file_path (str): Audio file
+            error (str): Error message
+        """
+        now = time.time()
+        with self._lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO uploads (content_hash, file_path, status, error, updated_at) "
+                    "VALUES (?, ?, 'failed', ?, ?) "
+                    "ON CONFLICT (content_hash) DO UPDATE SET "
+                    "status = CASE WHEN status = 'scheduled' THEN 'scheduled' ELSE 'failed' END, "
+                    "error = excluded.error, updated_at = excluded.updated_at",
+                    (content_hash, file_path, error, now)
+                )
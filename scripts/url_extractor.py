@@ -10,6 +10,8 @@ Key Features:
 - Clean and standardize video titles
 - Save metadata with consistent formatting
 - Support for pagination of YouTube API results
+- Uploads-playlist enumeration (1 quota unit per page) with cached channel lookup
+- Concurrent, rate-limited detail fetches with retries (see youtube_fetcher)
 
 Dependencies:
 - google-api-python-client
@@ -18,10 +20,11 @@ Dependencies:
 - Custom utils module for title cleaning
 
 Usage:
-    python url_extractor.py
+    python -m scripts.url_extractor
     
 Environment:
     Requires YOUTUBE_API_KEY in .env file
+    Optional YOUTUBE_API_ENDPOINT to point at a local fake API server
 
 Output:
     Saves video metadata to output/video_metadata.csv
@@ -29,12 +32,13 @@ Output:
 
 import os
 import html
+import json
 import pandas as pd
-from googleapiclient.discovery import build
 from dotenv import load_dotenv
 
 # Custom utility imports
-from scripts.utils import clean_title
+from scripts.normalization import clean_title
+from scripts.youtube_fetcher import ConcurrentFetcher, build_youtube_client
 
 # Load environment variables
 load_dotenv()
@@ -45,21 +49,263 @@ if not API_KEY:
     raise ValueError("YouTube API key not found in environment variables. "
                      "Please set YOUTUBE_API_KEY in .env file.")
 
-# Initialize YouTube API client
-youtube = build('youtube', 'v3', developerKey=API_KEY)
+# Initialize YouTube API client (YOUTUBE_API_ENDPOINT overrides the API URL)
+youtube = build_youtube_client(API_KEY)
 
+# Channel ID / uploads playlist cache, stored next to the metadata CSV
+CHANNEL_CACHE_FILE = 'channel_cache.json'
 
-def get_videos(channel_name='belovedsonsofgod', output_dir='output', max_results=1000):
+
+def load_existing_metadata(output_dir='output'):
+    """
+    Load previously extracted metadata, if any.
+
+    Args:
+        output_dir (str, optional): Directory containing video_metadata.csv.
+            Defaults to 'output'.
+
+    Returns:
+        pd.DataFrame: Existing metadata, or an empty DataFrame if there is none
+    """
+    metadata_path = os.path.join(output_dir, 'video_metadata.csv')
+    if not os.path.exists(metadata_path) or os.path.getsize(metadata_path) == 0:
+        return pd.DataFrame()
+    return pd.read_csv(metadata_path)
+
+
+def is_truncated_description(description):
+    """
+    Check whether a description looks cut off by the API.
+
+    Args:
+        description (str): Description from a video snippet
+
+    Returns:
+        bool: True if the description ends in an ellipsis
+    """
+    return description.rstrip().endswith(('...', '\u2026'))
+
+
+def _execute(request, fetcher=None):
+    """Execute an API request through the fetcher when one is given."""
+    return fetcher.execute(request) if fetcher else request.execute()
+
+
+def fetch_full_descriptions(video_ids, fetcher=None):
+    """
+    Fetch full descriptions for the given videos, 50 ids per API call.
+
+    Args:
+        video_ids (list): YouTube video IDs
+        fetcher (ConcurrentFetcher, optional): Executes the API requests
+
+    Returns:
+        dict: video_id to full description, for the videos that could be fetched
+    """
+    descriptions = {}
+    for start in range(0, len(video_ids), 50):
+        batch_ids = video_ids[start:start + 50]
+        try:
+            response = _execute(youtube.videos().list(
+                part="snippet",
+                id=','.join(batch_ids),
+                maxResults=50
+            ), fetcher)
+        except Exception as e:
+            print(f"\nError getting full descriptions for {len(batch_ids)} videos: {e}")
+            continue
+
+        for video in response.get('items', []):
+            descriptions[video['id']] = video['snippet'].get('description', '')
+
+    return descriptions
+
+
+def resolve_channel(channel_name, cache_path=os.path.join('output', CHANNEL_CACHE_FILE), fetcher=None):
+    """
+    Resolve a channel's ID and uploads playlist, caching the result locally.
+
+    The search().list lookup costs 100 quota units, so it runs only the first
+    time a channel name is seen; later runs read the JSON cache.
+
+    Args:
+        channel_name (str): Channel name to search for
+        cache_path (str, optional): JSON cache file. Defaults to output/channel_cache.json.
+        fetcher (ConcurrentFetcher, optional): Executes the API requests
+
+    Returns:
+        dict: 'channel_id' and 'uploads_playlist_id'
+
+    Raises:
+        ValueError: If the channel is not found
+    """
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+
+    if channel_name in cache:
+        return cache[channel_name]
+
+    channel_response = _execute(youtube.search().list(
+        part="snippet",
+        q=channel_name,
+        type="channel",
+        maxResults=1
+    ), fetcher)
+
+    if not channel_response.get('items'):
+        raise ValueError(f"No channel found with name: {channel_name}")
+
+    channel_id = channel_response['items'][0]['id']['channelId']
+
+    details = _execute(youtube.channels().list(
+        part="contentDetails",
+        id=channel_id
+    ), fetcher)
+    uploads_playlist_id = details['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+
+    cache[channel_name] = {
+        'channel_id': channel_id,
+        'uploads_playlist_id': uploads_playlist_id
+    }
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+    return cache[channel_name]
+
+
+def iter_video_id_pages(channel, backend='playlist', fetcher=None):
+    """
+    Yield pages of video IDs from a channel, newest first.
+
+    Args:
+        channel (dict): Result of resolve_channel
+        backend (str, optional): 'playlist' or 'search'. Defaults to 'playlist'.
+        fetcher (ConcurrentFetcher, optional): Executes the API requests
+
+    Yields:
+        list: Up to 50 video IDs per page
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend not in ('playlist', 'search'):
+        raise ValueError(f"Unknown enumeration backend: {backend}")
+
+    next_page_token = None
+    while True:
+        if backend == 'playlist':
+            # Uploads playlist: 1 quota unit per page
+            response = _execute(youtube.playlistItems().list(
+                part="contentDetails",
+                playlistId=channel['uploads_playlist_id'],
+                maxResults=50,  # YouTube API max per request
+                pageToken=next_page_token
+            ), fetcher)
+            yield [item['contentDetails']['videoId'] for item in response.get('items', [])]
+        else:
+            response = _execute(youtube.search().list(
+                part="snippet",
+                channelId=channel['channel_id'],
+                maxResults=50,  # YouTube API max per request
+                type="video",
+                pageToken=next_page_token,
+                order="date"  # Get newest videos first
+            ), fetcher)
+            yield [item['id']['videoId'] for item in response.get('items', [])]
+
+        # Check for more pages of results
+        next_page_token = response.get('nextPageToken')
+        if not next_page_token:
+            break
+
+
+def limit_id_pages(pages, known_ids=frozenset(), max_results=1000):
+    """
+    Trim pages of newest-first video IDs to the ones still needed.
+
+    Stops at the first ID in known_ids (everything older is already stored)
+    or once max_results IDs have been yielded.
+
+    Args:
+        pages (Iterable[list]): Pages from iter_video_id_pages
+        known_ids (set, optional): Video IDs already in the metadata
+        max_results (int, optional): Maximum number of IDs. Defaults to 1000.
+
+    Yields:
+        list: Non-empty pages of new video IDs
+    """
+    remaining = max_results
+    for video_ids in pages:
+        reached_known = False
+        for position, video_id in enumerate(video_ids):
+            if video_id in known_ids:
+                video_ids = video_ids[:position]
+                reached_known = True
+                break
+
+        video_ids = video_ids[:remaining]
+        remaining -= len(video_ids)
+        if video_ids:
+            yield video_ids
+
+        if reached_known or remaining <= 0:
+            return
+
+
+def fetch_video_details(video_ids, fetcher=None):
+    """
+    Fetch details for one page of up to 50 videos.
+
+    The batched snippet already carries the description; only descriptions
+    that look truncated are re-fetched, 50 ids per call.
+
+    Args:
+        video_ids (list): Up to 50 YouTube video IDs
+        fetcher (ConcurrentFetcher, optional): Executes the API requests
+
+    Returns:
+        list: Video resources with full descriptions in their snippets
+    """
+    video_response = _execute(youtube.videos().list(
+        part="snippet,contentDetails,statistics,status",
+        id=','.join(video_ids),
+        maxResults=50
+    ), fetcher)
+    batch = video_response.get('items', [])
+
+    truncated_ids = [
+        video['id'] for video in batch
+        if is_truncated_description(video['snippet'].get('description', ''))
+    ]
+    if truncated_ids:
+        full_descriptions = fetch_full_descriptions(truncated_ids, fetcher)
+        for video in batch:
+            if video['id'] in full_descriptions:
+                video['snippet']['description'] = full_descriptions[video['id']]
+
+    return batch
+
+
+def get_videos(channel_name='belovedsonsofgod', output_dir='output', max_results=1000,
+               incremental=False, backend='playlist', fetcher=None):
     """
     Extract video metadata from a specified YouTube channel.
 
     This function performs a comprehensive retrieval of video metadata:
-    - Finds the channel ID based on the channel name
+    - Finds the channel ID and uploads playlist based on the channel name
     - Retrieves video details using YouTube Data API
     - Handles API pagination to get all videos
     - Cleans and standardizes video titles
     - Saves metadata to a CSV file
 
+    In incremental mode, videos are walked newest-first and paging stops at
+    the first video_id already present in video_metadata.csv. Details are
+    fetched only for the new videos, which are merged ahead of the existing
+    rows, so a routine sync costs one or two API pages.
+
     Args:
         channel_name (str, optional): Name of the YouTube channel to extract videos from.
             Defaults to 'belovedsonsofgod'.
@@ -67,6 +313,14 @@ def get_videos(channel_name='belovedsonsofgod', output_dir='output', max_results
             Defaults to 'output'.
         max_results (int, optional): Maximum number of videos to retrieve. 
             Defaults to 1000.
+        incremental (bool, optional): Only fetch videos newer than the
+            existing metadata and merge them in. Defaults to False.
+        backend (str, optional): 'playlist' pages the channel's uploads
+            playlist (1 quota unit per page, no result cap); 'search' uses
+            search().list (100 units per page, capped around 500 videos).
+            Defaults to 'playlist'.
+        fetcher (ConcurrentFetcher, optional): Concurrency, rate limit and
+            retry settings for API calls. Defaults to ConcurrentFetcher().
 
     Returns:
         pd.DataFrame: A DataFrame containing video metadata
@@ -75,97 +329,64 @@ def get_videos(channel_name='belovedsonsofgod', output_dir='output', max_results
         ValueError: If the channel is not found
         Exception: For any API or processing errors
     """
-    try:
-        # Step 1: Find the channel ID
-        channel_response = youtube.search().list(
-            part="snippet",
-            q=channel_name,
-            type="channel",
-            maxResults=1
-        ).execute()
-
-        if not channel_response.get('items'):
-            raise ValueError(f"No channel found with name: {channel_name}")
+    existing_df = load_existing_metadata(output_dir) if incremental else pd.DataFrame()
+    known_ids = set(existing_df['video_id']) if 'video_id' in existing_df else set()
 
-        channel_id = channel_response['items'][0]['id']['channelId']
-        print(f"Found channel: {channel_id}")
+    try:
+        # Step 1: Find the channel ID (cached locally after the first lookup)
+        fetcher = fetcher or ConcurrentFetcher()
+        channel = resolve_channel(channel_name, os.path.join(output_dir, CHANNEL_CACHE_FILE), fetcher)
+        print(f"Found channel: {channel['channel_id']}")
 
-        # Step 2: Retrieve all videos from the channel
+        # Step 2: Retrieve all videos from the channel, fetching details for
+        # several pages concurrently while the next page is enumerated
         videos = []
-        next_page_token = None
         total_retrieved = 0
-
-        while total_retrieved < max_results:
-            # Fetch a batch of videos
-            response = youtube.search().list(
-                part="snippet",
-                channelId=channel_id,
-                maxResults=50,  # YouTube API max per request
-                type="video",
-                pageToken=next_page_token,
-                order="date"  # Get newest videos first
-            ).execute()
-
-            # Get video IDs for detailed info
-            video_ids = [item['id']['videoId'] for item in response.get('items', [])]
-            
-            if video_ids:
-                # Get detailed video information
-                video_response = youtube.videos().list(
-                    part="snippet,contentDetails,statistics,status",
-                    id=','.join(video_ids),
-                    maxResults=50
-                ).execute()
+        pages = limit_id_pages(
+            iter_video_id_pages(channel, backend, fetcher), known_ids, max_results
+        )
+
+        for _, batch in fetcher.map_pages(pages, lambda ids: fetch_video_details(ids, fetcher)):
+            # Process each video in the batch
+            for video in batch:
+                # Extract and clean metadata
+                snippet = video['snippet']
+                date = snippet['publishedAt'][:10]  # YYYY-MM-DD format
                 
-                # Process each video in the batch
-                for video in video_response.get('items', []):
-                    if total_retrieved >= max_results:
-                        break
-
-                    # Extract and clean metadata
-                    snippet = video['snippet']
-                    date = snippet['publishedAt'][:10]  # YYYY-MM-DD format
-                    
-                    # Clean title using utility function
-                    title, _ = clean_title(snippet['title'])
-
-                    # Get full description
-                    try:
-                        # Get individual video details to ensure full description
-                        full_video = youtube.videos().list(
-                            part="snippet",
-                            id=video['id']
-                        ).execute()
-                        description = full_video['items'][0]['snippet']['description']
-                    except Exception as e:
-                        print(f"\nError getting full description for {title}: {e}")
-                        description = snippet.get('description', '')
-
-                    if not description:
-                        description = f"Episode: {title}"
-
-                    video_entry = {
-                        'title': title,
-                        'video_id': video['id'],
-                        'url': f"https://www.youtube.com/watch?v={video['id']}",
-                        'description': description,
-                        'duration': video['contentDetails'].get('duration', ''),
-                        'view_count': video['statistics'].get('viewCount', '0'),
-                        'upload_date': f"{int(date[5:7]):02d}-{int(date[8:10]):02d}-{date[2:4]}"  # MM-DD-YY
-                    }
-                    videos.append(video_entry)
-                    total_retrieved += 1
-
-                    print(f"\rRetrieved {total_retrieved} videos...", end='', flush=True)
-
-            # Check for more pages of results
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
-                break
+                # Clean title using utility function
+                title, _ = clean_title(snippet['title'])
+
+                description = snippet.get('description', '')
+                if not description:
+                    description = f"Episode: {title}"
+
+                video_entry = {
+                    'title': title,
+                    'video_id': video['id'],
+                    'url': f"https://www.youtube.com/watch?v={video['id']}",
+                    'description': description,
+                    'duration': video['contentDetails'].get('duration', ''),
+                    'view_count': video['statistics'].get('viewCount', '0'),
+                    'upload_date': f"{int(date[5:7]):02d}-{int(date[8:10]):02d}-{date[2:4]}"  # MM-DD-YY
+                }
+                videos.append(video_entry)
+                total_retrieved += 1
+
+                print(f"\rRetrieved {total_retrieved} videos...", end='', flush=True)
+
+        if incremental and not existing_df.empty:
+            if not videos:
+                print("Metadata is up to date - no new videos.")
+                return existing_df
+            print(f"\nFound {len(videos)} new videos")
 
         # Step 3: Save metadata to CSV
         if videos:
             df = pd.DataFrame(videos)
+            if not existing_df.empty:
+                # New videos first, keeping the newest-first order of the file
+                df = pd.concat([df, existing_df], ignore_index=True)
+                df = df.drop_duplicates(subset='video_id', keep='first')
             
             # Ensure output directory exists
             os.makedirs(output_dir, exist_ok=True)
@@ -174,7 +395,7 @@ def get_videos(channel_name='belovedsonsofgod', output_dir='output', max_results
             output_path = os.path.join(output_dir, 'video_metadata.csv')
             df.to_csv(output_path, index=False)
             
-            print(f"\nSaved {len(videos)} videos to {output_path}")
+            print(f"\nSaved {len(df)} videos to {output_path}")
             return df
         else:
             print("No videos found for the specified channel.")
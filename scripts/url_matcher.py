@@ -10,16 +10,18 @@ Key Features:
 - Confidence scoring
 - Preprocessing of titles
 - Flexible matching strategies
+- Inverted token index for candidate blocking
+- Vectorized similarity matrices for bulk scoring
 
 Matching Algorithm Overview:
 1. Preprocess and normalize titles
-2. Calculate Levenshtein distance
-3. Apply confidence thresholds
-4. Return best matching URLs
+2. Select candidates sharing rare tokens (inverted index)
+3. Calculate Levenshtein distance
+4. Apply confidence thresholds
+5. Return best matching URLs
 
 Dependencies:
-- fuzzywuzzy: Fuzzy string matching
-- python-Levenshtein: Efficient string distance calculations
+- rapidfuzz: C-backed fuzzy string matching and batch scoring
 - pandas: Data manipulation
 - numpy: Numerical operations
 
@@ -30,57 +32,34 @@ Input:
 Output:
 - Matched URLs with confidence scores
 - Detailed matching information
+
+Usage (from the repository root):
+    python -m scripts.url_matcher
 """
 
-import re
+import math
+import heapq
 import numpy as np
 import pandas as pd
-from fuzzywuzzy import fuzz
-from typing import List, Tuple, Optional, Dict, Any
-
+from collections import defaultdict
+from rapidfuzz import fuzz, process
+from typing import List, Tuple, Optional, Dict, Any, Callable, Iterator
 
-def preprocess_title(title: str) -> str:
-    """
-    Comprehensive title preprocessing for matching.
+from scripts.match_cache import MatchCache
+from scripts.normalization import preprocess_title
 
-    Cleaning steps:
-    - Convert to lowercase
-    - Remove special characters
-    - Remove common stop words
-    - Normalize whitespace
-    - Remove parenthetical content
-    - Handle common abbreviations
+# Bump when scoring changes so persisted match caches are invalidated
+MATCHER_VERSION = 2
 
-    Args:
-        title (str): Raw title to preprocess
+# Weighted scorers combined into one similarity score (0-100)
+SIMILARITY_WEIGHTS = {
+    'partial_ratio': 0.3,     # Substring matching
+    'token_set_ratio': 0.4,   # Order-independent
+    'token_sort_ratio': 0.3   # Normalized word order
+}
 
-    Returns:
-        str: Cleaned and normalized title
-    """
-    # Convert to lowercase
-    title = title.lower()
-    
-    # Remove parenthetical content
-    title = re.sub(r'\([^)]*\)', '', title)
-    
-    # Remove special characters and extra whitespace
-    title = re.sub(r'[^\w\s]', '', title)
-    
-    # Remove common stop words and noise
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 
-        'to', 'for', 'of', 'with', 'by', 'from', 'up', 'about', 
-        'into', 'over', 'after', 'podcast', 'show', 'episode'
-    }
-    
-    # Split, filter, and rejoin
-    words = [word for word in title.split() if word not in stop_words]
-    title = ' '.join(words)
-    
-    # Normalize whitespace
-    title = re.sub(r'\s+', ' ', title).strip()
-    
-    return title
+# Number of YouTube candidates scored per Spotify title in indexed mode
+DEFAULT_CANDIDATE_LIMIT = 50
 
 
 def calculate_title_similarity(title1: str, title2: str) -> float:
@@ -105,22 +84,377 @@ def calculate_title_similarity(title1: str, title2: str) -> float:
     
     # Calculate multiple similarity metrics
     metrics = [
-        fuzz.partial_ratio(clean_title1, clean_title2),
-        fuzz.token_set_ratio(clean_title1, clean_title2),
-        fuzz.token_sort_ratio(clean_title1, clean_title2)
+        getattr(fuzz, scorer)(clean_title1, clean_title2)
+        for scorer in SIMILARITY_WEIGHTS
     ]
     
     # Weighted average of metrics
-    weights = [0.3, 0.4, 0.3]
-    similarity = np.average(metrics, weights=weights)
+    similarity = np.average(metrics, weights=list(SIMILARITY_WEIGHTS.values()))
     
     return similarity
 
 
+def calculate_similarity_matrix(
+    titles_a: List[str],
+    titles_b: List[str],
+    weights: Optional[Dict[str, float]] = None,
+    processor: Optional[Callable[[str], str]] = preprocess_title,
+    workers: int = -1
+) -> np.ndarray:
+    """
+    Calculate the weighted similarity of every title pair in one batch.
+
+    Each title is preprocessed exactly once, then every scorer runs as a
+    single rapidfuzz cdist call spread over all cores. Cell [i, j] equals
+    calculate_title_similarity(titles_a[i], titles_b[j]) with the default
+    weights, so callers can take a row-wise argmax instead of looping.
+
+    Args:
+        titles_a (List[str]): Query titles (matrix rows)
+        titles_b (List[str]): Candidate titles (matrix columns)
+        weights (Dict[str, float], optional): rapidfuzz.fuzz scorer name to
+            weight. Defaults to SIMILARITY_WEIGHTS.
+        processor (Callable, optional): Applied once per title before
+            scoring; pass None for titles that are already normalized.
+            Defaults to preprocess_title.
+        workers (int, optional): Threads used by cdist, -1 for all cores
+
+    Returns:
+        np.ndarray: Float matrix of shape (len(titles_a), len(titles_b))
+    """
+    weights = weights or SIMILARITY_WEIGHTS
+    if processor is not None:
+        titles_a = [processor(title) for title in titles_a]
+        titles_b = [processor(title) for title in titles_b]
+
+    matrix = np.zeros((len(titles_a), len(titles_b)), dtype=np.float64)
+    if not titles_a or not titles_b:
+        return matrix
+
+    total_weight = sum(weights.values())
+    for scorer, weight in weights.items():
+        matrix += (weight / total_weight) * process.cdist(
+            titles_a,
+            titles_b,
+            scorer=getattr(fuzz, scorer),
+            dtype=np.float64,
+            workers=workers
+        )
+
+    return matrix
+
+
+class TitleIndex:
+    """
+    Inverted token index over preprocessed YouTube titles.
+
+    Built once per metadata snapshot. Each token maps to the rows whose
+    preprocessed title contains it, and tokens are weighted by inverse
+    document frequency so that rare words ("galatians", "righteousness")
+    dominate common ones ("part", "god") when ranking candidates.
+
+    Args:
+        titles (List[str]): Raw YouTube titles, in metadata row order
+    """
+
+    def __init__(self, titles: List[str]):
+        self.size = len(titles)
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+        for row, title in enumerate(titles):
+            for token in set(preprocess_title(title).split()):
+                self.postings[token].append(row)
+
+        self.idf = {
+            token: math.log((self.size + 1) / (len(rows) + 1)) + 1.0
+            for token, rows in self.postings.items()
+        }
+
+    def candidates(self, title: str, limit: int = DEFAULT_CANDIDATE_LIMIT) -> List[int]:
+        """
+        Return the rows most likely to match a title.
+
+        Rows are ranked by the summed IDF weight of the tokens they share
+        with the query and the top ``limit`` are returned in row order, so
+        ties during scoring resolve exactly like the exhaustive scan.
+
+        Args:
+            title (str): Raw title to look up
+            limit (int, optional): Maximum number of rows to return
+
+        Returns:
+            List[int]: Candidate row positions (empty if no token is shared)
+        """
+        weights: Dict[int, float] = defaultdict(float)
+        for token in set(preprocess_title(title).split()):
+            for row in self.postings.get(token, ()):
+                weights[row] += self.idf[token]
+
+        if len(weights) > limit:
+            top = heapq.nlargest(limit, weights.items(), key=lambda item: (item[1], -item[0]))
+            return sorted(row for row, _ in top)
+        return sorted(weights)
+
+
+def _argmax_row(scores: np.ndarray, rows) -> Tuple[Optional[int], float]:
+    """Return the (row, score) of the best score, or (None, 0.0) if empty."""
+    if not len(scores):
+        return None, 0.0
+
+    # argmax keeps the first best row, like a strict > scan
+    best = int(np.argmax(scores))
+    return rows[best], float(scores[best])
+
+
+def _iter_best_rows(
+    spotify_titles: List[str],
+    youtube_titles: List[str],
+    clean_youtube_titles: List[str],
+    exhaustive: bool,
+    candidate_limit: int
+) -> Iterator[Tuple[Optional[int], float]]:
+    """Score Spotify titles against YouTube titles and yield the best row of each, in order."""
+    all_rows = range(len(youtube_titles))
+    clean_spotify_titles = [preprocess_title(title) for title in spotify_titles]
+
+    if exhaustive:
+        # One matrix for every pair, then a row-wise argmax
+        scores = calculate_similarity_matrix(
+            clean_spotify_titles, clean_youtube_titles, processor=None
+        )
+        for row_scores in scores:
+            yield _argmax_row(row_scores, all_rows)
+        return
+
+    index = TitleIndex(youtube_titles) if spotify_titles else None
+    for spotify_title, clean_spotify_title in zip(spotify_titles, clean_spotify_titles):
+        rows = index.candidates(spotify_title, candidate_limit) or all_rows
+        scores = calculate_similarity_matrix(
+            [clean_spotify_title],
+            [clean_youtube_titles[row] for row in rows],
+            processor=None
+        )[0]
+        _, best_score = _argmax_row(scores, rows)
+
+        # Rows outside the candidates can still score as high; add every row
+        # that could reach the best score so the result equals the full scan
+        candidate_set = set(rows)
+        others = _rows_reaching(
+            clean_spotify_title,
+            clean_youtube_titles,
+            [row for row in all_rows if row not in candidate_set],
+            best_score
+        )
+        if others:
+            rows = sorted(candidate_set.union(others))
+            scores = calculate_similarity_matrix(
+                [clean_spotify_title],
+                [clean_youtube_titles[row] for row in rows],
+                processor=None
+            )[0]
+        yield _argmax_row(scores, rows)
+
+
+def _rows_reaching(
+    clean_title: str,
+    clean_titles: List[str],
+    rows: List[int],
+    target: float,
+    weights: Optional[Dict[str, float]] = None
+) -> List[int]:
+    """
+    Return the rows whose weighted similarity to clean_title can reach target.
+
+    Every scorer is at most 100, so a weighted score of at least target
+    needs each scorer to reach (target - (1 - w) * 100) / w for its
+    normalized weight w. Each scorer prunes the remaining rows with that
+    cutoff; the survivors are a superset of the rows scoring >= target.
+    """
+    weights = weights or SIMILARITY_WEIGHTS
+    total_weight = sum(weights.values())
+    for scorer, weight in weights.items():
+        if not rows:
+            break
+        share = weight / total_weight
+        # Small margin so floating point rounding never prunes a tie
+        cutoff = (target - (1.0 - share) * 100.0) / share - 1e-6
+        if cutoff <= 0:
+            continue
+        scores = process.cdist(
+            [clean_title],
+            [clean_titles[row] for row in rows],
+            scorer=getattr(fuzz, scorer),
+            dtype=np.float64,
+            score_cutoff=cutoff
+        )[0]
+        rows = [row for row, score in zip(rows, scores) if score >= cutoff]
+    return rows
+
+
+def _iter_best_rows_cached(
+    cache: MatchCache,
+    spotify_titles: List[str],
+    video_ids: List[str],
+    youtube_titles: List[str],
+    clean_youtube_titles: List[str],
+    exhaustive: bool,
+    candidate_limit: int
+) -> Iterator[Tuple[Optional[int], float]]:
+    """
+    Like _iter_best_rows, but reuse cached best matches from earlier runs.
+
+    Cached titles are only scored against videos that are new or retitled
+    since the stored metadata snapshot. Titles that are not cached, or whose
+    cached video was removed or retitled, get a full match. The cache is
+    updated once every title has been yielded.
+    """
+    snapshot = dict(zip(video_ids, clean_youtube_titles))
+    stored_snapshot = cache.load_snapshot()
+    stale_ids = {video_id for video_id, key in snapshot.items() if stored_snapshot.get(video_id) != key}
+    stale_ids |= stored_snapshot.keys() - snapshot.keys()
+    changed_rows = [row for row, video_id in enumerate(video_ids) if video_id in stale_ids]
+    row_of = {video_id: row for row, video_id in enumerate(video_ids)}
+
+    cached_matches = cache.load_matches()
+    spotify_keys = [preprocess_title(title) for title in spotify_titles]
+    best_rows: List[Optional[Tuple[Optional[int], float]]] = [None] * len(spotify_titles)
+    reused, rescored = [], []
+
+    for i, spotify_key in enumerate(spotify_keys):
+        cached = cached_matches.get(spotify_key)
+        if cached is None:
+            rescored.append(i)
+            continue
+
+        video_id, confidence = cached
+        if video_id is None:
+            best_rows[i] = (None, 0.0)
+            reused.append(i)
+        elif video_id in row_of and video_id not in stale_ids:
+            best_rows[i] = (row_of[video_id], confidence)
+            reused.append(i)
+        else:
+            rescored.append(i)
+
+    # Cached titles only need scoring against new or changed videos
+    if reused and changed_rows:
+        scores = calculate_similarity_matrix(
+            [spotify_keys[i] for i in reused],
+            [clean_youtube_titles[row] for row in changed_rows],
+            processor=None
+        )
+        for i, row_scores in zip(reused, scores):
+            row, score = _argmax_row(row_scores, changed_rows)
+            best_row, best_score = best_rows[i]
+            if score > best_score or (
+                score == best_score and row is not None and (best_row is None or row < best_row)
+            ):
+                best_rows[i] = (row, score)
+
+    print(f"Match cache: reusing {len(reused)} titles, scoring {len(rescored)} titles "
+          f"({len(changed_rows)} new or changed videos)")
+
+    # Rescored titles are computed lazily, in input order
+    fresh_rows = _iter_best_rows(
+        [spotify_titles[i] for i in rescored],
+        youtube_titles,
+        clean_youtube_titles,
+        exhaustive,
+        candidate_limit
+    )
+    for i in range(len(spotify_titles)):
+        if best_rows[i] is None:
+            best_rows[i] = next(fresh_rows)
+        yield best_rows[i]
+
+    cache.save(snapshot, {
+        spotify_key: (video_ids[row] if row is not None else None, score)
+        for spotify_key, (row, score) in zip(spotify_keys, best_rows)
+    })
+
+
+def iter_podcast_urls(
+    spotify_titles: List[str], 
+    youtube_metadata: pd.DataFrame, 
+    confidence_threshold: float = 70.0,
+    exhaustive: bool = False,
+    candidate_limit: int = DEFAULT_CANDIDATE_LIMIT,
+    cache_path: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield matches as soon as each Spotify title has been scored.
+
+    Streaming counterpart of match_podcast_urls (same arguments and
+    results, in the same order), so downstream stages can start on the
+    first match while the remaining titles are still being matched.
+
+    Yields:
+        Dict[str, Any]: Matched URL with detailed information
+    """
+    youtube_titles = youtube_metadata['title'].tolist()
+    youtube_urls = youtube_metadata['url'].tolist()
+    upload_dates = youtube_metadata['upload_date'].tolist()  # Using upload_date from metadata
+    video_ids = youtube_metadata['video_id'].tolist() if 'video_id' in youtube_metadata else None
+    clean_youtube_titles = [preprocess_title(title) for title in youtube_titles]
+
+    cache = None
+    if cache_path and 'video_id' in youtube_metadata:
+        mode = 'exhaustive' if exhaustive else f'indexed-{candidate_limit}'
+        cache = MatchCache(cache_path, f'{MATCHER_VERSION}:{mode}')
+        best_rows = _iter_best_rows_cached(
+            cache,
+            spotify_titles,
+            youtube_metadata['video_id'].tolist(),
+            youtube_titles,
+            clean_youtube_titles,
+            exhaustive,
+            candidate_limit
+        )
+    else:
+        best_rows = _iter_best_rows(
+            spotify_titles, youtube_titles, clean_youtube_titles, exhaustive, candidate_limit
+        )
+
+    try:
+        for spotify_title, (row, similarity) in zip(spotify_titles, best_rows):
+            best_match = {
+                'spotify_title': spotify_title,
+                'youtube_url': None,
+                'youtube_title': None,
+                'upload_date': None,
+                'confidence': 0.0
+            }
+            
+            # Update best match if confidence clears the threshold
+            if row is not None and similarity > 0 and similarity >= confidence_threshold:
+                best_match.update({
+                    'youtube_url': youtube_urls[row],
+                    'youtube_title': youtube_titles[row],
+                    'upload_date': upload_dates[row],  # Keep original MM-DD-YY format
+                    'confidence': similarity
+                })
+                if video_ids is not None:
+                    best_match['video_id'] = video_ids[row]
+            
+            # Only yield if a match was found
+            if best_match['youtube_url']:
+                yield best_match
+
+        # Let the cached iterator persist its results
+        for _ in best_rows:
+            pass
+    finally:
+        if cache is not None:
+            cache.close()
+
+
 def match_podcast_urls(
     spotify_titles: List[str], 
     youtube_metadata: pd.DataFrame, 
-    confidence_threshold: float = 70.0
+    confidence_threshold: float = 70.0,
+    exhaustive: bool = False,
+    candidate_limit: int = DEFAULT_CANDIDATE_LIMIT,
+    cache_path: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Match Spotify podcast titles with YouTube video URLs.
@@ -131,47 +465,37 @@ def match_podcast_urls(
     - Multiple matching strategies
     - Detailed result reporting
 
+    By default each Spotify title is first scored against the top candidates
+    from a TitleIndex built over the YouTube titles. The best candidate score
+    then bounds every scorer, and only the other rows that could still reach
+    it are scored, so the result always equals the full scan (exhaustive=True).
+    Titles sharing no token with any YouTube title fall back to a full scan.
+
+    With a cache_path, best matches persist between runs (see
+    scripts.match_cache) and only new or changed pairs are scored.
+
     Args:
         spotify_titles (List[str]): List of Spotify podcast titles
         youtube_metadata (pd.DataFrame): DataFrame with YouTube video metadata
         confidence_threshold (float, optional): Minimum similarity score. Defaults to 70.0.
+        exhaustive (bool, optional): Score every YouTube title instead of
+            indexed candidates, e.g. to check parity. Defaults to False.
+        candidate_limit (int, optional): Candidates scored per title in
+            indexed mode. Defaults to DEFAULT_CANDIDATE_LIMIT.
+        cache_path (str, optional): SQLite match cache to read and update.
+            Requires a video_id column. Defaults to None (no caching).
 
     Returns:
         List[Dict[str, Any]]: Matched URLs with detailed information
     """
-    matched_urls = []
-    
-    for spotify_title in spotify_titles:
-        best_match = {
-            'spotify_title': spotify_title,
-            'youtube_url': None,
-            'youtube_title': None,
-            'upload_date': None,
-            'confidence': 0.0
-        }
-        
-        for _, row in youtube_metadata.iterrows():
-            youtube_title = row['title']
-            youtube_url = row['url']
-            upload_date = row['upload_date']  # Using upload_date from metadata
-            
-            # Calculate similarity
-            similarity = calculate_title_similarity(spotify_title, youtube_title)
-            
-            # Update best match if better confidence
-            if similarity > best_match['confidence'] and similarity >= confidence_threshold:
-                best_match.update({
-                    'youtube_url': youtube_url,
-                    'youtube_title': youtube_title,
-                    'upload_date': upload_date,  # Keep original MM-DD-YY format
-                    'confidence': similarity
-                })
-        
-        # Only add if a match was found
-        if best_match['youtube_url']:
-            matched_urls.append(best_match)
-    
-    return matched_urls
+    return list(iter_podcast_urls(
+        spotify_titles,
+        youtube_metadata,
+        confidence_threshold=confidence_threshold,
+        exhaustive=exhaustive,
+        candidate_limit=candidate_limit,
+        cache_path=cache_path
+    ))
 
 
 def export_matched_urls(
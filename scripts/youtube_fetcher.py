@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Concurrent YouTube Data API Fetch Layer
+
+Runs YouTube Data API requests for url_extractor with bounded concurrency,
+client-side rate limiting and retries, so metadata extraction is no longer
+the sum of every serial round trip.
+
+Key Features:
+- Token-bucket rate limiter shared by all workers
+- Exponential backoff with jitter on 403/429/5xx and connection errors
+- Page pipelining: the next page is enumerated while up to
+  max_in_flight detail batches are in flight
+- One HTTP connection per worker thread (httplib2 is not thread-safe)
+- Configurable API endpoint, so a local fake HTTP server can stand in
+  for the API (YOUTUBE_API_ENDPOINT=http://127.0.0.1:8080/)
+
+Dependencies:
+- google-api-python-client
+"""
+
+import os
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+
+# Detail batches kept in flight while the next page is enumerated
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Client-side request budget across all workers
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+
+# HTTP statuses worth retrying (quota/rate limits and server errors)
+RETRYABLE_STATUSES = {403, 429, 500, 502, 503, 504}
+
+
+def build_youtube_client(api_key: str, api_endpoint: Optional[str] = None):
+    """
+    Build a YouTube Data API v3 client.
+
+    Args:
+        api_key (str): YouTube Data API key
+        api_endpoint (str, optional): Base URL overriding the public API,
+            e.g. a local fake server. Defaults to $YOUTUBE_API_ENDPOINT.
+
+    Returns:
+        googleapiclient.discovery.Resource: YouTube API client
+    """
+    api_endpoint = api_endpoint or os.getenv('YOUTUBE_API_ENDPOINT')
+    client_options = {'api_endpoint': api_endpoint} if api_endpoint else None
+    return build('youtube', 'v3', developerKey=api_key, client_options=client_options)
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Args:
+        rate (float): Tokens added per second
+        capacity (float, optional): Maximum burst size. Defaults to rate.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ConcurrentFetcher:
+    """
+    Executes API requests with rate limiting and retries, and pipelines
+    page enumeration with per-page detail fetches.
+
+    Args:
+        max_in_flight (int, optional): Concurrent detail fetches.
+            Defaults to DEFAULT_MAX_IN_FLIGHT.
+        requests_per_second (float, optional): Shared request budget.
+            Defaults to DEFAULT_REQUESTS_PER_SECOND.
+        max_retries (int, optional): Retries per request. Defaults to 5.
+        base_delay (float, optional): First backoff delay in seconds,
+            doubled on every retry. Defaults to 1.0.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        max_retries: int = 5,
+        base_delay: float = 1.0
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        self.limiter = TokenBucket(requests_per_second)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self._local = threading.local()
+
+    def _http(self):
+        """Return this thread's HTTP connection, creating it on first use."""
+        if not hasattr(self._local, 'http'):
+            self._local.http = build_http()
+        return self._local.http
+
+    def execute(self, request) -> Any:
+        """
+        Execute an API request with rate limiting and exponential backoff.
+
+        Args:
+            request (googleapiclient.http.HttpRequest): Request to execute
+
+        Returns:
+            Any: Decoded API response
+
+        Raises:
+            HttpError: For non-retryable statuses or once retries run out
+            OSError: For connection errors once retries run out
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                return request.execute(http=self._http())
+            except HttpError as e:
+                if e.resp.status not in RETRYABLE_STATUSES or attempt == self.max_retries:
+                    raise
+                reason = f"HTTP {e.resp.status}"
+            except OSError as e:
+                if attempt == self.max_retries:
+                    raise
+                reason = str(e)
+                # Drop a connection that may be in a broken state
+                self._local.__dict__.pop('http', None)
+
+            delay = self.base_delay * (2 ** attempt) + random.uniform(0, self.base_delay)
+            print(f"\nYouTube API request failed ({reason}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+    def map_pages(
+        self,
+        pages: Iterable[List[str]],
+        fetch: Callable[[List[str]], Any]
+    ) -> Iterator[Tuple[List[str], Any]]:
+        """
+        Apply fetch to every page while the next pages are still enumerated.
+
+        Pages are pulled lazily, so a consumer that stops early stops the
+        enumeration too. Results are yielded in page order.
+
+        Args:
+            pages (Iterable[List[str]]): Pages of video IDs
+            fetch (Callable): Called once per page in a worker thread
+
+        Yields:
+            Tuple[List[str], Any]: Each page with its fetch result
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            try:
+                for page in pages:
+                    pending.append((page, executor.submit(fetch, page)))
+                    if len(pending) >= self.max_in_flight:
+                        page, future = pending.popleft()
+                        yield page, future.result()
+
+                while pending:
+                    page, future = pending.popleft()
+                    yield page, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
@@ -0,0 +1,57 @@
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from scripts.audio_cut import accurate_trim
+from scripts.mp3_frames import gapless_info
+
+pytestmark = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg not installed")
+
+
+def make_source(path, sample_rate, channels, bitrate):
+    """Tone plus noise: every 10 ms of it is loud, so a gap shows up."""
+    subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y',
+         '-f', 'lavfi', '-i', f'sine=frequency=440:sample_rate={sample_rate}:duration=8',
+         '-f', 'lavfi', '-i', f'anoisesrc=color=pink:amplitude=0.1:seed=1:sample_rate={sample_rate}:duration=8',
+         '-filter_complex', '[0][1]amix=inputs=2:normalize=0',
+         '-ac', str(channels), '-c:a', 'libmp3lame', '-b:a', bitrate, str(path)],
+        check=True
+    )
+
+
+def decode(path):
+    output = subprocess.run(['ffmpeg', '-v', 'error', '-i', str(path), '-ac', '1', '-f', 'f32le', '-'],
+                            capture_output=True, check=True).stdout
+    return np.frombuffer(output, dtype=np.float32)
+
+
+@pytest.mark.parametrize('sample_rate,channels,bitrate,seconds,end', [
+    (44100, 1, '128k', 4.0, None),
+    (44100, 2, '128k', 2.5, 6.0),
+    (48000, 2, '160k', 1.234, None),
+    (22050, 1, '48k', 3.0, None),
+    (44100, 2, '128k', 0.01, None),
+])
+def test_accurate_trim_join_is_continuous(tmp_path, sample_rate, channels, bitrate, seconds, end):
+    source = tmp_path / 'source.mp3'
+    output = tmp_path / 'output.mp3'
+    make_source(source, sample_rate, channels, bitrate)
+
+    accurate_trim(source, output, seconds, end)
+
+    decoded = decode(source)
+    expected = decoded[round(seconds * sample_rate):round(end * sample_rate) if end else None]
+    trimmed = decode(output)
+    # Sample-accurate start and end: nothing inserted at the join
+    assert len(trimmed) == len(expected)
+    assert gapless_info(str(output)) is not None
+
+    # Every 10 ms matches the source within coding noise, including the join
+    window = sample_rate // 100
+    for start in range(0, len(expected) - window, window):
+        reference = expected[start:start + window]
+        error = trimmed[start:start + window] - reference
+        assert np.sqrt(np.mean(error ** 2)) < 0.1 * np.sqrt(np.mean(reference ** 2)), start
@@ -0,0 +1,173 @@
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from scripts.chunked_upload import upload_file
+
+
+class FakeStore:
+    """
+    Upload endpoint in one of two flavours.
+
+    plain: a presigned PUT URL. Every PUT, including an empty status
+    query, replaces the object with the request body.
+    resumable: a resumable upload session answering status queries with
+    308 and the received range, and accepting Content-Range PUTs.
+    reject: status returned for every upload instead of storing it.
+    stall_at: byte count at which the first upload stops reading the
+    body and goes quiet, without closing the connection.
+    """
+
+    def __init__(self, resumable, fail_at=None, reject=None, stall_at=None):
+        self.resumable = resumable
+        self.fail_at = fail_at
+        self.reject = reject
+        self.stall_at = stall_at
+        self.released = threading.Event()
+        self.data = bytearray()
+        self.received = 0
+        self.requests = []
+
+    def handler(self):
+        store = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def do_PUT(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                content_range = self.headers.get('Content-Range')
+                store.requests.append((content_range, length))
+
+                if store.resumable and content_range and content_range.startswith('bytes */'):
+                    headers = {'Range': f'bytes=0-{len(store.data) - 1}'} if store.data else {}
+                    return self.reply(308, headers)
+
+                if store.reject:
+                    self.rfile.read(length)
+                    return self.reply(store.reject)
+
+                start = 0
+                if store.resumable and content_range:
+                    start = int(re.match(r'bytes (\d+)-', content_range).group(1))
+                del store.data[start:]
+
+                remaining = length
+                while remaining:
+                    chunk = self.rfile.read(min(65536, remaining))
+                    if not chunk:
+                        break
+                    store.data += chunk
+                    store.received += len(chunk)
+                    remaining -= len(chunk)
+                    if store.fail_at is not None and len(store.data) >= store.fail_at:
+                        # Drop the connection mid-transfer, once
+                        store.fail_at = None
+                        self.close_connection = True
+                        self.connection.shutdown(2)
+                        return
+                    if store.stall_at is not None and len(store.data) >= store.stall_at:
+                        # Hang mid-transfer, once, until the test ends
+                        store.stall_at = None
+                        store.released.wait(30)
+                        self.close_connection = True
+                        return
+                self.reply(200)
+
+        return Handler
+
+
+@pytest.fixture
+def serve():
+    servers = []
+    stores = []
+
+    def start(store):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), store.handler())
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        stores.append(store)
+        return f'http://127.0.0.1:{server.server_port}/upload'
+
+    yield start
+    for store in stores:
+        store.released.set()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def payload_file(tmp_path):
+    payload = os.urandom(4 * 1024 * 1024)
+    path = tmp_path / 'episode.mp3'
+    path.write_bytes(payload)
+    return str(path), payload
+
+
+def test_plain_url_restarts_without_status_query(serve, payload_file):
+    path, payload = payload_file
+    store = FakeStore(resumable=False, fail_at=3 * 1024 * 1024)
+    url = serve(store)
+
+    result = upload_file(requests.Session(), url, path, retry_delay=0)
+
+    assert bytes(store.data) == payload
+    assert result.attempts == 2
+    # No empty "bytes */size" PUT, which would have replaced the object
+    assert all(content_range is None for content_range, _ in store.requests)
+    assert [length for _, length in store.requests] == [len(payload), len(payload)]
+
+
+def test_resumable_session_continues_from_received_range(serve, payload_file):
+    path, payload = payload_file
+    store = FakeStore(resumable=True, fail_at=3 * 1024 * 1024)
+    url = serve(store)
+
+    result = upload_file(requests.Session(), url, path, retry_delay=0, resumable=True)
+
+    assert bytes(store.data) == payload
+    assert result.attempts == 2
+    assert any(content_range == f'bytes */{len(payload)}' for content_range, _ in store.requests)
+    # Only the missing bytes were sent again
+    assert store.received == len(payload)
+    assert result.bytes_sent < 2 * len(payload)
+
+
+def test_client_error_is_not_retried(serve, payload_file):
+    path, _ = payload_file
+    store = FakeStore(resumable=False, reject=403)
+    url = serve(store)
+
+    with pytest.raises(RuntimeError, match='rejected'):
+        upload_file(requests.Session(), url, path, retry_delay=0)
+    assert len(store.requests) == 1
+
+
+def test_stalled_transfer_times_out_and_retries(serve, payload_file):
+    path, payload = payload_file
+    store = FakeStore(resumable=False, stall_at=1024 * 1024)
+    url = serve(store)
+
+    start = time.monotonic()
+    result = upload_file(requests.Session(), url, path, retry_delay=0, timeout=(1, 1))
+
+    assert bytes(store.data) == payload
+    assert result.attempts == 2
+    assert time.monotonic() - start < 15
@@ -0,0 +1,93 @@
+import shutil
+import subprocess
+
+import pytest
+
+from scripts import silence_detection
+from scripts.silence_detection import PADDING_SECONDS, detect_trim_points
+
+pytestmark = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg not installed")
+
+# Level detection works on 50 ms windows; allow a couple of them
+TOLERANCE = 0.12
+
+# Loud and quiet quarter-seconds: an envelope distinctive enough to correlate
+JINGLE = "0.5*sin(2*PI*660*t)*(0.1+0.9*lt(mod(t*4\\,4)\\,1+mod(floor(t)\\,2)))"
+
+
+def make_track(path, parts, extra_args=()):
+    """
+    Concatenate lavfi parts, each ('silence' | 'tone' | 'jingle', seconds).
+    """
+    sources = {
+        'silence': 'anullsrc=r=44100:cl=mono:d={seconds}',
+        'tone': 'sine=frequency=440:sample_rate=44100:duration={seconds}',
+        'jingle': f"aevalsrc='{JINGLE}':s=44100:d={{seconds}}",
+    }
+    command = ['ffmpeg', '-v', 'error', '-y']
+    for kind, seconds in parts:
+        command += ['-f', 'lavfi', '-i', sources[kind].format(seconds=seconds)]
+    inputs = ''.join(f'[{n}]' for n in range(len(parts)))
+    command += ['-filter_complex', f'{inputs}concat=n={len(parts)}:v=0:a=1',
+                '-ac', '1', *extra_args, str(path)]
+    subprocess.run(command, check=True)
+
+
+def test_leading_and_trailing_silence(tmp_path):
+    track = tmp_path / 'track.wav'
+    make_track(track, [('silence', 2), ('tone', 3), ('silence', 2)])
+
+    points = detect_trim_points(str(track))
+
+    assert points.start == pytest.approx(2 - PADDING_SECONDS, abs=TOLERANCE)
+    assert points.end == pytest.approx(5 + PADDING_SECONDS, abs=TOLERANCE)
+
+
+def test_jingle_is_skipped(tmp_path):
+    jingle = tmp_path / 'jingle.wav'
+    track = tmp_path / 'track.wav'
+    make_track(jingle, [('jingle', 2)])
+    make_track(track, [('silence', 1), ('jingle', 2), ('silence', 1), ('tone', 3)])
+
+    without_jingle = detect_trim_points(str(track))
+    points = detect_trim_points(str(track), str(jingle))
+
+    assert without_jingle.start == pytest.approx(1 - PADDING_SECONDS, abs=TOLERANCE)
+    assert points.start == pytest.approx(4 - PADDING_SECONDS, abs=TOLERANCE)
+    assert points.end == pytest.approx(7, abs=TOLERANCE)
+
+
+def test_trailing_silence_longer_than_scan_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(silence_detection, 'SCAN_SECONDS', 3.0)
+    track = tmp_path / 'track.wav'
+    make_track(track, [('silence', 1), ('tone', 4), ('silence', 8)])
+
+    points = detect_trim_points(str(track))
+
+    assert points.start == pytest.approx(1 - PADDING_SECONDS, abs=TOLERANCE)
+    assert points.end == pytest.approx(5 + PADDING_SECONDS, abs=TOLERANCE)
+
+
+def test_overestimated_vbr_duration(tmp_path, monkeypatch):
+    monkeypatch.setattr(silence_detection, 'SCAN_SECONDS', 5.0)
+    track = tmp_path / 'track.mp3'
+    # Without a Xing header the duration is estimated from the first
+    # (silent, low-bitrate) frames and overshoots the real 15 s
+    make_track(track, [('silence', 3), ('tone', 10), ('silence', 2)],
+               ['-c:a', 'libmp3lame', '-q:a', '2', '-write_xing', '0'])
+    assert silence_detection.probe_duration(str(track)) > 20
+
+    points = detect_trim_points(str(track))
+
+    assert points.start == pytest.approx(3 - PADDING_SECONDS, abs=TOLERANCE)
+    assert points.end == pytest.approx(13 + PADDING_SECONDS, abs=TOLERANCE)
+
+
+def test_silent_track_has_no_end(tmp_path, capsys):
+    track = tmp_path / 'track.wav'
+    make_track(track, [('silence', 3)])
+
+    points = detect_trim_points(str(track))
+
+    assert points.end is None
+    assert 'No end point' in capsys.readouterr().out
@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+os.environ.setdefault('GROQ_API_KEY', 'test-key')
+
+from scripts.schedule_podbean import schedule_entry
+from scripts.upload_ledger import UploadLedger
+
+
+class FakePodbean:
+    """Podbean client whose uploads are slow enough for workers to overlap."""
+
+    def __init__(self):
+        self.uploads = []
+        self.scheduled = []
+        self.lock = threading.Lock()
+
+    def upload_audio(self, path):
+        time.sleep(0.05)
+        with self.lock:
+            self.uploads.append(path)
+            return f'key-{len(self.uploads)}'
+
+    def schedule_episode(self, title, description, media_key, schedule_time):
+        with self.lock:
+            self.scheduled.append((title, media_key, schedule_time))
+            return {'id': f'episode-{len(self.scheduled)}', 'permalink_url': None}
+
+
+def make_entry(audio, title='Episode', day=1):
+    return {
+        'podbean_title': title,
+        'description': '',
+        'audio_file': str(audio),
+        'schedule_datetime': datetime(2026, 1, day, 12, 0)
+    }
+
+
+@pytest.fixture
+def audio(tmp_path):
+    path = tmp_path / 'episode.mp3'
+    path.write_bytes(b'audio' * 1000)
+    return path
+
+
+def test_same_audio_is_uploaded_once(tmp_path, audio):
+    entries = [make_entry(audio) for _ in range(4)]
+    podbean = FakePodbean()
+
+    with UploadLedger(str(tmp_path / 'ledger.db')) as ledger:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda entry: schedule_entry(podbean, entry, ledger), entries))
+
+    assert len(podbean.uploads) == 1
+    assert sorted(result['status'] for result in results) == ['skipped', 'skipped', 'skipped', 'success']
+    assert {result['podbean_id'] for result in results} == {'episode-1'}
+
+
+def test_new_date_or_title_is_scheduled_again_with_the_uploaded_media(tmp_path, audio):
+    podbean = FakePodbean()
+
+    with UploadLedger(str(tmp_path / 'ledger.db')) as ledger:
+        first = schedule_entry(podbean, make_entry(audio), ledger)
+        moved = schedule_entry(podbean, make_entry(audio, day=8), ledger)
+        renamed = schedule_entry(podbean, make_entry(audio, title='Episode (repeat)', day=8), ledger)
+        repeated = schedule_entry(podbean, make_entry(audio, title='Episode (repeat)', day=8), ledger)
+
+    assert [first['status'], moved['status'], renamed['status'], repeated['status']] == \
+        ['success', 'success', 'success', 'skipped']
+    assert repeated['podbean_id'] == renamed['podbean_id'] == 'episode-3'
+    assert podbean.uploads == [str(audio)]
+    assert [media_key for _, media_key, _ in podbean.scheduled] == ['key-1'] * 3
+
+
+def test_force_schedules_again(tmp_path, audio):
+    podbean = FakePodbean()
+
+    with UploadLedger(str(tmp_path / 'ledger.db')) as ledger:
+        schedule_entry(podbean, make_entry(audio), ledger)
+        result = schedule_entry(podbean, make_entry(audio), ledger, force=True)
+
+    assert result['status'] == 'success'
+    assert len(podbean.scheduled) == 2
+
+
+def test_error_does_not_replace_scheduled(tmp_path):
+    with UploadLedger(str(tmp_path / 'ledger.db')) as ledger:
+        ledger.record_upload('hash', 'episode.mp3', 'key-1')
+        ledger.record_scheduled('hash', 'episode-1', '2026-01-01T12:00:00', title='Episode')
+        ledger.record_error('hash', 'episode.mp3', 'late failure of a duplicate')
+        record = ledger.get('hash')
+
+    assert record.status == 'scheduled'
+    assert record.episode_id == 'episode-1'
+
+
+def test_ledger_without_title_column_is_upgraded(tmp_path):
+    path = str(tmp_path / 'ledger.db')
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE uploads (content_hash TEXT PRIMARY KEY, file_path TEXT NOT NULL, file_key TEXT, "
+        "uploaded_at REAL, episode_id TEXT, schedule_time TEXT, permalink_url TEXT, "
+        "status TEXT NOT NULL, error TEXT, updated_at REAL NOT NULL)"
+    )
+    connection.execute("INSERT INTO uploads VALUES ('hash', 'episode.mp3', 'key-1', 0, 'episode-1', "
+                       "'2026-01-01T12:00:00', NULL, 'scheduled', NULL, 0)")
+    connection.commit()
+    connection.close()
+
+    with UploadLedger(path) as ledger:
+        record = ledger.get('hash')
+
+    assert record.status == 'scheduled'
+    assert record.title is None
@@ -0,0 +1,53 @@
+import os
+import random
+
+import pandas as pd
+import pytest
+
+from scripts.url_matcher import match_podcast_urls
+
+METADATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'output', 'video_metadata.csv')
+
+
+@pytest.fixture(scope='module')
+def metadata():
+    return pd.read_csv(METADATA_PATH)
+
+
+def perturb(title, rng):
+    """Damage a title the way hand-typed schedule titles are damaged."""
+    words = title.split()
+    kind = rng.randrange(4)
+    if kind == 0:
+        words = [w[:-1] if len(w) > 3 and rng.random() < 0.5 else w for w in words]
+    elif kind == 1:
+        words = rng.sample(words, max(1, len(words) // 2))
+    elif kind == 2:
+        words = [w for w in words if rng.random() < 0.7] or words[:1]
+        words = [w.replace('e', '') if rng.random() < 0.3 else w for w in words]
+    else:
+        words = words[:2]
+    return ' '.join(words)
+
+
+def by_title(matches):
+    return {m['spotify_title']: (m['youtube_url'], m['confidence']) for m in matches}
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_indexed_matches_equal_exhaustive_on_perturbed_titles(metadata, seed):
+    rng = random.Random(seed)
+    titles = [t for t in metadata['title'] if isinstance(t, str)]
+    queries = [perturb(t, rng) for t in titles] + ["Righteou His", "Testimon Healing", "Part of", "In Part"]
+
+    indexed = by_title(match_podcast_urls(queries, metadata))
+    exhaustive = by_title(match_podcast_urls(queries, metadata, exhaustive=True))
+
+    assert indexed == exhaustive
+
+
+def test_small_candidate_limit_still_equals_exhaustive(metadata):
+    queries = ["the Relationships &", "Righteou His", "Part of"]
+    indexed = by_title(match_podcast_urls(queries, metadata, candidate_limit=1))
+    exhaustive = by_title(match_podcast_urls(queries, metadata, exhaustive=True))
+    assert indexed == exhaustive
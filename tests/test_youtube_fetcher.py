@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from scripts.youtube_fetcher import ConcurrentFetcher, build_youtube_client
+
+
+class FakeYouTube:
+    """
+    Local stand-in for the videos endpoint of the YouTube Data API.
+
+    failures maps a video ID batch ('a,b') to the statuses returned, in
+    order, before the batch succeeds.
+    """
+
+    def __init__(self, failures=None):
+        self.failures = {key: list(statuses) for key, statuses in (failures or {}).items()}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                ids = parse_qs(url.query).get('id', [''])[0]
+                with api.lock:
+                    api.calls.append((url.path, ids))
+                    pending = api.failures.get(ids)
+                    status = pending.pop(0) if pending else 200
+                if status != 200:
+                    return self.reply(status, {'error': {'code': status, 'message': 'fake failure'}})
+                items = [{'id': video_id, 'snippet': {'title': f'Title {video_id}'}} for video_id in ids.split(',')]
+                self.reply(200, {'items': items})
+
+        return Handler
+
+
+@pytest.fixture
+def fake_api():
+    servers = []
+
+    def start(api):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), api.handler())
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return build_youtube_client('test-key', api_endpoint=f'http://127.0.0.1:{server.server_port}/')
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def videos(youtube, ids):
+    return youtube.videos().list(part='snippet', id=','.join(ids))
+
+
+def test_execute_retries_rate_limits_and_server_errors(fake_api):
+    api = FakeYouTube({'a,b': [429, 503]})
+    youtube = fake_api(api)
+    fetcher = ConcurrentFetcher(requests_per_second=1000, base_delay=0)
+
+    response = fetcher.execute(videos(youtube, ['a', 'b']))
+
+    assert [item['id'] for item in response['items']] == ['a', 'b']
+    assert len(api.calls) == 3
+    assert api.calls[0][0].endswith('/youtube/v3/videos')
+
+
+def test_execute_raises_client_errors_without_retrying(fake_api):
+    api = FakeYouTube({'a': [404]})
+    youtube = fake_api(api)
+    fetcher = ConcurrentFetcher(requests_per_second=1000, base_delay=0)
+
+    with pytest.raises(HttpError):
+        fetcher.execute(videos(youtube, ['a']))
+    assert len(api.calls) == 1
+
+
+def test_execute_gives_up_after_max_retries(fake_api):
+    api = FakeYouTube({'a': [503] * 10})
+    youtube = fake_api(api)
+    fetcher = ConcurrentFetcher(requests_per_second=1000, max_retries=2, base_delay=0)
+
+    with pytest.raises(HttpError):
+        fetcher.execute(videos(youtube, ['a']))
+    assert len(api.calls) == 3
+
+
+def test_map_pages_keeps_page_order_with_retries(fake_api):
+    pages = [[f'v{page}{n}' for n in range(3)] for page in range(8)]
+    # Early pages fail first, so later pages finish before them
+    api = FakeYouTube({','.join(pages[0]): [429, 429], ','.join(pages[1]): [500]})
+    youtube = fake_api(api)
+    fetcher = ConcurrentFetcher(max_in_flight=4, requests_per_second=1000, base_delay=0.05)
+
+    results = list(fetcher.map_pages(iter(pages), lambda ids: fetcher.execute(videos(youtube, ids))))
+
+    assert [page for page, _ in results] == pages
+    assert [[item['id'] for item in response['items']] for _, response in results] == pages
+    assert len(api.calls) == len(pages) + 3
+
+
+def test_map_pages_bounds_requests_in_flight():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fetch(page):
+        with lock:
+            running.append(page)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(page)
+        return page
+
+    fetcher = ConcurrentFetcher(max_in_flight=3)
+    results = list(fetcher.map_pages(([n] for n in range(12)), fetch))
+
+    assert [result for _, result in results] == [[n] for n in range(12)]
+    assert max(peak) <= 3